@@ -4,4 +4,7 @@ import sys
 # Add the backend directory to sys.path so 'import app' works
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "backend"))
 
+# Function instances are short-lived; don't hold a per-instance connection pool
+os.environ.setdefault("DB_ENGINE_MODE", "serverless")
+
 from main import app
@@ -1,14 +1,23 @@
-from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
+import logging
+from typing import Any, AsyncGenerator, Generator, Optional
+from fastapi import Cookie, Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, make_transient_to_detached
 
 from app import models, schemas
+from app.api.pagination import Page, get_page
 from app.core import security
 from app.core.config import settings
+from app.core.principal_cache import Principal, principal_cache
+from app.db.async_session import AsyncSessionLocal
+from app.db.replica import STICKY_COOKIE, AsyncReplicaSessionLocal, ReplicaSessionLocal, replica_router
 from app.db.session import SessionLocal
+from app.services.waiting_room import QUEUE_TOKEN_HEADER, waiting_room
+
+logger = logging.getLogger(__name__)
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/login/access-token"
@@ -26,21 +35,86 @@ def get_db() -> Generator:
     finally:
         db.close()
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
-) -> models.User:
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    AsyncSession for `async def` endpoints. Relationships must be eager-loaded
+    (selectinload/joinedload); lazy loads raise under asyncio.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def get_read_db(
+    token: Optional[str] = Depends(reusable_oauth2_optional),
+    primary_until: Optional[str] = Cookie(None, alias=STICKY_COOKIE),
+) -> Generator:
+    """
+    Session for read-only endpoints: the replica when it is healthy and the
+    caller has not written recently, otherwise the primary.
+    """
+    if replica_router.use_replica(security.token_subject(token), primary_until):
+        db = ReplicaSessionLocal()
+    else:
+        db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_read_db(
+    token: Optional[str] = Depends(reusable_oauth2_optional),
+    primary_until: Optional[str] = Cookie(None, alias=STICKY_COOKIE),
+) -> AsyncGenerator[AsyncSession, None]:
+    """Async counterpart of get_read_db."""
+    if await replica_router.use_replica_async(security.token_subject(token), primary_until):
+        session_factory = AsyncReplicaSessionLocal
+    else:
+        session_factory = AsyncSessionLocal
+    async with session_factory() as db:
+        yield db
+
+def _attach(db: Session, model: Any, fields: dict) -> Any:
+    """
+    Rebuild a persistent instance from cached column values without a SELECT.
+    Columns missing from the snapshot are expired and lazy-load on access.
+    """
+    instance = model(**fields)
+    make_transient_to_detached(instance)
+    return db.merge(instance, load=False)
+
+def load_principal_user(db: Session, user_id: int) -> Optional[models.User]:
+    """
+    Resolve the user for a token subject, serving from the principal cache
+    when possible. On a miss the user and tenant are fetched in one query.
+    """
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        user = db.query(models.User).options(
+            joinedload(models.User.tenant)
+        ).filter(models.User.id == user_id).first()
+        if user:
+            principal = Principal.from_user(user)
+            principal_cache.set(principal)
+        return user
+    return _attach(db, models.User, principal.user_fields)
+
+def decode_token(token: str) -> schemas.TokenPayload:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
         )
-        token_data = schemas.TokenPayload(**payload)
+        return schemas.TokenPayload(**payload)
     except (jwt.JWTError, ValidationError) as e:
-        print(f"DEBUG: Validation Error: {e}")
+        logger.debug(f"Rejected access token: {e}")
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = db.query(models.User).filter(models.User.id == token_data.sub).first()
+
+def get_current_user(
+    db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
+) -> models.User:
+    token_data = decode_token(token)
+    user = load_principal_user(db, token_data.sub)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -59,8 +133,9 @@ def get_current_user_optional(
     except (jwt.JWTError, ValidationError):
         return None # Invalid token treated as anonymous
     
-    user = db.query(models.User).filter(models.User.id == token_data.sub).first()
-    return user
+    if token_data.sub is None:
+        return None
+    return load_principal_user(db, token_data.sub)
 
 def get_current_active_user(
     current_user: models.User = Depends(get_current_user),
@@ -80,6 +155,7 @@ def get_current_active_superuser(
     return current_user
 
 def get_current_tenant(
+    db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user),
 ) -> models.Tenant:
     """
@@ -90,14 +166,25 @@ def get_current_tenant(
             status_code=404,
             detail="User is not associated with any account/tenant."
         )
+    principal = principal_cache.peek(current_user.id)
+    if principal is not None and principal.tenant_fields is not None:
+        return _attach(db, models.Tenant, principal.tenant_fields)
     return current_user.tenant
 
 def check_tenant_plan(required_tier: models.PlanTier):
     """
     Dependency to check if the current tenant has the required plan tier.
     Usage: Depends(check_tenant_plan(models.PlanTier.PROFESSIONAL))
+
+    The user and tenant come from the principal cache, so a warm request needs
+    no query; cache misses re-read both from the DB.
     """
-    def _check(tenant: models.Tenant = Depends(get_current_tenant)):
+    def _check(
+        db: Session = Depends(get_db),
+        token: str = Depends(reusable_oauth2),
+    ):
+        user = get_current_active_user(get_current_user(db=db, token=token))
+        tenant = get_current_tenant(db=db, current_user=user)
         # Simple ranking: STARTER < PROFESSIONAL < BUSINESS
         tiers = {
             models.PlanTier.STARTER: 1,
@@ -112,3 +199,16 @@ def check_tenant_plan(required_tier: models.PlanTier):
         return tenant
     return _check
 
+
+async def check_admission(
+    event_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_active_user),
+    queue_token: Optional[str] = Header(None, alias=QUEUE_TOKEN_HEADER),
+) -> None:
+    """
+    Gate for events with a waiting room. Shares the endpoint's session, so the
+    queue token is only spent if the purchase commits.
+    """
+    if await waiting_room.rate(db, event_id):
+        await waiting_room.admit(db, queue_token, event_id, current_user.id)
@@ -0,0 +1,112 @@
+import base64
+import datetime
+import hashlib
+import hmac
+import json
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import and_, or_
+
+from app.core.config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 200
+
+def _sign(payload: bytes) -> bytes:
+    return hmac.new(settings.SECRET_KEY.encode("utf-8"), payload, hashlib.sha256).digest()[:16]
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime.datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.datetime.fromisoformat(value["dt"])
+    return value
+
+def encode_cursor(listing: str, sort_value: Any, row_id: int) -> str:
+    """
+    Opaque, signed cursor pointing just past (sort_value, row_id). `listing`
+    names the sort column with its entity (e.g. "User.id") so a cursor is only
+    accepted by the listing that issued it.
+    """
+    payload = json.dumps(
+        [listing, _encode_value(sort_value), row_id], separators=(",", ":")
+    ).encode("utf-8")
+    return base64.urlsafe_b64encode(payload + _sign(payload)).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, listing: str) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload, signature = raw[:-16], raw[-16:]
+        if not hmac.compare_digest(signature, _sign(payload)):
+            raise ValueError("bad signature")
+        key, sort_value, row_id = json.loads(payload)
+        if key != listing:
+            raise ValueError("cursor belongs to a different listing")
+        return _decode_value(sort_value), int(row_id)
+    except (ValueError, TypeError, json.JSONDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+class Page:
+    """
+    Keyset pagination over (sort_column, id_column) with offset fallback.
+
+    Works with both `db.query(...)` and `select(...)` statements:
+        rows = page.apply(db.query(models.User), models.User.id).all()
+        return page.finish(rows, response)
+    When a full page is returned, the next cursor is sent in X-Next-Cursor.
+    `skip` is ignored once a cursor is supplied.
+    """
+
+    def __init__(self, cursor: Optional[str], skip: int, limit: int):
+        self.cursor = cursor
+        self.skip = skip
+        self.limit = limit
+        self._listing: Optional[str] = None
+        self._sort_key: Optional[str] = None
+        self._id_key: Optional[str] = None
+
+    def apply(self, stmt: Any, sort_column: Any, id_column: Any = None) -> Any:
+        if id_column is None:
+            id_column = sort_column
+        self._listing = str(sort_column)
+        self._sort_key = sort_column.key
+        self._id_key = id_column.key
+        if self.cursor:
+            sort_value, row_id = decode_cursor(self.cursor, self._listing)
+            if sort_column is id_column:
+                stmt = stmt.where(id_column > row_id)
+            else:
+                stmt = stmt.where(or_(
+                    sort_column > sort_value,
+                    and_(sort_column == sort_value, id_column > row_id),
+                ))
+        if sort_column is id_column:
+            stmt = stmt.order_by(id_column)
+        else:
+            stmt = stmt.order_by(sort_column, id_column)
+        if not self.cursor:
+            stmt = stmt.offset(self.skip)
+        return stmt.limit(self.limit)
+
+    def next_cursor(self, rows: Sequence[Any]) -> Optional[str]:
+        if self._sort_key is None or not rows or len(rows) < self.limit:
+            return None
+        last = rows[-1]
+        return encode_cursor(self._listing, getattr(last, self._sort_key), getattr(last, self._id_key))
+
+    def finish(self, rows: Sequence[Any], response: Response) -> List[Any]:
+        cursor = self.next_cursor(rows)
+        if cursor:
+            response.headers[NEXT_CURSOR_HEADER] = cursor
+        return list(rows)
+
+def get_page(
+    cursor: Optional[str] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+) -> Page:
+    return Page(cursor=cursor, skip=skip, limit=limit)
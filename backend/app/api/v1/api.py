@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 from app.api.v1.endpoints import (
-    login, events, event_strategy, elections, donors, users, positions, fees, tickets, agenda, sponsors, super_admin
+    login, events, event_strategy, elections, donors, users, positions, fees, tickets, check_in, agenda, sponsors, super_admin
 )
 
 api_router = APIRouter()
@@ -13,6 +13,7 @@ api_router.include_router(elections.router, prefix="/elections", tags=["election
 api_router.include_router(positions.router, prefix="/positions", tags=["positions"])
 api_router.include_router(fees.router, prefix="/fees", tags=["fees"])
 api_router.include_router(tickets.router, tags=["tickets"])
+api_router.include_router(check_in.router, tags=["check-in"])
 api_router.include_router(agenda.router, tags=["agenda"])
 api_router.include_router(sponsors.router, tags=["sponsors"])
 api_router.include_router(super_admin.router, prefix="/super-admin", tags=["super-admin"])
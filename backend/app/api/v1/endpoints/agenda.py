@@ -9,7 +9,7 @@ router = APIRouter()
 @router.get("/events/{event_id}/sessions", response_model=List[schemas.EventSession])
 def read_event_sessions(
     event_id: int,
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
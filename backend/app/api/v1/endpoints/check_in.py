@@ -0,0 +1,90 @@
+from typing import Any, Optional
+import datetime
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import models, schemas
+from app.api import deps
+from app.core.config import settings
+from app.services.check_in import check_in_service
+from app.services.live_counters import live_counters
+
+router = APIRouter()
+
+@router.post("/events/{event_id}/check-in", response_model=schemas.CheckInResult)
+async def check_in_by_qr(
+    event_id: int,
+    scan_in: schemas.CheckInScan,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Check in one attendee by QR code (Admin only).
+    """
+    results = await check_in_service.scan(db, event_id, [scan_in.qr_code])
+    await db.commit()
+    live_counters.publish(event_id)
+    return results[0]
+
+@router.post("/events/{event_id}/check-in/bulk", response_model=schemas.BulkCheckInResult)
+async def bulk_check_in(
+    event_id: int,
+    batch_in: schemas.BulkCheckIn,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Apply a batch of door scans in one transaction (Admin only).
+    Results are returned per scan, in the order sent.
+    """
+    results = await check_in_service.scan(db, event_id, [scan.qr_code for scan in batch_in.scans])
+    await db.commit()
+    live_counters.publish(event_id)
+    checked_in = sum(1 for result in results if result["status"] == "checked_in")
+    return {"checked_in": checked_in, "rejected": len(results) - checked_in, "results": results}
+
+# --- Offline scanners ---
+
+@router.get("/events/{event_id}/check-in/manifest")
+async def download_check_in_manifest(
+    event_id: int,
+    since: Optional[datetime.datetime] = None,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Stream the event's check-in manifest as gzipped NDJSON (Admin only).
+
+    Pass the previous response's X-Manifest-Cursor as ?since= to receive only
+    registrations changed since then. Deltas overlap slightly, so scanners
+    should upsert rows by id.
+    """
+    if await db.get(models.Event, event_id) is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    cursor = datetime.datetime.utcnow() - datetime.timedelta(
+        seconds=settings.CHECK_IN_MANIFEST_OVERLAP_SECONDS
+    )
+    return StreamingResponse(
+        check_in_service.manifest(event_id, since),
+        media_type="application/x-ndjson",
+        headers={"Content-Encoding": "gzip", "X-Manifest-Cursor": cursor.isoformat()},
+    )
+
+@router.post("/events/{event_id}/check-in/sync", response_model=schemas.BulkCheckInResult)
+async def sync_offline_check_ins(
+    event_id: int,
+    batch_in: schemas.OfflineCheckInBatch,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Upload check-ins recorded while offline (Admin only).
+    The earliest scan of a registration wins; results are per scan.
+    """
+    results = await check_in_service.sync(
+        db, event_id, [(scan.registration_id, scan.scanned_at) for scan in batch_in.scans]
+    )
+    await db.commit()
+    live_counters.publish(event_id)
+    checked_in = sum(1 for result in results if result["status"] == "checked_in")
+    return {"checked_in": checked_in, "rejected": len(results) - checked_in, "results": results}
@@ -1,5 +1,5 @@
 from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from app import models, schemas
 from app.api import deps
@@ -8,16 +8,16 @@ router = APIRouter()
 
 @router.get("/", response_model=List[schemas.Donor])
 def read_donors(
+    response: Response,
     db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+    page: deps.Page = Depends(deps.get_page),
     current_user: models.User = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     Retrieve donors (Admin only).
     """
-    donors = db.query(models.Donor).offset(skip).limit(limit).all()
-    return donors
+    donors = page.apply(db.query(models.Donor), models.Donor.id).all()
+    return page.finish(donors, response)
 
 @router.post("/donations", response_model=schemas.Donation)
 def create_donation(
@@ -50,18 +50,18 @@ def create_donation(
 
 @router.get("/campaigns", response_model=List[schemas.FundraisingCampaign])
 def read_campaigns(
-    db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    db: Session = Depends(deps.get_read_db),
+    page: deps.Page = Depends(deps.get_page),
     current_tenant: models.Tenant = Depends(deps.get_current_tenant),
 ) -> Any:
     """
     Retrieve fundraising campaigns for current tenant.
     """
-    campaigns = db.query(models.FundraisingCampaign).filter(
+    campaigns = page.apply(db.query(models.FundraisingCampaign).filter(
         models.FundraisingCampaign.tenant_id == current_tenant.id
-    ).offset(skip).limit(limit).all()
-    return campaigns
+    ), models.FundraisingCampaign.id).all()
+    return page.finish(campaigns, response)
 
 @router.post("/campaigns", response_model=schemas.FundraisingCampaign)
 def create_campaign(
@@ -1,27 +1,30 @@
 from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
 
 from app import models, schemas
 from app.api import deps
+from app.db.loaders import election_detail_options
 
 router = APIRouter()
 
 @router.get("/", response_model=List[schemas.Election])
-def read_elections(
-    db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+async def read_elections(
+    response: Response,
+    db: AsyncSession = Depends(deps.get_async_db),
+    page: deps.Page = Depends(deps.get_page),
     current_tenant: models.Tenant = Depends(deps.check_tenant_plan(models.PlanTier.PROFESSIONAL)),
 ) -> Any:
     """
     Retrieve elections for the current tenant. Professional Tier and above only.
     """
-    elections = db.query(models.Election).filter(
+    stmt = select(models.Election).options(*election_detail_options()).where(
         models.Election.tenant_id == current_tenant.id
-    ).offset(skip).limit(limit).all()
-    return elections
+    )
+    result = await db.execute(page.apply(stmt, models.Election.id))
+    return page.finish(result.scalars().all(), response)
 
 @router.post("/", response_model=schemas.Election)
 def create_election(
@@ -41,19 +44,21 @@ def create_election(
     return election
 
 @router.get("/{id}", response_model=schemas.Election)
-def read_election(
+async def read_election(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     id: int,
     current_tenant: models.Tenant = Depends(deps.check_tenant_plan(models.PlanTier.PROFESSIONAL)),
 ) -> Any:
     """
     Get election by ID for current tenant.
     """
-    election = db.query(models.Election).filter(
-        models.Election.id == id,
-        models.Election.tenant_id == current_tenant.id
-    ).first()
+    result = await db.execute(
+        select(models.Election)
+        .options(*election_detail_options())
+        .where(models.Election.id == id, models.Election.tenant_id == current_tenant.id)
+    )
+    election = result.scalars().first()
     if not election:
         raise HTTPException(status_code=404, detail="Election not found")
     return election
@@ -126,9 +131,9 @@ def add_candidate(
     return candidate
 
 @router.post("/{id}/vote", response_model=schemas.Vote)
-def cast_vote(
+async def cast_vote(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     id: int,
     vote_in: schemas.VoteBase,
     current_user: models.user.User = Depends(deps.get_current_active_user),
@@ -136,25 +141,29 @@ def cast_vote(
     """
     Cast a vote in an election.
     """
-    election = db.query(models.election.Election).filter(models.election.Election.id == id).first()
+    election = await db.get(models.election.Election, id)
     if not election:
         raise HTTPException(status_code=404, detail="Election not found")
     if not election.is_active:
         raise HTTPException(status_code=400, detail="Election is not active")
     
     # Check if user already voted in this election
-    existing_vote = db.query(models.election.Vote).filter(
-        models.election.Vote.election_id == id,
-        models.election.Vote.user_id == current_user.id
-    ).first()
+    existing_vote = (await db.execute(
+        select(models.election.Vote.id).where(
+            models.election.Vote.election_id == id,
+            models.election.Vote.user_id == current_user.id
+        )
+    )).first()
     if existing_vote:
         raise HTTPException(status_code=400, detail="User has already voted in this election")
     
     # Check if candidate belongs to election
-    candidate = db.query(models.election.Candidate).filter(
-        models.election.Candidate.id == vote_in.candidate_id,
-        models.election.Candidate.election_id == id
-    ).first()
+    candidate = (await db.execute(
+        select(models.election.Candidate.id).where(
+            models.election.Candidate.id == vote_in.candidate_id,
+            models.election.Candidate.election_id == id
+        )
+    )).first()
     if not candidate:
         raise HTTPException(status_code=400, detail="Candidate does not belong to this election")
 
@@ -164,29 +173,35 @@ def cast_vote(
         user_id=current_user.id
     )
     db.add(vote)
-    db.commit()
-    db.refresh(vote)
+    await db.commit()
+    await db.refresh(vote)
     return vote
 
 @router.get("/{id}/results", response_model=schemas.ElectionResults)
-def read_election_results(
+async def read_election_results(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_read_db),
     id: int,
     current_user: models.user.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Read election results.
     """
-    election = db.query(models.election.Election).filter(models.election.Election.id == id).first()
+    election = (await db.execute(
+        select(models.election.Election)
+        .options(*election_detail_options())
+        .where(models.election.Election.id == id)
+    )).scalars().first()
     if not election:
         raise HTTPException(status_code=404, detail="Election not found")
     
     # Aggregate votes
-    vote_counts = db.query(
-        models.election.Vote.candidate_id,
-        func.count(models.election.Vote.id).label("count")
-    ).filter(models.election.Vote.election_id == id).group_by(models.election.Vote.candidate_id).all()
+    vote_counts = (await db.execute(
+        select(
+            models.election.Vote.candidate_id,
+            func.count(models.election.Vote.id).label("count")
+        ).where(models.election.Vote.election_id == id).group_by(models.election.Vote.candidate_id)
+    )).all()
     
     # Map to candidates
     candidate_map = {c.id: c.name for c in election.candidates}
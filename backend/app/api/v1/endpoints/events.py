@@ -1,29 +1,63 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response, status
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app import models, schemas
-from app import models, schemas
 from app.api import deps
-from app.services.email_service import email_service
+from app.db.loaders import EVENT_EXPANSIONS, event_detail_options, event_expansion_options
+from app.core.config import settings
+from app.services.email_outbox import email_outbox
+from app.services.email_segments import segment_resolver
+from app.services.waiting_room import waiting_room
 from app.models.email_list import EmailListStatus
 import datetime
 
 router = APIRouter()
 
-@router.get("/", response_model=List[schemas.Event])
-def read_events(
-    db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+def _parse_expand(expand: Optional[str]) -> List[str]:
+    if not expand:
+        return []
+    names = [name.strip() for name in expand.split(",") if name.strip()]
+    if "all" in names:
+        return list(EVENT_EXPANSIONS)
+    unknown = [name for name in names if name not in EVENT_EXPANSIONS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown expand value(s): {', '.join(unknown)}. "
+                   f"Allowed: all, {', '.join(EVENT_EXPANSIONS)}",
+        )
+    return names
+
+def _event_summary(event: models.Event, expand: List[str]) -> schemas.EventSummary:
+    # Copy columns explicitly so unrequested collections are never touched
+    data = {field: getattr(event, field) for field in schemas.EventInDBBase.model_fields}
+    for name in expand:
+        data[name] = getattr(event, name)
+    return schemas.EventSummary(**data)
+
+@router.get("/", response_model=List[schemas.EventSummary], response_model_exclude_unset=True)
+async def read_events(
+    response: Response,
+    db: AsyncSession = Depends(deps.get_async_read_db),
+    page: deps.Page = Depends(deps.get_page),
+    expand: Optional[str] = None,
     current_tenant: models.Tenant = Depends(deps.get_current_tenant),
 ) -> Any:
     """
     Retrieve events for the current tenant.
+    Returns lean summaries; pass expand=goals,budget_items,esg_metrics (or
+    expand=all) to include strategy collections, loaded in batches.
+    Ordered by start time; pass the X-Next-Cursor header back as ?cursor=.
     """
-    events = db.query(models.Event).filter(
+    expansions = _parse_expand(expand)
+    stmt = select(models.Event).options(*event_expansion_options(expansions)).where(
         models.Event.tenant_id == current_tenant.id
-    ).offset(skip).limit(limit).all()
-    return events
+    )
+    result = await db.execute(page.apply(stmt, models.Event.start_time, models.Event.id))
+    events = page.finish(result.scalars().all(), response)
+    return [_event_summary(event, expansions) for event in events]
 
 @router.post("/", response_model=schemas.Event)
 def create_event(
@@ -64,7 +98,7 @@ def create_email_list(
     # Optional: check permissions
     
     email_list = models.EmailList(
-        **email_list_in.dict(),
+        **email_list_in.model_dump(mode="json"),
         event_id=id,
         status=EmailListStatus.DRAFT
     )
@@ -92,31 +126,102 @@ def read_email_lists(
     email_lists = db.query(models.EmailList).filter(models.EmailList.event_id == id).offset(skip).limit(limit).all()
     return email_lists
 
-@router.post("/{id}/email-lists/{list_id}/send", response_model=schemas.EmailList)
+def _unique_recipients(recipients: List[dict]) -> List[dict]:
+    seen = set()
+    unique = []
+    for recipient in recipients:
+        email = recipient.get("email")
+        if email and email.lower() not in seen:
+            seen.add(email.lower())
+            unique.append(recipient)
+    return unique
+
+@router.post(
+    "/{id}/email-lists/{list_id}/send",
+    response_model=schemas.EmailJob,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 async def send_email_list(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     id: int,
     list_id: int,
+    background_tasks: BackgroundTasks,
     current_user: models.User = Depends(deps.get_current_user),
 ) -> Any:
     """
-    Send an email list.
+    Queue an email list for delivery; one outbox message per recipient.
+    Segment lists are resolved now, streamed from the database and
+    deduplicated by email. Returns the send job at once; poll it for progress.
     """
-    email_list = db.query(models.EmailList).filter(models.EmailList.id == list_id, models.EmailList.event_id == id).first()
+    result = await db.execute(
+        select(models.EmailList).where(models.EmailList.id == list_id, models.EmailList.event_id == id)
+    )
+    email_list = result.scalars().first()
     if not email_list:
         raise HTTPException(status_code=404, detail="Email list not found")
-        
-    if email_list.status == EmailListStatus.SENT:
-        raise HTTPException(status_code=400, detail="Email list already sent")
-        
-    await email_service.send_email_list(email_list)
-    
-    email_list.status = EmailListStatus.SENT
-    email_list.sent_at = datetime.datetime.utcnow()
-    db.commit()
-    db.refresh(email_list)
-    return email_list
+
+    # Claim the list before queueing so concurrent sends cannot both enqueue it
+    claimed = (await db.execute(
+        update(models.EmailList)
+        .where(
+            models.EmailList.id == list_id,
+            models.EmailList.status.not_in([EmailListStatus.SENDING, EmailListStatus.SENT]),
+        )
+        .values(status=EmailListStatus.SENDING)
+        .returning(models.EmailList.id)
+        .execution_options(synchronize_session=False)
+    )).first()
+    if claimed is None:
+        await db.rollback()
+        await db.refresh(email_list)
+        if email_list.status == EmailListStatus.SENT:
+            raise HTTPException(status_code=400, detail="Email list already sent")
+        raise HTTPException(status_code=400, detail="Email list is already being sent")
+
+    tenant_id = (await db.execute(select(models.Event.tenant_id).where(models.Event.id == id))).scalar_one()
+    if email_list.segment:
+        recipients = segment_resolver.stream(
+            db, schemas.EmailSegment.model_validate(email_list.segment), tenant_id=tenant_id, event_id=id
+        )
+    else:
+        recipients = _unique_recipients(email_list.recipients or [])
+    job = await email_outbox.enqueue(
+        db,
+        tenant_id=tenant_id,
+        subject=email_list.subject,
+        body=email_list.body,
+        recipients=recipients,
+        email_list_id=email_list.id,
+    )
+    if not job.total:
+        email_list.status = EmailListStatus.SENT
+        email_list.sent_at = datetime.datetime.utcnow()
+    await db.commit()
+    email_outbox.wake()
+    if settings.DB_ENGINE_MODE == "serverless":
+        background_tasks.add_task(email_outbox.drain)
+    return job
+
+@router.get("/{id}/email-jobs/{job_id}", response_model=schemas.EmailJob)
+async def read_email_job(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    id: int,
+    job_id: int,
+    current_user: models.User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Progress of an email list send.
+    """
+    job = (await db.execute(
+        select(models.EmailJob)
+        .join(models.EmailList, models.EmailList.id == models.EmailJob.email_list_id)
+        .where(models.EmailJob.id == job_id, models.EmailList.event_id == id)
+    )).scalars().first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Email job not found")
+    return job
 
 @router.post("/{id}/clone", response_model=schemas.Event)
 def clone_event(
@@ -162,19 +267,21 @@ def clone_event(
     return new_event
 
 @router.get("/{id}", response_model=schemas.Event)
-def read_event(
+async def read_event(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     id: int,
     current_tenant: models.Tenant = Depends(deps.get_current_tenant),
 ) -> Any:
     """
     Get event by ID for the current tenant.
     """
-    event = db.query(models.Event).filter(
-        models.Event.id == id,
-        models.Event.tenant_id == current_tenant.id
-    ).first()
+    result = await db.execute(
+        select(models.Event)
+        .options(*event_detail_options())
+        .where(models.Event.id == id, models.Event.tenant_id == current_tenant.id)
+    )
+    event = result.scalars().first()
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     return event
@@ -203,6 +310,8 @@ def update_event(
     db.add(event)
     db.commit()
     db.refresh(event)
+    if "waiting_room_rate" in update_data:
+        waiting_room.forget(event.id)
     return event
 
 @router.delete("/{id}", response_model=schemas.Event)
@@ -1,5 +1,5 @@
 from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from app import models, schemas
 from app.api import deps
@@ -10,19 +10,19 @@ router = APIRouter()
 
 @router.get("/fees", response_model=List[schemas.MembershipFee])
 def read_fees(
+    response: Response,
     db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+    page: deps.Page = Depends(deps.get_page),
     current_tenant: models.Tenant = Depends(deps.get_current_tenant),
 ) -> Any:
     """
     Retrieve active membership fees for current tenant.
     """
-    fees = db.query(models.MembershipFee).filter(
+    fees = page.apply(db.query(models.MembershipFee).filter(
         models.MembershipFee.is_active == True,
         models.MembershipFee.tenant_id == current_tenant.id
-    ).offset(skip).limit(limit).all()
-    return fees
+    ), models.MembershipFee.id).all()
+    return page.finish(fees, response)
 
 @router.post("/fees", response_model=schemas.MembershipFee)
 def create_fee(
@@ -82,16 +82,16 @@ def read_my_payments(
 
 @router.get("/payments", response_model=List[schemas.Payment])
 def read_all_payments(
+    response: Response,
     db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+    page: deps.Page = Depends(deps.get_page),
     current_user: models.User = Depends(deps.get_current_active_superuser),
     current_tenant: models.Tenant = Depends(deps.get_current_tenant),
 ) -> Any:
     """
     Get all payments for current tenant (Admin).
     """
-    payments = db.query(models.Payment).join(models.MembershipFee).filter(
+    payments = page.apply(db.query(models.Payment).join(models.MembershipFee).filter(
         models.MembershipFee.tenant_id == current_tenant.id
-    ).offset(skip).limit(limit).all()
-    return payments
+    ), models.Payment.id).all()
+    return page.finish(payments, response)
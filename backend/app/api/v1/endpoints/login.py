@@ -1,7 +1,9 @@
 from datetime import timedelta
-from typing import Any
-from fastapi import APIRouter, Body, Depends, HTTPException
+from typing import Any, Optional
+from fastapi import APIRouter, Body, Depends, HTTPException, Header, status
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import models, schemas
@@ -10,33 +12,82 @@ from app.core import security
 from app.core.config import settings
 from app.core.security import get_password_hash
 from app.models.user import User
+from app.services.session_store import session_store
 
 router = APIRouter()
 
+def _token_response(user: User, refresh_token: str) -> dict:
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    return {
+        "access_token": security.create_access_token(
+            user.id, expires_delta=access_token_expires
+        ),
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+    }
+
 @router.post("/login/access-token", response_model=schemas.Token)
-def login_access_token(
-    db: Session = Depends(deps.get_db), form_data: OAuth2PasswordRequestForm = Depends()
+async def login_access_token(
+    db: AsyncSession = Depends(deps.get_async_db), form_data: OAuth2PasswordRequestForm = Depends(),
+    user_agent: Optional[str] = Header(None),
 ) -> Any:
     """
     OAuth2 compatible token login, get an access token for future requests
     """
     try:
-        user = db.query(User).filter(User.email == form_data.username).first()
-        if not user or not security.verify_password(form_data.password, user.hashed_password):
+        user = (await db.execute(
+            select(User).where(User.email == form_data.username)
+        )).scalars().first()
+        if not user or not await security.verify_password(form_data.password, user.hashed_password):
             raise HTTPException(status_code=400, detail="Incorrect email or password")
         elif not user.is_active:
             raise HTTPException(status_code=400, detail="Inactive user")
             
-        access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        return {
-            "access_token": security.create_access_token(
-                user.id, expires_delta=access_token_expires
-            ),
-            "token_type": "bearer",
-        }
+        _, refresh_token = session_store.create(db, user.id, user_agent=user_agent)
+        await db.commit()
+        return _token_response(user, refresh_token)
     except HTTPException as he:
         raise he
     except Exception as e:
         # Debugging Vercel 500
         print(f"Login Crash: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Login Crash: {str(e)}")
+
+@router.post("/login/refresh-token", response_model=schemas.Token)
+def refresh_access_token(
+    *,
+    db: Session = Depends(deps.get_db),
+    token_in: schemas.RefreshTokenRequest,
+    user_agent: Optional[str] = Header(None),
+) -> Any:
+    """
+    Exchange a refresh token for a new access token. The refresh token is
+    rotated: the one presented is revoked and a new one is returned.
+    """
+    auth_session = session_store.lookup(db, token_in.refresh_token)
+    if not auth_session:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+    user = auth_session.user
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+
+    rotated = session_store.rotate(db, auth_session, user_agent=user_agent)
+    if rotated is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token expired or revoked")
+    _, refresh_token = rotated
+    db.commit()
+    return _token_response(user, refresh_token)
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(
+    *,
+    db: Session = Depends(deps.get_db),
+    token_in: schemas.RefreshTokenRequest,
+) -> None:
+    """
+    Revoke a refresh token. Outstanding access tokens remain valid until they expire.
+    """
+    auth_session = session_store.lookup(db, token_in.refresh_token)
+    if auth_session:
+        session_store.revoke(db, auth_session)
+        db.commit()
@@ -1,5 +1,5 @@
 from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from app import models, schemas
 from app.api import deps
@@ -48,11 +48,12 @@ def create_position(
 
 @router.get("/", response_model=List[Position])
 def read_positions(
+    response: Response,
     db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+    page: deps.Page = Depends(deps.get_page),
 ) -> Any:
     """
     Retrieve positions.
     """
-    return db.query(models.Position).offset(skip).limit(limit).all()
+    positions = page.apply(db.query(models.Position), models.Position.id).all()
+    return page.finish(positions, response)
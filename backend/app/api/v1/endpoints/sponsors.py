@@ -9,7 +9,7 @@ router = APIRouter()
 @router.get("/events/{event_id}/sponsors", response_model=List[schemas.Sponsor])
 def read_event_sponsors(
     event_id: int,
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
@@ -1,8 +1,21 @@
 from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from app import models, schemas
 from app.api import deps
+from app.core.idempotency import idempotency_store
+from app.core.principal_cache import principal_cache
+from app.core.security import password_hasher
+from app.db.async_session import async_engine
+from app.db.query_stats import query_stats_registry
+from app.db.replica import replica_router
+from app.db.session import engine, pool_stats
+from app.services.check_in import check_in_service
+from app.services.email_outbox import email_outbox
+from app.services.email_templates import email_templates
+from app.services.live_counters import live_counters
+from app.services.ticket_holds import ticket_holds
+from app.services.waiting_room import waiting_room
 
 router = APIRouter()
 
@@ -19,17 +32,17 @@ def get_system_admin(
 
 @router.get("/tenants", response_model=List[schemas.Tenant])
 def read_all_tenants(
+    response: Response,
     db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+    page: deps.Page = Depends(deps.get_page),
     system_admin: models.User = Depends(get_system_admin),
 ) -> Any:
     """
     Retrieve all tenants (System Admin only).
     """
     try:
-        tenants = db.query(models.Tenant).offset(skip).limit(limit).all()
-        return tenants
+        tenants = page.apply(db.query(models.Tenant), models.Tenant.id).all()
+        return page.finish(tenants, response)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"DB Error: {str(e)}")
 
@@ -74,6 +87,7 @@ def update_tenant(
     
     db.add(tenant)
     db.commit()
+    principal_cache.invalidate_tenant(tenant.id)
     db.refresh(tenant)
     return tenant
 
@@ -83,7 +97,7 @@ def delete_tenant(
     db: Session = Depends(deps.get_db),
     id: int,
     system_admin: models.User = Depends(get_system_admin),
-) -> Any:
+) -> None:
     """
     Delete a tenant.
     """
@@ -95,6 +109,7 @@ def delete_tenant(
     # Given the user request, we assume SQLAlchemy/DB cascades are sufficient or we just delete the root.
     db.delete(tenant)
     db.commit()
+    principal_cache.invalidate_tenant(id)
     return None
 
 @router.get("/stats")
@@ -131,3 +146,28 @@ def get_global_stats(
         "total_events": total_events,
         "total_donations": total_donations
     }
+
+@router.get("/metrics")
+async def get_runtime_metrics(
+    system_admin: models.User = Depends(get_system_admin),
+) -> Any:
+    """
+    Get in-process runtime metrics for this worker (caches, pools, queues).
+    email_queue is read from the database and covers all workers.
+    """
+    return {
+        "principal_cache": principal_cache.stats(),
+        "password_hashing": password_hasher.stats(),
+        "db_pool": pool_stats(engine),
+        "db_pool_async": pool_stats(async_engine),
+        "replica": replica_router.stats(),
+        "queries_by_endpoint": query_stats_registry.stats(),
+        "ticket_holds": ticket_holds.stats(),
+        "waiting_room": waiting_room.stats(),
+        "check_in": check_in_service.stats(),
+        "live_counters": live_counters.stats(),
+        "idempotency": idempotency_store.stats(),
+        "email_outbox": email_outbox.stats(),
+        "email_queue": await email_outbox.queue_depth(),
+        "email_templates": email_templates.stats(),
+    }
@@ -1,28 +1,47 @@
+import asyncio
+from collections import Counter
 from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status, BackgroundTasks
+from fastapi.responses import StreamingResponse
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import datetime
-import hashlib
 from app import models, schemas
 from app.api import deps
+from app.core.config import settings
+from app.core.ticket_signing import ticket_signer
+from app.db.loaders import registration_detail_options
 from app.models.ticketing import RegistrationStatus
+from app.services.email_outbox import email_outbox
 from app.services.email_service import email_service
+from app.services.exports import EXPORT_FORMATS, attendee_exporter
+from app.services.live_counters import live_counters
+from app.services.ticket_holds import ticket_holds
+from app.services.waiting_room import QUEUE_TOKEN_HEADER, waiting_room
+from app.services.waitlist import waitlist
 
 router = APIRouter()
 
+# Registration statuses that no longer occupy a seat
+RELEASED_STATUSES = {RegistrationStatus.CANCELLED, RegistrationStatus.REFUNDED}
+
 # --- Ticket Management ---
 
 @router.get("/events/{event_id}/tickets", response_model=List[schemas.TicketType])
-def read_event_tickets(
+async def read_event_tickets(
     event_id: int,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Get all ticket types available for an event.
     """
-    tickets = db.query(models.TicketType).filter(models.TicketType.event_id == event_id).all()
-    return tickets
+    result = await db.execute(
+        select(models.TicketType).where(models.TicketType.event_id == event_id)
+    )
+    return result.scalars().all()
 
 @router.post("/events/{event_id}/tickets", response_model=schemas.TicketType)
 def create_ticket_type(
@@ -44,92 +63,488 @@ def create_ticket_type(
     )
     db.add(ticket)
     db.commit()
+    live_counters.publish(event_id)
     db.refresh(ticket)
     return ticket
 
+@router.put("/events/{event_id}/tickets/{ticket_type_id}", response_model=schemas.TicketType)
+async def update_ticket_type(
+    event_id: int,
+    ticket_type_id: int,
+    ticket_in: schemas.TicketTypeUpdate,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Update a ticket type (Admin only).
+    Raising quantity_available promotes users from the waitlist.
+    """
+    ticket_type = (await db.execute(
+        select(models.TicketType)
+        .where(models.TicketType.id == ticket_type_id, models.TicketType.event_id == event_id)
+        .with_for_update()
+    )).scalar_one_or_none()
+    if not ticket_type:
+        raise HTTPException(status_code=404, detail="Ticket Type not found")
+
+    update_data = ticket_in.dict(exclude_unset=True)
+    capacity = update_data.get("quantity_available", ticket_type.quantity_available)
+    if capacity < ticket_type.quantity_sold + ticket_type.quantity_held:
+        raise HTTPException(status_code=400, detail="Capacity is below tickets already sold or held")
+    grew = capacity > ticket_type.quantity_available
+    for field, value in update_data.items():
+        setattr(ticket_type, field, value)
+
+    promoted = 0
+    if grew:
+        await db.flush()
+        promoted = await waitlist.promote(db, ticket_type.id)
+    await db.commit()
+    live_counters.publish(event_id)
+    _flush_emails(background_tasks, promoted)
+    await db.refresh(ticket_type)
+    return ticket_type
+
+@router.post("/events/{event_id}/tickets/reissue-qr")
+async def reissue_qr_codes(
+    event_id: int,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Re-sign every registration's QR code with the current key (Admin only).
+    Run after rotating QR_SIGNING_KEY_ID, before retiring the old key.
+    """
+    registrations = models.EventRegistration.__table__
+    rows = (await db.execute(
+        select(models.EventRegistration.id, models.EventRegistration.ticket_type_id)
+        .where(models.EventRegistration.event_id == event_id)
+    )).all()
+    if rows:
+        await db.execute(
+            update(registrations)
+            .where(registrations.c.id == bindparam("b_id"))
+            .values(qr_code_data=bindparam("b_qr")),
+            [
+                {"b_id": row.id, "b_qr": ticket_signer.sign(row.id, event_id, row.ticket_type_id)}
+                for row in rows
+            ],
+        )
+    await db.commit()
+    return {"reissued": len(rows), "key_id": ticket_signer.current_key_id}
+
+# --- Waiting Room ---
+
+@router.post("/events/{event_id}/queue", response_model=schemas.QueueTicket)
+async def join_queue(
+    event_id: int,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Join the event's waiting room. Poll GET /events/{event_id}/queue with the
+    returned token in X-Queue-Token, then send the same header to register.
+    """
+    queue_token = await waiting_room.join(db, event_id, current_user.id)
+    if queue_token is None:
+        raise HTTPException(status_code=400, detail="Event does not use a waiting room")
+    await db.commit()
+    claims = waiting_room.decode(queue_token, event_id, current_user.id)
+    return {**waiting_room.describe(claims), "queue_token": queue_token}
+
+@router.get("/events/{event_id}/queue", response_model=schemas.QueueStatus)
+def read_queue_status(
+    event_id: int,
+    queue_token: str = Header(..., alias=QUEUE_TOKEN_HEADER),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Queue position and estimated wait, computed from the token alone.
+    """
+    return waiting_room.describe(waiting_room.decode(queue_token, event_id, current_user.id))
+
 # --- Registration ---
 
-@router.post("/events/{event_id}/register", response_model=schemas.EventRegistration)
-def register_for_event(
+@router.post(
+    "/events/{event_id}/register",
+    response_model=schemas.EventRegistration,
+    dependencies=[Depends(deps.check_admission)],
+)
+async def register_for_event(
     event_id: int,
     registration_in: schemas.EventRegistrationCreate,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Register the current user for an event (Buy a ticket).
     Checks constraints: Capacity, Ticket Availability.
+
+    Inventory is taken with a single conditional UPDATE so concurrent buyers
+    cannot oversell, and duplicates are rejected by the unique
+    (event_id, user_id) constraint rather than a separate lookup.
     """
-    # 1. Verify Event exists
-    event = db.query(models.Event).filter(models.Event.id == event_id).first()
-    if not event:
+    # 1. Reserve one ticket (row is locked until commit)
+    ticket = (await db.execute(
+        update(models.TicketType)
+        .where(
+            models.TicketType.id == registration_in.ticket_type_id,
+            models.TicketType.event_id == event_id,
+            models.TicketType.quantity_sold + models.TicketType.quantity_held
+            < models.TicketType.quantity_available,
+        )
+        .values(quantity_sold=models.TicketType.quantity_sold + 1)
+        .returning(models.TicketType.id, models.TicketType.price)
+        .execution_options(synchronize_session=False)
+    )).first()
+    if ticket is None:
+        await db.rollback()
+        await _raise_unavailable(db, event_id, registration_in.ticket_type_id)
+
+    # 2. Create Registration and queue its confirmation email in the same transaction
+    registration = await _create_registration(db, event_id, current_user, ticket.id, ticket.price)
+    _flush_emails(background_tasks, 1)
+    return registration
+
+def _new_registration(event_id: int, user_id: int, ticket_type_id: int, price: float) -> models.EventRegistration:
+    # qr_code_data is signed once the id is known (see _create_registration)
+    return models.EventRegistration(
+        event_id=event_id,
+        user_id=user_id,
+        ticket_type_id=ticket_type_id,
+        status=RegistrationStatus.CONFIRMED,
+        payment_status="PAID" if price > 0 else "UNPAID",
+        check_in_status=False
+    )
+
+async def _create_registration(
+    db: AsyncSession, event_id: int, buyer: models.User, ticket_type_id: int, price: float
+) -> models.EventRegistration:
+    registration = _new_registration(event_id, buyer.id, ticket_type_id, price)
+    return (await _save_registrations(db, [registration], buyer))[0]
+
+async def _save_registrations(
+    db: AsyncSession, registrations: List[models.EventRegistration], buyer: models.User, group: bool = False
+) -> List[models.EventRegistration]:
+    """
+    Insert, queue the buyer's confirmation email and commit alongside the
+    caller's inventory update, so a registration is never stored without
+    its email. Returns the registrations loaded for the response.
+    """
+    db.add_all(registrations)
+    try:
+        await db.flush()
+        for registration in registrations:
+            registration.qr_code_data = ticket_signer.sign(
+                registration.id, registration.event_id, registration.ticket_type_id
+            )
+        # The session does not autoflush; write the signatures before the reload overwrites them
+        await db.flush()
+        result = await db.execute(
+            select(models.EventRegistration)
+            .options(*registration_detail_options())
+            .where(models.EventRegistration.id.in_([registration.id for registration in registrations]))
+            .order_by(models.EventRegistration.id)
+            .execution_options(populate_existing=True)
+        )
+        registrations = result.scalars().all()
+        _queue_confirmation(db, buyer, registrations, group)
+        await db.commit()
+    except IntegrityError:
+        # Rolls back the inventory update as well
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="User already registered for this event")
+    live_counters.publish(registrations[0].event_id)
+    return registrations
+
+def _queue_confirmation(
+    db: AsyncSession, buyer: models.User, registrations: List[models.EventRegistration], group: bool
+) -> None:
+    event = registrations[0].event
+    if not group:
+        email_service.queue_registration_confirmation(
+            db,
+            tenant_id=event.tenant_id,
+            user_email=buyer.email,
+            event_title=event.title,
+            ticket_type=registrations[0].ticket_type.name,
+            qr_code=registrations[0].qr_code_data,
+        )
+        return
+    email_service.queue_group_registration_confirmation(
+        db,
+        tenant_id=event.tenant_id,
+        user_email=buyer.email,
+        event_title=event.title,
+        tickets=[
+            {
+                "attendee": registration.user.full_name or registration.user.email,
+                "ticket_type": registration.ticket_type.name,
+                "qr_code": registration.qr_code_data,
+            }
+            for registration in registrations
+        ],
+    )
+
+def _flush_emails(background_tasks: BackgroundTasks, count: int) -> None:
+    """Hand committed outbox messages to the workers (or send them after the response when serverless)."""
+    if not count:
+        return
+    email_outbox.notify(count)
+    if settings.DB_ENGINE_MODE == "serverless":
+        background_tasks.add_task(email_outbox.drain)
+
+async def _raise_unavailable(db: AsyncSession, event_id: int, ticket_type_id: int, quantity: int = 1) -> None:
+    """Explain why the inventory UPDATE matched no row (slow path only)."""
+    if await db.get(models.Event, event_id) is None:
         raise HTTPException(status_code=404, detail="Event not found")
-        
-    # 2. Verify Ticket Type exists and belongs to event
-    ticket_type = db.query(models.TicketType).filter(models.TicketType.id == registration_in.ticket_type_id).first()
+    ticket_type = await db.get(models.TicketType, ticket_type_id)
     if not ticket_type:
         raise HTTPException(status_code=404, detail="Ticket Type not found")
     if ticket_type.event_id != event_id:
         raise HTTPException(status_code=400, detail="Ticket does not belong to this event")
-        
-    # 3. Check Ticket Availability
-    if ticket_type.quantity_sold >= ticket_type.quantity_available:
-        raise HTTPException(status_code=400, detail="Ticket type sold out")
-        
-    # 4. Check Duplicate Registration
-    existing = db.query(models.EventRegistration).filter(
-        models.EventRegistration.user_id == current_user.id,
-        models.EventRegistration.event_id == event_id
-    ).first()
-    if existing:
+    remaining = ticket_type.quantity_available - ticket_type.quantity_sold - ticket_type.quantity_held
+    if quantity > 1 and remaining > 0:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Only {remaining} tickets left for {ticket_type.name}",
+        )
+    raise HTTPException(status_code=400, detail="Ticket type sold out")
+
+@router.post(
+    "/events/{event_id}/register/group",
+    response_model=List[schemas.EventRegistration],
+    dependencies=[Depends(deps.check_admission)],
+)
+async def register_group_for_event(
+    event_id: int,
+    group_in: schemas.GroupRegistrationCreate,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Register several attendees (e.g. a table) in one transaction.
+    Attendees must be active members of the buyer's organization. Inventory
+    is taken with one conditional UPDATE per ticket type, and the buyer gets
+    a single consolidated confirmation.
+    """
+    # 1. Resolve attendees in one query
+    emails = [item.attendee_email or current_user.email for item in group_in.tickets]
+    if len(set(emails)) != len(emails):
+        raise HTTPException(status_code=400, detail="Each attendee can only be registered once")
+    attendees = {
+        user.email: user
+        for user in (await db.execute(
+            select(models.User).where(
+                models.User.email.in_(emails),
+                models.User.tenant_id == current_user.tenant_id,
+                models.User.is_active == True,
+            )
+        )).scalars().all()
+    }
+    unknown = [email for email in emails if email not in attendees]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown attendees: {', '.join(unknown)}")
+
+    # 2. Check Duplicate Registration (the unique constraint still guards races)
+    already = (await db.execute(
+        select(models.User.email)
+        .join(models.EventRegistration, models.EventRegistration.user_id == models.User.id)
+        .where(
+            models.EventRegistration.event_id == event_id,
+            models.User.id.in_([user.id for user in attendees.values()]),
+        )
+    )).scalars().all()
+    if already:
+        raise HTTPException(
+            status_code=400, detail=f"Already registered for this event: {', '.join(already)}"
+        )
+
+    # 3. Reserve tickets, one UPDATE per type in id order so concurrent groups lock consistently
+    wanted = Counter(item.ticket_type_id for item in group_in.tickets)
+    prices = {}
+    for ticket_type_id in sorted(wanted):
+        ticket = (await db.execute(
+            update(models.TicketType)
+            .where(
+                models.TicketType.id == ticket_type_id,
+                models.TicketType.event_id == event_id,
+                models.TicketType.quantity_sold + models.TicketType.quantity_held + wanted[ticket_type_id]
+                <= models.TicketType.quantity_available,
+            )
+            .values(quantity_sold=models.TicketType.quantity_sold + wanted[ticket_type_id])
+            .returning(models.TicketType.price)
+            .execution_options(synchronize_session=False)
+        )).first()
+        if ticket is None:
+            await db.rollback()
+            await _raise_unavailable(db, event_id, ticket_type_id, wanted[ticket_type_id])
+        prices[ticket_type_id] = ticket.price
+
+    # 4. Bulk insert registrations with one consolidated confirmation
+    registrations = await _save_registrations(db, [
+        _new_registration(event_id, attendees[email].id, item.ticket_type_id, prices[item.ticket_type_id])
+        for email, item in zip(emails, group_in.tickets)
+    ], current_user, group=True)
+    _flush_emails(background_tasks, 1)
+    return registrations
+
+# --- Holds (cart reservations) ---
+
+@router.post(
+    "/events/{event_id}/holds",
+    response_model=schemas.TicketHold,
+    dependencies=[Depends(deps.check_admission)],
+)
+async def create_ticket_hold(
+    event_id: int,
+    hold_in: schemas.TicketHoldCreate,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Hold a ticket for TICKET_HOLD_SECONDS while the buyer pays.
+    Confirm it to register, or release it to return the seat.
+    """
+    hold = await ticket_holds.create(db, current_user.id, event_id, hold_in.ticket_type_id)
+    if hold is None:
+        await db.rollback()
+        await _raise_unavailable(db, event_id, hold_in.ticket_type_id)
+    await db.commit()
+    live_counters.publish(event_id)
+    return hold
+
+@router.post("/holds/{hold_id}/confirm", response_model=schemas.EventRegistration)
+async def confirm_ticket_hold(
+    hold_id: int,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Turn the current user's hold into a confirmed registration.
+    """
+    confirmed = await ticket_holds.confirm(db, hold_id, current_user.id)
+    if confirmed is None:
+        await db.rollback()
+        raise HTTPException(status_code=404, detail="Hold not found or expired")
+    ticket_type_id, event_id, _, price = confirmed
+
+    registration = await _create_registration(db, event_id, current_user, ticket_type_id, price)
+    _flush_emails(background_tasks, 1)
+    return registration
+
+@router.delete("/holds/{hold_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def release_ticket_hold(
+    hold_id: int,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> None:
+    """
+    Release a hold early and offer its seats to the waitlist.
+    """
+    released = await ticket_holds.release(db, hold_id, current_user.id)
+    if released is None:
+        raise HTTPException(status_code=404, detail="Hold not found")
+    ticket_type_id, event_id = released
+    promoted = await waitlist.promote(db, ticket_type_id)
+    await db.commit()
+    live_counters.publish(event_id)
+    _flush_emails(background_tasks, promoted)
+
+# --- Waitlist ---
+
+async def _waitlist_entry_out(db: AsyncSession, entry: models.WaitlistEntry) -> schemas.WaitlistEntry:
+    entry_out = schemas.WaitlistEntry.model_validate(entry)
+    entry_out.position = await waitlist.position(db, entry)
+    return entry_out
+
+@router.post("/events/{event_id}/waitlist", response_model=schemas.WaitlistEntry)
+async def join_waitlist(
+    event_id: int,
+    waitlist_in: schemas.WaitlistJoin,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Join the FIFO waitlist for a sold-out ticket type.
+    When seats free up, the head of the line is given a hold and emailed.
+    """
+    ticket_type = await db.get(models.TicketType, waitlist_in.ticket_type_id)
+    if not ticket_type or ticket_type.event_id != event_id:
+        raise HTTPException(status_code=404, detail="Ticket Type not found")
+    if ticket_type.quantity_sold + ticket_type.quantity_held < ticket_type.quantity_available:
+        raise HTTPException(status_code=400, detail="Tickets are still available")
+    registered = (await db.execute(
+        select(models.EventRegistration.id).where(
+            models.EventRegistration.event_id == event_id,
+            models.EventRegistration.user_id == current_user.id,
+        )
+    )).first()
+    if registered:
         raise HTTPException(status_code=400, detail="User already registered for this event")
 
-    # 5. Create Registration
-    # Generate QR Code Hash
-    qr_data = hashlib.sha256(f"{current_user.id}-{event_id}-{datetime.datetime.utcnow()}".encode()).hexdigest()[:16]
-    
-    registration = models.EventRegistration(
-        event_id=event_id,
-        user_id=current_user.id,
-        ticket_type_id=ticket_type.id,
-        status=RegistrationStatus.CONFIRMED,
-        payment_status="PAID" if ticket_type.price > 0 else "UNPAID",
-        qr_code_data=qr_data,
-        check_in_status=False
+    entry = models.WaitlistEntry(
+        ticket_type_id=ticket_type.id, event_id=event_id, user_id=current_user.id
     )
-    
-    # 6. Update Ticket Inventory
-    ticket_type.quantity_sold += 1
-    
-    db.add(registration)
-    db.add(ticket_type)
-    db.commit()
-    db.refresh(registration)
+    db.add(entry)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Already on the waitlist")
+    return await _waitlist_entry_out(db, entry)
 
-    # 7. Send Confirmation Email (Background)
-    background_tasks.add_task(
-        email_service.send_registration_confirmation,
-        user_email=current_user.email,
-        event_title=event.title,
-        ticket_type=ticket_type.name,
-        qr_code=qr_data
+@router.get("/events/{event_id}/waitlist/me", response_model=List[schemas.WaitlistEntry])
+async def read_my_waitlist_positions(
+    event_id: int,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Get the current user's waitlist entries and queue positions for an event.
+    """
+    result = await db.execute(
+        select(models.WaitlistEntry).where(
+            models.WaitlistEntry.event_id == event_id,
+            models.WaitlistEntry.user_id == current_user.id,
+        )
     )
+    return [await _waitlist_entry_out(db, entry) for entry in result.scalars().all()]
 
-    return registration
+@router.delete("/waitlist/{entry_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def leave_waitlist(
+    entry_id: int,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> None:
+    """
+    Leave a waitlist.
+    """
+    entry = await db.get(models.WaitlistEntry, entry_id)
+    if not entry or entry.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Waitlist entry not found")
+    await db.delete(entry)
+    await db.commit()
 
 @router.get("/registrations/me", response_model=List[schemas.EventRegistration])
-def read_my_registrations(
-    db: Session = Depends(deps.get_db),
+async def read_my_registrations(
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Get all event registrations for the current user.
     """
-    registrations = db.query(models.EventRegistration).filter(
-        models.EventRegistration.user_id == current_user.id
-    ).all()
-    return registrations
+    result = await db.execute(
+        select(models.EventRegistration)
+        .options(*registration_detail_options())
+        .where(models.EventRegistration.user_id == current_user.id)
+    )
+    return result.scalars().all()
 
 @router.get("/events/{event_id}/registrations", response_model=List[schemas.EventRegistration])
 def read_event_registrations(
@@ -145,6 +560,58 @@ def read_event_registrations(
     ).all()
     return registrations
 
+@router.get("/events/{event_id}/live")
+async def stream_event_counters(
+    event_id: int,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Server-sent events with the event's live counters (Admin only):
+    registered, checked in, and sold/held/remaining per ticket type.
+    Use this for door dashboards instead of polling the registration list.
+    """
+    if await db.get(models.Event, event_id) is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    # End the read so the stream, which can stay open for hours, does not
+    # keep a pooled connection checked out; counters use their own sessions
+    await db.rollback()
+    return StreamingResponse(
+        _counter_events(event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+async def _counter_events(event_id: int):
+    queue = await live_counters.subscribe(event_id)
+    try:
+        while True:
+            try:
+                yield await asyncio.wait_for(queue.get(), timeout=settings.LIVE_COUNTERS_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+    finally:
+        live_counters.unsubscribe(event_id, queue)
+
+@router.get("/events/{event_id}/registrations/export")
+async def export_event_registrations(
+    event_id: int,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Stream the attendee list as CSV or NDJSON (Admin only).
+    Prefer this over the JSON listing for large events.
+    """
+    if await db.get(models.Event, event_id) is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return StreamingResponse(
+        attendee_exporter.stream(event_id, format),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="event-{event_id}-attendees.{format}"'},
+    )
+
 @router.put("/registrations/{reg_id}/check-in", response_model=schemas.EventRegistration)
 def check_in_attendee(
     reg_id: int,
@@ -162,26 +629,77 @@ def check_in_attendee(
     registration.check_in_time = datetime.datetime.utcnow()
     db.commit()
     db.refresh(registration)
+    live_counters.publish(registration.event_id)
     return registration
 
 @router.put("/registrations/{reg_id}/status", response_model=schemas.EventRegistration)
-def update_registration_status(
+async def update_registration_status(
     reg_id: int,
     status_in: schemas.EventRegistrationUpdate,
-    db: Session = Depends(deps.get_db),
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user: models.User = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     Update registration status (Admin only).
+    Cancelling or refunding returns the seat and promotes from the waitlist.
     """
-    registration = db.query(models.EventRegistration).filter(models.EventRegistration.id == reg_id).first()
+    registration = await db.get(models.EventRegistration, reg_id)
     if not registration:
         raise HTTPException(status_code=404, detail="Registration not found")
-        
+
     update_data = status_in.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(registration, field, value)
-        
-    db.commit()
-    db.refresh(registration)
-    return registration
+    # Compare-and-set on the status read above: of two concurrent changes only
+    # one gets a row back, so a seat is released or re-taken exactly once
+    updated = (await db.execute(
+        update(models.EventRegistration)
+        .where(
+            models.EventRegistration.id == reg_id,
+            models.EventRegistration.status == registration.status,
+        )
+        .values({"status": registration.status, **update_data})
+        .returning(models.EventRegistration.id)
+        .execution_options(synchronize_session=False)
+    )).first()
+    if updated is None:
+        raise HTTPException(status_code=409, detail="Registration was changed by another request; reload and retry")
+
+    was_released = registration.status in RELEASED_STATUSES
+    is_released = update_data.get("status", registration.status) in RELEASED_STATUSES
+    if is_released and not was_released:
+        await db.execute(
+            update(models.TicketType)
+            .where(models.TicketType.id == registration.ticket_type_id)
+            .values(quantity_sold=models.TicketType.quantity_sold - 1)
+            .execution_options(synchronize_session=False)
+        )
+    elif was_released and not is_released:
+        # Reinstating takes a seat again
+        reinstated = (await db.execute(
+            update(models.TicketType)
+            .where(
+                models.TicketType.id == registration.ticket_type_id,
+                models.TicketType.quantity_sold + models.TicketType.quantity_held
+                < models.TicketType.quantity_available,
+            )
+            .values(quantity_sold=models.TicketType.quantity_sold + 1)
+            .returning(models.TicketType.id)
+            .execution_options(synchronize_session=False)
+        )).first()
+        if reinstated is None:
+            raise HTTPException(status_code=400, detail="Ticket type sold out")
+
+    promoted = 0
+    if is_released and not was_released:
+        promoted = await waitlist.promote(db, registration.ticket_type_id)
+    event_id = registration.event_id
+    await db.commit()
+    live_counters.publish(event_id)
+    _flush_emails(background_tasks, promoted)
+
+    return (await db.execute(
+        select(models.EventRegistration)
+        .options(*registration_detail_options())
+        .where(models.EventRegistration.id == reg_id)
+        .execution_options(populate_existing=True)
+    )).scalar_one()
@@ -1,27 +1,31 @@
 from typing import Any, List
 
-from fastapi import APIRouter, Body, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Response
 from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import models, schemas
 from app.api import deps
+from app.core.principal_cache import principal_cache
 from app.core.security import get_password_hash
 from app.models.user import User
+from app.services.session_store import session_store
 
 router = APIRouter()
 
 @router.post("/", response_model=schemas.User)
-def create_user(
+async def create_user(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     user_in: schemas.UserCreate,
     current_user: models.User = Depends(deps.get_current_user_optional), # Need to add this dep
 ) -> Any:
     """
     Create new user.
     """
-    user = db.query(User).filter(User.email == user_in.email).first()
+    user = (await db.execute(select(User).where(User.email == user_in.email))).scalars().first()
     if user:
         raise HTTPException(
             status_code=400,
@@ -42,7 +46,7 @@ def create_user(
 
     db_obj = User(
         email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=await get_password_hash(user_in.password),
         full_name=user_in.full_name,
         role=user_in.role,
         is_active=user_in.is_active,
@@ -50,8 +54,8 @@ def create_user(
         # Add profile fields if UserCreate supports them, or update schema
     )
     db.add(db_obj)
-    db.commit()
-    db.refresh(db_obj)
+    await db.commit()
+    await db.refresh(db_obj)
     return db_obj
 
 @router.get("/me", response_model=schemas.User)
@@ -80,21 +84,22 @@ def update_user_me(
             setattr(current_user, field, user_data[field])
     db.add(current_user)
     db.commit()
+    principal_cache.invalidate_user(current_user.id)
     db.refresh(current_user)
     return current_user
 
 @router.get("/", response_model=List[schemas.User])
 def read_users(
+    response: Response,
     db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+    page: deps.Page = Depends(deps.get_page),
     current_user: models.User = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     Retrieve users.
     """
-    users = db.query(models.User).offset(skip).limit(limit).all()
-    return users
+    users = page.apply(db.query(models.User), models.User.id).all()
+    return page.finish(users, response)
 
 @router.get("/{user_id}", response_model=schemas.User)
 def read_user_by_id(
@@ -114,9 +119,9 @@ def read_user_by_id(
     return user
 
 @router.put("/{user_id}", response_model=schemas.User)
-def update_user(
+async def update_user(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     user_id: int,
     user_in: schemas.UserUpdate,
     current_user: models.User = Depends(deps.get_current_active_superuser),
@@ -124,7 +129,7 @@ def update_user(
     """
     Update a user.
     """
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    user = await db.get(models.User, user_id)
     if not user:
         raise HTTPException(
             status_code=404,
@@ -132,14 +137,18 @@ def update_user(
         )
     user_data = user_in.dict(exclude_unset=True)
     if "password" in user_data and user_data["password"]:
-        hashed_password = get_password_hash(user_data["password"])
+        hashed_password = await get_password_hash(user_data["password"])
         del user_data["password"]
         user.hashed_password = hashed_password
+        await session_store.revoke_user_sessions_async(db, user.id)
+    if user_data.get("is_active") is False:
+        await session_store.revoke_user_sessions_async(db, user.id)
     
     for field in user_data:
         setattr(user, field, user_data[field])
         
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    principal_cache.invalidate_user(user.id)
+    await db.refresh(user)
     return user
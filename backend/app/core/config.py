@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List, Any
+from typing import Dict, List, Any
 from pydantic import field_validator
 
 class Settings(BaseSettings):
@@ -16,12 +16,90 @@ class Settings(BaseSettings):
         if v and v.startswith("postgres://"):
             return v.replace("postgres://", "postgresql://", 1)
         return v
+
+    # Derived from DATABASE_URL (asyncpg / aiosqlite) when unset
+    ASYNC_DATABASE_URL: str | None = None
+
+    @field_validator("ASYNC_DATABASE_URL", mode="before")
+    @classmethod
+    def assemble_async_db_connection(cls, v: str | None) -> str | None:
+        if v and v.startswith("postgres://"):
+            return v.replace("postgres://", "postgresql+asyncpg://", 1)
+        return v
+
+    # Optional read replica for safe GETs (see app/db/replica.py)
+    DATABASE_REPLICA_URL: str | None = None
+    REPLICA_STICKY_SECONDS: float = 5.0 # Read-your-writes window after a user's write
+    REPLICA_MAX_LAG_SECONDS: float = 10.0
+    REPLICA_LAG_CHECK_INTERVAL: float = 5.0
+
+    @field_validator("DATABASE_REPLICA_URL", mode="before")
+    @classmethod
+    def assemble_replica_db_connection(cls, v: str | None) -> str | None:
+        if v and v.startswith("postgres://"):
+            return v.replace("postgres://", "postgresql://", 1)
+        return v
+
+    # Connection pool. DB_ENGINE_MODE is "server" (long-lived workers) or
+    # "serverless" (Vercel functions; see api/index.py).
+    DB_ENGINE_MODE: str = "server"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_SERVERLESS_NULLPOOL: bool = True # Rely on an external pooler (PgBouncer/Supavisor)
+    DB_SERVERLESS_POOL_SIZE: int = 1
+    DB_SERVERLESS_POOL_RECYCLE: int = 60
     
+    # Per-request query stats (Server-Timing header, N+1 warnings)
+    QUERY_STATS_ENABLED: bool = True
+    QUERY_N_PLUS_ONE_THRESHOLD: int = 10 # Same statement this many times in one request
+
     # SECURITY
     SECRET_KEY: str = "YOUR_SECRET_KEY_HERE_CHANGE_IN_PRODUCTION" # TODO: Change this
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
-    
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 14
+
+    # PRINCIPAL CACHE (per-process; set TTL to 0 to disable)
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+
+    # PASSWORD HASHING
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_SIZE: int = 16 # Rejected with 503 beyond workers + queue
+
+    # TICKET HOLDS (cart reservations)
+    TICKET_HOLD_SECONDS: int = 600
+    TICKET_HOLD_SWEEPER_ENABLED: bool = True # Background task; never started in serverless mode
+    TICKET_HOLD_SWEEP_INTERVAL: float = 30.0
+    TICKET_HOLD_SWEEP_BATCH: int = 500
+    WAITLIST_PROMOTION_BATCH: int = 500 # Promoted users get a hold of TICKET_HOLD_SECONDS
+
+    # WAITING ROOM (per-event admission queue)
+    WAITING_ROOM_ADMISSION_SECONDS: int = 900 # How long an admitted queue token stays valid
+    WAITING_ROOM_CONFIG_TTL: float = 5.0 # Per-process cache of each event's rate
+
+    # QR TICKETS (see app/core/ticket_signing.py)
+    QR_SIGNING_KEYS: Dict[str, str] = {} # key id -> secret, JSON in env; empty derives "k0" from SECRET_KEY
+    QR_SIGNING_KEY_ID: str | None = None # Key id for new tickets; defaults to the last listed key
+
+    # CHECK-IN SCANNERS
+    CHECK_IN_MANIFEST_OVERLAP_SECONDS: int = 30 # Re-send recent rows so in-flight commits are not missed
+
+    # IDEMPOTENCY KEYS (Idempotency-Key header on authenticated writes)
+    IDEMPOTENCY_TTL_SECONDS: int = 86400 # How long a stored response is replayed
+    IDEMPOTENCY_LOCK_SECONDS: int = 60 # An in-flight claim older than this is treated as abandoned
+    IDEMPOTENCY_WAIT_SECONDS: float = 10.0 # Duplicates wait this long for another worker's request
+    IDEMPOTENCY_PURGE_INTERVAL: float = 300.0
+
+    # LIVE DASHBOARD COUNTERS (SSE, see app/services/live_counters.py)
+    LIVE_COUNTERS_DEBOUNCE_SECONDS: float = 0.5 # Writes within this window share one recount
+    LIVE_COUNTERS_KEEPALIVE_SECONDS: float = 15.0
+    LIVE_COUNTERS_PG_BRIDGE: bool = True # LISTEN/NOTIFY fan-out across workers (PostgreSQL, server mode)
+
     # EMAIL
     MAIL_USERNAME: str = "your_email@example.com"
     MAIL_PASSWORD: str = "your_password"
@@ -32,6 +110,18 @@ class Settings(BaseSettings):
     MAIL_SSL: bool = False
     USE_CREDENTIALS: bool = True
     VALIDATE_CERTS: bool = True
+
+    # EMAIL OUTBOX (see app/services/email_outbox.py)
+    OUTBOX_WORKERS: int = 4 # Per process; each keeps one SMTP connection open
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_INTERVAL: float = 1.0
+    OUTBOX_LEASE_SECONDS: int = 120 # Claimed rows are retried if their worker dies mid-batch
+    OUTBOX_MAX_ATTEMPTS: int = 5
+    OUTBOX_RETRY_BASE_SECONDS: float = 30.0 # Doubles with each attempt
+    OUTBOX_TENANT_RATE: float = 20.0 # Messages/sec per tenant unless Tenant.email_rate_limit is set
+    OUTBOX_SMTP_IDLE_SECONDS: float = 60.0 # Close pooled SMTP connections idle this long
+    OUTBOX_FLUSH_SECONDS: float = 0.5 # Transactional mail wakes workers after this long, or at OUTBOX_BATCH_SIZE
+    EMAIL_TEMPLATE_CACHE_SIZE: int = 256 # Compiled templates kept per process
         
     # CORS
     BACKEND_CORS_ORIGINS: List[str] | str = []
@@ -0,0 +1,243 @@
+import asyncio
+import datetime
+import hashlib
+import logging
+import time
+import zlib
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from fastapi import Request, status
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from starlette.routing import compile_path
+
+from app import models
+from app.core.config import settings
+from app.db.async_session import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+# Writes that honour the header: retried by mobile clients, and unsafe to run twice
+IDEMPOTENT_ROUTES = (
+    ("POST", "/events/{event_id}/register"),
+    ("POST", "/fees/payments"),
+    ("POST", "/donors/donations"),
+)
+# Recomputed for every response rather than replayed
+_UNSTORED_HEADERS = {"content-length", "content-type", "server-timing"}
+
+class StoredResponse(NamedTuple):
+    request_hash: str
+    status_code: int
+    content_type: Optional[str]
+    headers: List[List[str]]
+    body: bytes
+
+class IdempotencyStore:
+    """
+    Replays the first response to an authenticated write sent with an
+    Idempotency-Key header to one of IDEMPOTENT_ROUTES (see the middleware
+    in main.py).
+
+    The first request claims the key with an in-flight row, runs, and stores
+    its response for IDEMPOTENCY_TTL_SECONDS. A retry is one primary-key
+    lookup and never reaches the endpoint. Duplicates arriving while the first
+    request runs wait for it: on a shared future within this worker, by
+    polling the row across workers. Only successful responses are kept; on an
+    error the claim is dropped so the client can retry the write. Reusing a
+    key with a different method, path or body is rejected with 422.
+    """
+
+    def __init__(self, prefix: str = settings.API_V1_STR):
+        self._routes = [(method, compile_path(prefix + path)[0]) for method, path in IDEMPOTENT_ROUTES]
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.executed = 0
+        self.replayed = 0
+        self.coalesced = 0
+        self.conflicts = 0
+        self.purged = 0
+
+    def applies_to(self, request: Request) -> bool:
+        return any(
+            request.method == method and pattern.match(request.url.path)
+            for method, pattern in self._routes
+        )
+
+    async def handle(
+        self,
+        request: Request,
+        user_id: int,
+        key: str,
+        call_next: Callable[[Request], Awaitable[Response]],
+    ) -> Response:
+        if len(key) > MAX_KEY_LENGTH:
+            return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={"detail": f"{IDEMPOTENCY_KEY_HEADER} must be at most {MAX_KEY_LENGTH} characters"},
+            )
+        key_hash = _digest(f"{user_id}:{key}".encode("utf-8"))
+        request_hash = _digest(
+            f"{request.method} {request.url.path}?{request.url.query}\n".encode("utf-8"), await request.body()
+        )
+
+        pending = self._in_flight.get(key_hash)
+        if pending is not None:
+            self.coalesced += 1
+            stored = await asyncio.shield(pending)
+            if stored is not None:
+                return self._replay(stored, request_hash)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key_hash] = future
+        stored = None
+        try:
+            claimed, stored = await self._claim(key_hash, user_id, request_hash)
+            if not claimed:
+                if stored is None:
+                    return JSONResponse(
+                        status_code=status.HTTP_409_CONFLICT,
+                        content={"detail": f"A request with this {IDEMPOTENCY_KEY_HEADER} is still in progress"},
+                    )
+                return self._replay(stored, request_hash)
+            try:
+                response = await call_next(request)
+            except Exception:
+                await self._release(key_hash)
+                raise
+            response, stored = await self._complete(key_hash, request_hash, response)
+            self.executed += 1
+            return response
+        finally:
+            if self._in_flight.get(key_hash) is future:
+                del self._in_flight[key_hash]
+            future.set_result(stored)
+
+    async def _claim(
+        self, key_hash: str, user_id: int, request_hash: str
+    ) -> Tuple[bool, Optional[StoredResponse]]:
+        """(True, None) if this request should run, else (False, stored response or None if still in flight)."""
+        deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+        while True:
+            now = datetime.datetime.utcnow()
+            async with AsyncSessionLocal() as db:
+                row = await db.get(models.IdempotencyKey, key_hash)
+                if row is not None and row.expires_at > now:
+                    if row.status_code is not None:
+                        return False, StoredResponse(
+                            row.request_hash, row.status_code, row.content_type,
+                            row.response_headers or [], zlib.decompress(row.response_body),
+                        )
+                else:
+                    if row is not None:
+                        # Expired response, or a claim abandoned by a crashed worker
+                        await db.execute(
+                            delete(models.IdempotencyKey).where(
+                                models.IdempotencyKey.key_hash == key_hash,
+                                models.IdempotencyKey.expires_at <= now,
+                            )
+                        )
+                    db.add(models.IdempotencyKey(
+                        key_hash=key_hash,
+                        user_id=user_id,
+                        request_hash=request_hash,
+                        expires_at=now + datetime.timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS),
+                    ))
+                    try:
+                        await db.commit()
+                        return True, None
+                    except IntegrityError:
+                        await db.rollback()
+            if time.monotonic() >= deadline:
+                return False, None
+            await asyncio.sleep(0.1)
+
+    async def _complete(
+        self, key_hash: str, request_hash: str, response: Response
+    ) -> Tuple[Response, Optional[StoredResponse]]:
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        buffered = Response(content=body, status_code=response.status_code)
+        buffered.raw_headers = list(response.raw_headers)
+        if response.status_code >= 400:
+            await self._release(key_hash)
+            return buffered, None
+
+        headers = [[name, value] for name, value in response.headers.items() if name not in _UNSTORED_HEADERS]
+        stored = StoredResponse(request_hash, response.status_code, response.headers.get("content-type"), headers, body)
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(models.IdempotencyKey)
+                .where(models.IdempotencyKey.key_hash == key_hash)
+                .values(
+                    status_code=stored.status_code,
+                    content_type=stored.content_type,
+                    response_headers=stored.headers,
+                    response_body=zlib.compress(body),
+                    expires_at=datetime.datetime.utcnow() + datetime.timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS),
+                )
+            )
+            await db.commit()
+        return buffered, stored
+
+    async def _release(self, key_hash: str) -> None:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                delete(models.IdempotencyKey).where(
+                    models.IdempotencyKey.key_hash == key_hash,
+                    models.IdempotencyKey.status_code.is_(None),
+                )
+            )
+            await db.commit()
+
+    def _replay(self, stored: StoredResponse, request_hash: str) -> Response:
+        if stored.request_hash != request_hash:
+            self.conflicts += 1
+            return JSONResponse(
+                status_code=422,
+                content={"detail": f"{IDEMPOTENCY_KEY_HEADER} was already used for a different request"},
+            )
+        self.replayed += 1
+        response = Response(content=stored.body, status_code=stored.status_code, media_type=stored.content_type)
+        for name, value in stored.headers:
+            response.headers.append(name, value)
+        response.headers[REPLAYED_HEADER] = "true"
+        return response
+
+    async def run_purger(self) -> None:
+        """Background loop started from main.py; deletes expired keys."""
+        while True:
+            try:
+                async with AsyncSessionLocal() as db:
+                    result = await db.execute(
+                        delete(models.IdempotencyKey)
+                        .where(models.IdempotencyKey.expires_at <= datetime.datetime.utcnow())
+                    )
+                    await db.commit()
+                self.purged += result.rowcount
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Idempotency key purge failed: {e}")
+            await asyncio.sleep(settings.IDEMPOTENCY_PURGE_INTERVAL)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._in_flight),
+            "executed": self.executed,
+            "replayed": self.replayed,
+            "coalesced": self.coalesced,
+            "conflicts": self.conflicts,
+            "purged": self.purged,
+        }
+
+def _digest(*parts: bytes) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part)
+    return digest.hexdigest()
+
+idempotency_store = IdempotencyStore()
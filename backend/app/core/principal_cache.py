@@ -0,0 +1,142 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from sqlalchemy import inspect
+
+from app.core.config import settings
+
+
+class Principal:
+    """
+    Compact, immutable snapshot of an authenticated user and their tenant.
+    Holds plain column values only (no password hash, no relationships).
+    """
+    __slots__ = ("user_fields", "tenant_fields")
+
+    def __init__(self, user_fields: Dict[str, Any], tenant_fields: Optional[Dict[str, Any]]):
+        self.user_fields = user_fields
+        self.tenant_fields = tenant_fields
+
+    @property
+    def user_id(self) -> int:
+        return self.user_fields["id"]
+
+    @property
+    def tenant_id(self) -> Optional[int]:
+        return self.user_fields.get("tenant_id")
+
+    @classmethod
+    def from_user(cls, user: Any) -> "Principal":
+        user_fields = {
+            attr.key: getattr(user, attr.key)
+            for attr in inspect(user).mapper.column_attrs
+            if attr.key != "hashed_password"
+        }
+        tenant_fields = None
+        if user.tenant is not None:
+            tenant = user.tenant
+            tenant_fields = {
+                "id": tenant.id,
+                "plan_tier": tenant.plan_tier,
+                "is_active": tenant.is_active,
+            }
+        return cls(user_fields, tenant_fields)
+
+
+class PrincipalCache:
+    """
+    Bounded TTL + LRU cache of Principal snapshots keyed by user id.
+    The cache is per-process; entries expire after `ttl` seconds so other
+    workers converge even without explicit invalidation.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl > 0
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] < now:
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def peek(self, user_id: int) -> Optional[Principal]:
+        """Like get(), but without touching counters or LRU order."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+        if entry is None or entry[0] < now:
+            return None
+        return entry[1]
+
+    def set(self, principal: Principal) -> None:
+        if not self.enabled:
+            return
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[principal.user_id] = (expires_at, principal)
+            self._entries.move_to_end(principal.user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+    def invalidate_tenant(self, tenant_id: int) -> None:
+        with self._lock:
+            stale = [
+                user_id for user_id, (_, principal) in self._entries.items()
+                if principal.tenant_id == tenant_id
+            ]
+            for user_id in stale:
+                del self._entries[user_id]
+            self.invalidations += len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+principal_cache = PrincipalCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
@@ -1,8 +1,17 @@
+import asyncio
 import bcrypt
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Callable, Dict, Optional, Union
+from fastapi import HTTPException, status
 from jose import jwt
 from app.core.config import settings
+from app.core.metrics import Histogram
 
 ALGORITHM = "HS256"
 
@@ -19,17 +28,105 @@ def create_access_token(
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+def token_subject(token: Optional[str]) -> Optional[int]:
+    """User id from a bearer token, or None if absent/invalid. No DB access."""
+    if not token:
+        return None
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+        return int(payload["sub"])
+    except (jwt.JWTError, KeyError, TypeError, ValueError):
+        return None
+
+def create_refresh_token() -> str:
+    return secrets.token_urlsafe(32)
+
+def hash_refresh_token(token: str) -> str:
+    """Keyed digest stored server-side; a lookup costs one HMAC, not bcrypt."""
+    return hmac.new(
+        settings.SECRET_KEY.encode("utf-8"), token.encode("utf-8"), hashlib.sha256
+    ).hexdigest()
+
+# --- Password hashing ---
+
+class PasswordHashingBusy(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service is busy, please retry shortly.",
+            headers={"Retry-After": "1"},
+        )
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated, bounded thread pool that callers await, so a
+    login storm never parks request threads or the event loop while hashing.
+    At most `workers + queue_size` jobs are admitted; beyond that callers
+    fail fast with 503.
+    """
+
+    def __init__(self, workers: int, queue_size: int):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hash"
+        )
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self.rejected = 0
+        self.queue_wait = Histogram("password_hash_queue_wait_seconds")
+        self.hash_time = Histogram("password_hash_seconds")
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise PasswordHashingBusy()
+        submitted = time.perf_counter()
+
+        def _job() -> Any:
+            started = time.perf_counter()
+            self.queue_wait.observe(started - submitted)
+            try:
+                return fn(*args)
+            finally:
+                self.hash_time.observe(time.perf_counter() - started)
+
+        future = self._executor.submit(_job)
+        # The slot stays taken until bcrypt finishes, even if the caller is cancelled
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "bcrypt_rounds": settings.BCRYPT_ROUNDS,
+            "rejected": self.rejected,
+            "queue_wait": self.queue_wait.snapshot(),
+            "hash_time": self.hash_time.snapshot(),
+        }
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+)
+
+def _checkpw(plain_password: str, hashed_password: str) -> bool:
     try:
         return bcrypt.checkpw(
-            plain_password.encode("utf-8"), 
+            plain_password.encode("utf-8"),
             hashed_password.encode("utf-8")
         )
     except Exception:
         return False
 
-def get_password_hash(password: str) -> str:
+def _hashpw(password: str) -> str:
     return bcrypt.hashpw(
-        password.encode("utf-8"), 
-        bcrypt.gensalt()
+        password.encode("utf-8"),
+        bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     ).decode("utf-8")
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.run(_checkpw, plain_password, hashed_password)
+
+async def get_password_hash(password: str) -> str:
+    return await password_hasher.run(_hashpw, password)
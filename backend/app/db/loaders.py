@@ -0,0 +1,47 @@
+"""
+Eager-loading option sets that match the nested response schemas.
+
+Async endpoints must load every relationship the response model touches up
+front; these helpers keep the option lists next to each other so schema and
+loader changes stay in step.
+"""
+from sqlalchemy.orm import selectinload
+
+from app import models
+
+# Strategy collections that event listings can opt into with ?expand=
+EVENT_EXPANSIONS = {
+    "goals": models.Event.goals,
+    "budget_items": models.Event.budget_items,
+    "esg_metrics": models.Event.esg_metrics,
+}
+
+def event_expansion_options(expand):
+    """Batched (SELECT ... IN) loads for the requested collections only."""
+    return [selectinload(EVENT_EXPANSIONS[name]) for name in expand]
+
+def event_detail_options(relationship=None):
+    """Collections serialized by schemas.Event, optionally below `relationship`."""
+    if relationship is None:
+        return [
+            selectinload(models.Event.goals),
+            selectinload(models.Event.budget_items),
+            selectinload(models.Event.esg_metrics),
+        ]
+    return [
+        selectinload(relationship).selectinload(models.Event.goals),
+        selectinload(relationship).selectinload(models.Event.budget_items),
+        selectinload(relationship).selectinload(models.Event.esg_metrics),
+    ]
+
+def registration_detail_options():
+    """Relationships serialized by schemas.EventRegistration."""
+    return [
+        selectinload(models.EventRegistration.user),
+        selectinload(models.EventRegistration.ticket_type),
+        *event_detail_options(models.EventRegistration.event),
+    ]
+
+def election_detail_options():
+    """Relationships serialized by schemas.Election."""
+    return [selectinload(models.Election.candidates)]
@@ -0,0 +1,104 @@
+import contextvars
+import logging
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class RequestQueryStats:
+    """Statements executed while serving one request."""
+
+    __slots__ = ("count", "duration", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.duration += elapsed
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> Optional[tuple]:
+        """Most repeated statement if it ran at least `threshold` times."""
+        if not self.statements:
+            return None
+        statement, times = self.statements.most_common(1)[0]
+        return (statement, times) if times >= threshold else None
+
+_current_stats: contextvars.ContextVar[Optional[RequestQueryStats]] = contextvars.ContextVar(
+    "request_query_stats", default=None
+)
+
+def begin_request() -> RequestQueryStats:
+    stats = RequestQueryStats()
+    _current_stats.set(stats)
+    return stats
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_times = conn.info.get("query_start_time")
+    if not start_times:
+        return
+    elapsed = time.perf_counter() - start_times.pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+def instrument_engine(engine) -> None:
+    """Attach statement timing hooks to a (sync) Engine; idempotent."""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+class QueryStatsRegistry:
+    """Per-endpoint aggregates and N+1 detections, exposed via /super-admin/metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, Dict[str, Any]] = {}
+
+    def observe(self, endpoint: str, stats: RequestQueryStats) -> None:
+        repeated = stats.repeated(settings.QUERY_N_PLUS_ONE_THRESHOLD)
+        with self._lock:
+            entry = self._endpoints.setdefault(endpoint, {
+                "requests": 0, "queries": 0, "db_time": 0.0,
+                "max_queries": 0, "n_plus_one": 0, "last_repeated_statement": None,
+            })
+            entry["requests"] += 1
+            entry["queries"] += stats.count
+            entry["db_time"] += stats.duration
+            entry["max_queries"] = max(entry["max_queries"], stats.count)
+            if repeated:
+                entry["n_plus_one"] += 1
+                entry["last_repeated_statement"] = repeated[0][:200]
+        if repeated:
+            logger.warning(
+                f"Possible N+1 in {endpoint}: statement ran {repeated[1]} times "
+                f"({stats.count} queries total): {repeated[0][:200]}"
+            )
+        else:
+            logger.debug(f"{endpoint}: {stats.count} queries in {stats.duration * 1000:.1f}ms")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                endpoint: {
+                    **entry,
+                    "db_time": round(entry["db_time"], 6),
+                    "avg_queries": round(entry["queries"] / entry["requests"], 2),
+                }
+                for endpoint, entry in self._endpoints.items()
+            }
+
+query_stats_registry = QueryStatsRegistry()
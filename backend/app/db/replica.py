@@ -0,0 +1,176 @@
+import hashlib
+import hmac
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.async_session import async_database_url
+from app.db.session import engine_options
+
+# Replay timestamp alone grows while the primary is idle; once the replica has
+# replayed everything it received there is nothing to wait for
+REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE COALESCE(EXTRACT(EPOCH FROM (now() - pg_last_xact_replay_timestamp())), 0) END"
+)
+
+STICKY_COOKIE = "umeb_primary_until"
+
+replica_engine = None
+ReplicaSessionLocal = None
+async_replica_engine = None
+AsyncReplicaSessionLocal = None
+
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = create_engine(
+        settings.DATABASE_REPLICA_URL, **engine_options(settings.DATABASE_REPLICA_URL)
+    )
+    ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+    _async_replica_url = async_database_url(settings.DATABASE_REPLICA_URL)
+    async_replica_engine = create_async_engine(
+        _async_replica_url, **engine_options(_async_replica_url, is_async=True)
+    )
+    AsyncReplicaSessionLocal = async_sessionmaker(
+        bind=async_replica_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
+class ReplicaRouter:
+    """
+    Decides whether a safe read may go to the replica.
+
+    Reads fall back to the primary when no replica is configured, when the
+    requesting user wrote within the last REPLICA_STICKY_SECONDS
+    (read-your-writes), or when measured replication lag exceeds
+    REPLICA_MAX_LAG_SECONDS. Lag is sampled at most once per
+    REPLICA_LAG_CHECK_INTERVAL. Write stickiness travels with the client as
+    a signed "<user>.<deadline>.<mac>" cookie, so it holds across workers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checking = False
+        self.lag_seconds: Optional[float] = None
+        self.lag_checked_at = 0.0
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self.sticky_fallbacks = 0
+        self.lag_fallbacks = 0
+        self.lag_check_errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return replica_engine is not None
+
+    # --- Read-your-writes ---
+
+    def _mac(self, message: str) -> str:
+        return hmac.new(
+            settings.SECRET_KEY.encode("utf-8"), f"primary:{message}".encode("ascii"), hashlib.sha256
+        ).hexdigest()[:32]
+
+    def sticky_token(self, user_id: int) -> str:
+        """Cookie value pinning this user's reads to the primary until the deadline."""
+        message = f"{user_id}.{int(time.time() + settings.REPLICA_STICKY_SECONDS)}"
+        return f"{message}.{self._mac(message)}"
+
+    def is_sticky(self, user_id: Optional[int], sticky_token: Optional[str]) -> bool:
+        if user_id is None or not sticky_token:
+            return False
+        parts = sticky_token.split(".")
+        if len(parts) != 3 or parts[0] != str(user_id):
+            return False
+        if not hmac.compare_digest(parts[2], self._mac(f"{parts[0]}.{parts[1]}")):
+            return False
+        try:
+            return time.time() < int(parts[1])
+        except ValueError:
+            return False
+
+    # --- Lag ---
+
+    def _lag_check_due(self) -> bool:
+        if time.monotonic() - self.lag_checked_at < settings.REPLICA_LAG_CHECK_INTERVAL:
+            return False
+        with self._lock:
+            if self._checking:
+                return False
+            self._checking = True
+            return True
+
+    def _record_lag(self, lag: Optional[float]) -> None:
+        if lag is None:
+            self.lag_check_errors += 1
+        self.lag_seconds = lag
+        self.lag_checked_at = time.monotonic()
+        self._checking = False
+
+    def refresh_lag(self) -> None:
+        if not self._lag_check_due():
+            return
+        lag = None
+        try:
+            if replica_engine.dialect.name != "postgresql":
+                lag = 0.0
+            else:
+                with replica_engine.connect() as conn:
+                    lag = float(conn.execute(REPLICA_LAG_SQL).scalar() or 0)
+        except Exception:
+            lag = None
+        self._record_lag(lag)
+
+    async def refresh_lag_async(self) -> None:
+        if not self._lag_check_due():
+            return
+        lag = None
+        try:
+            if async_replica_engine.dialect.name != "postgresql":
+                lag = 0.0
+            else:
+                async with async_replica_engine.connect() as conn:
+                    lag = float((await conn.execute(REPLICA_LAG_SQL)).scalar() or 0)
+        except Exception:
+            lag = None
+        self._record_lag(lag)
+
+    def _decide(self, user_id: Optional[int], sticky_token: Optional[str]) -> bool:
+        if self.is_sticky(user_id, sticky_token):
+            self.sticky_fallbacks += 1
+        elif self.lag_seconds is None or self.lag_seconds > settings.REPLICA_MAX_LAG_SECONDS:
+            self.lag_fallbacks += 1
+        else:
+            self.replica_reads += 1
+            return True
+        self.primary_reads += 1
+        return False
+
+    def use_replica(self, user_id: Optional[int], sticky_token: Optional[str] = None) -> bool:
+        if not self.enabled:
+            return False
+        self.refresh_lag()
+        return self._decide(user_id, sticky_token)
+
+    async def use_replica_async(self, user_id: Optional[int], sticky_token: Optional[str] = None) -> bool:
+        if not self.enabled:
+            return False
+        await self.refresh_lag_async()
+        return self._decide(user_id, sticky_token)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "lag_seconds": self.lag_seconds,
+            "max_lag_seconds": settings.REPLICA_MAX_LAG_SECONDS,
+            "sticky_seconds": settings.REPLICA_STICKY_SECONDS,
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+            "sticky_fallbacks": self.sticky_fallbacks,
+            "lag_fallbacks": self.lag_fallbacks,
+            "lag_check_errors": self.lag_check_errors,
+        }
+
+replica_router = ReplicaRouter()
@@ -1,8 +1,93 @@
+import time
+from typing import Any, Dict
+
 from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 from app.core.config import settings
+from app.core.metrics import Histogram
+
+class _CheckoutTimingMixin:
+    """Records how long callers wait for a pooled connection."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.checkout_wait = Histogram("db_pool_checkout_wait_seconds")
+        self.checkout_timeouts = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.checkout_timeouts += 1
+            raise
+        finally:
+            self.checkout_wait.observe(time.perf_counter() - start)
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    pass
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+def engine_options(url: str, is_async: bool = False) -> Dict[str, Any]:
+    """
+    Pool configuration for the current deployment mode.
+
+    - server: long-lived uvicorn workers keep a QueuePool sized by DB_POOL_*.
+    - serverless: each (short-lived) function instance either opens a fresh
+      connection per checkout (NullPool, for use behind PgBouncer/Supavisor)
+      or keeps a tiny pool that is recycled quickly.
+    """
+    if url.startswith("sqlite") and ":memory:" in url:
+        return {}
+    pool_class = InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool
+    options: Dict[str, Any] = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if settings.DB_ENGINE_MODE == "serverless":
+        if settings.DB_SERVERLESS_NULLPOOL:
+            options["poolclass"] = NullPool
+            return options
+        options.update(
+            poolclass=pool_class,
+            pool_size=settings.DB_SERVERLESS_POOL_SIZE,
+            max_overflow=0,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_SERVERLESS_POOL_RECYCLE,
+        )
+        return options
+    options.update(
+        poolclass=pool_class,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    return options
+
+def pool_stats(engine) -> Dict[str, Any]:
+    pool = engine.pool
+    stats: Dict[str, Any] = {
+        "mode": settings.DB_ENGINE_MODE,
+        "pool_class": type(pool).__name__,
+    }
+    if isinstance(pool, QueuePool):
+        capacity = pool.size() + pool._max_overflow
+        checked_out = pool.checkedout()
+        stats.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            checked_out=checked_out,
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+            saturation=round(checked_out / capacity, 4) if capacity > 0 else 0.0,
+            checkout_timeouts=getattr(pool, "checkout_timeouts", 0),
+            checkout_wait=pool.checkout_wait.snapshot() if isinstance(pool, _CheckoutTimingMixin) else None,
+        )
+    return stats
 
-engine = create_engine(settings.DATABASE_URL)
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -1,14 +1,17 @@
 from app.db.base_class import Base
 from app.models.user import User, UserRole, MembershipTier
 from app.models.tenant import Tenant, PlanTier
+from app.models.auth_session import AuthSession
+from app.models.idempotency import IdempotencyKey
 from app.models.donor import Donor, Donation, FundraisingCampaign
 from app.models.event import Event
 from app.models.email_list import EmailList
+from app.models.email_outbox import EmailJob, EmailJobStatus, OutboxMessage, OutboxStatus
 from app.models.event_goal import EventGoal
 from app.models.event_budget import EventBudget
 from app.models.event_esg import EventESG
 from app.models.election import Election, Candidate, Vote
-from app.models.ticketing import TicketType, EventRegistration, RegistrationStatus
+from app.models.ticketing import TicketType, TicketHold, WaitingRoomPass, WaitlistEntry, EventRegistration, RegistrationStatus
 from app.models.position import Position
 from app.models.fee import MembershipFee, Payment
 from app.models.agenda import EventSession
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from app.db.base_class import Base
+import datetime
+
+class AuthSession(Base):
+    """
+    Server-side record of an issued refresh token. Only an HMAC of the token is
+    stored. Rotation revokes the presented session and links it to its
+    replacement; all sessions from one login share a family_id so a replayed
+    (already rotated) token can revoke the whole chain.
+    """
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), nullable=False, index=True)
+    family_id = Column(String, nullable=False, index=True)
+    refresh_token_hash = Column(String, nullable=False, unique=True, index=True)
+    user_agent = Column(String, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    last_used_at = Column(DateTime, nullable=True)
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, nullable=True)
+    replaced_by_id = Column(Integer, ForeignKey("authsession.id"), nullable=True)
+
+    user = relationship("User")
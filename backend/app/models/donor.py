@@ -30,7 +30,7 @@ class FundraisingCampaign(Base):
 class Donation(Base):
     id = Column(Integer, primary_key=True, index=True)
     donor_id = Column(Integer, ForeignKey("donor.id"))
-    campaign_id = Column(Integer, ForeignKey("fundraisingcampaign.id"), nullable=True)
+    campaign_id = Column(Integer, ForeignKey("fundraisingcampaign.id"), nullable=True, index=True)
     amount = Column(Float, nullable=False)
     currency = Column(String, default="USD")
     payment_status = Column(String, default="pending") # pending, paid, failed
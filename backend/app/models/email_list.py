@@ -5,6 +5,7 @@ import enum
 
 class EmailListStatus(str, enum.Enum):
     DRAFT = "DRAFT"
+    SENDING = "SENDING"
     SENT = "SENT"
     FAILED = "FAILED"
 
@@ -13,6 +14,7 @@ class EmailList(Base):
     event_id = Column(Integer, ForeignKey("event.id"))
     name = Column(String, index=True, nullable=False)
     recipients = Column(JSON, default=[]) # List of dicts: [{'email': '...', 'name': '...'}]
+    segment = Column(JSON, nullable=True) # Query filters resolved at send time (schemas.EmailSegment); replaces recipients
     subject = Column(String, nullable=False)
     body = Column(Text, nullable=False)
     status = Column(Enum(EmailListStatus), default=EmailListStatus.DRAFT)
@@ -0,0 +1,63 @@
+from sqlalchemy import Column, Integer, SmallInteger, String, DateTime, ForeignKey, Text, JSON, Index
+from app.db.base_class import Base
+import datetime
+import enum
+
+class EmailJobStatus(str, enum.Enum):
+    QUEUED = "QUEUED"
+    DONE = "DONE"
+
+class OutboxStatus(str, enum.Enum):
+    PENDING = "PENDING"
+    SENT = "SENT"
+    FAILED = "FAILED"
+
+class EmailJob(Base):
+    """
+    One bulk send (e.g. an EmailList). Subject and body live here once; the
+    per-recipient OutboxMessage rows only carry the address. sent/failed are
+    bumped by the outbox workers as batches finish.
+    """
+    id = Column(Integer, primary_key=True, index=True)
+    tenant_id = Column(Integer, ForeignKey("tenant.id"), nullable=True)
+    email_list_id = Column(Integer, ForeignKey("emaillist.id", ondelete="SET NULL"), nullable=True, index=True)
+    subject = Column(String, nullable=False)
+    body = Column(Text, nullable=False)
+    status = Column(String, default=EmailJobStatus.QUEUED, nullable=False)
+    total = Column(Integer, default=0, nullable=False)
+    sent = Column(Integer, default=0, nullable=False)
+    failed = Column(Integer, default=0, nullable=False)
+
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+class OutboxMessage(Base):
+    """
+    One email waiting to go out. Workers claim due PENDING rows with
+    FOR UPDATE SKIP LOCKED and push next_attempt_at forward as a lease, so a
+    row whose worker died is picked up again once the lease runs out.
+    subject/body are NULL for job messages (taken from the EmailJob) and for
+    transactional messages, which name a built-in template filled from context.
+    Lower priority values are claimed first.
+    """
+    __table_args__ = (
+        Index("ix_outboxmessage_due", "status", "priority", "next_attempt_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("emailjob.id", ondelete="CASCADE"), nullable=True, index=True)
+    tenant_id = Column(Integer, ForeignKey("tenant.id"), nullable=True)
+    recipient = Column(String, nullable=False)
+    context = Column(JSON, nullable=True) # Per-recipient fields, e.g. {"name": "..."}
+    subject = Column(String, nullable=True)
+    body = Column(Text, nullable=True)
+    template = Column(String, nullable=True) # Built-in template name (app/services/email_templates.py)
+    priority = Column(SmallInteger, default=1, nullable=False) # 0 transactional, 1 bulk
+
+    status = Column(String, default=OutboxStatus.PENDING, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+    last_error = Column(String, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
@@ -31,6 +31,10 @@ class Event(Base):
     scenario_type = Column(String, default="IN_PERSON", nullable=False) # IN_PERSON, VIRTUAL, HYBRID
     is_public = Column(Boolean, default=True)
 
+    # Waiting room (see app/services/waiting_room.py)
+    waiting_room_rate = Column(Float, nullable=True) # Admissions per second; NULL disables the queue
+    waiting_room_next_admit = Column(Float, nullable=True) # Epoch seconds of the next free slot
+
     email_lists = relationship("EmailList", backref="event")
     
     # Relationships for strategy
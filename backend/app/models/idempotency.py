@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, LargeBinary
+from app.db.base_class import Base
+import datetime
+
+class IdempotencyKey(Base):
+    """
+    Stored response for a write sent with an Idempotency-Key header.
+    Keyed by a SHA-256 of (user id, key) so a retry is one primary-key lookup.
+    status_code is NULL while the first request is still in flight; the body
+    is zlib-compressed.
+    """
+    key_hash = Column(String(64), primary_key=True)
+    user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=True)
+    content_type = Column(String, nullable=True)
+    response_headers = Column(JSON, nullable=True) # [name, value] pairs replayed with the body
+    response_body = Column(LargeBinary, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
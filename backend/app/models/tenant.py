@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, Enum, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, Enum, DateTime, Float
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -15,6 +15,8 @@ class Tenant(Base):
     slug = Column(String, index=True, unique=True, nullable=False)
     plan_tier = Column(String, default="starter")
     is_active = Column(Boolean(), default=True)
+    email_rate_limit = Column(Float, nullable=True) # Outbox messages/sec; NULL uses OUTBOX_TENANT_RATE
+    email_next_send_at = Column(Float, nullable=True) # Outbox leaky bucket (epoch seconds)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationships
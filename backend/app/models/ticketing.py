@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Boolean, Enum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Boolean, Enum, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 import enum
 import datetime
@@ -19,6 +19,7 @@ class TicketType(Base):
     currency = Column(String, default="USD", nullable=False)
     quantity_available = Column(Integer, nullable=False) # Total tickets of this type
     quantity_sold = Column(Integer, default=0, nullable=False)
+    quantity_held = Column(Integer, default=0, nullable=False) # Sum of outstanding TicketHold.quantity
     sale_start = Column(DateTime, nullable=True)
     sale_end = Column(DateTime, nullable=True)
     is_active = Column(Boolean, default=True)
@@ -26,6 +27,11 @@ class TicketType(Base):
     event = relationship("Event", backref="ticket_types")
 
 class EventRegistration(Base):
+    __table_args__ = (
+        UniqueConstraint("event_id", "user_id", name="uq_eventregistration_event_user"),
+        Index("ix_eventregistration_event_updated", "event_id", "updated_at"), # Scanner delta sync
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     event_id = Column(Integer, ForeignKey("event.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
@@ -45,3 +51,43 @@ class EventRegistration(Base):
     event = relationship("Event", backref="registrations")
     user = relationship("User", backref="registrations")
     ticket_type = relationship("TicketType", backref="registrations")
+
+class TicketHold(Base):
+    """Seats reserved while a buyer pays; deleted on confirm, release or expiry."""
+    id = Column(Integer, primary_key=True, index=True)
+    ticket_type_id = Column(Integer, ForeignKey("tickettype.id", ondelete="CASCADE"), nullable=False, index=True)
+    event_id = Column(Integer, ForeignKey("event.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), nullable=False, index=True)
+    quantity = Column(Integer, default=1, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+    ticket_type = relationship("TicketType")
+
+class WaitingRoomPass(Base):
+    """A user's admission slot for an event; its jti makes the queue token single-use."""
+    __table_args__ = (
+        UniqueConstraint("event_id", "user_id", name="uq_waitingroompass_event_user"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    event_id = Column(Integer, ForeignKey("event.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), nullable=False, index=True)
+    jti = Column(String, nullable=False, unique=True)
+    admit_at = Column(Float, nullable=False) # Epoch seconds
+    rate = Column(Float, nullable=False) # Admission rate when the slot was taken
+    expires_at = Column(Float, nullable=False) # Epoch seconds
+    used_at = Column(DateTime, nullable=True)
+
+class WaitlistEntry(Base):
+    """FIFO queue per ticket type; entries are deleted when promoted to a hold."""
+    __table_args__ = (
+        UniqueConstraint("ticket_type_id", "user_id", name="uq_waitlistentry_ticket_type_user"),
+        Index("ix_waitlistentry_ticket_type_fifo", "ticket_type_id", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    ticket_type_id = Column(Integer, ForeignKey("tickettype.id", ondelete="CASCADE"), nullable=False)
+    event_id = Column(Integer, ForeignKey("event.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
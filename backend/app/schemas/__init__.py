@@ -1,16 +1,20 @@
 from app.schemas.user import User, UserCreate, UserUpdate, Token, TokenPayload
-from .token import Token, TokenPayload
+from .token import Token, TokenPayload, RefreshTokenRequest
 from .ticketing import (
     TicketType, TicketTypeCreate, TicketTypeUpdate,
-    EventRegistration, EventRegistrationCreate, EventRegistrationUpdate
+    TicketHold, TicketHoldCreate, WaitlistEntry, WaitlistJoin, QueueStatus, QueueTicket,
+    CheckInScan, BulkCheckIn, CheckInResult, BulkCheckInResult,
+    OfflineCheckIn, OfflineCheckInBatch,
+    EventRegistration, EventRegistrationCreate, EventRegistrationUpdate,
+    GroupRegistrationItem, GroupRegistrationCreate
 )
 from app.schemas.donor import (
     Donor, DonorCreate, DonorBase,
     Donation, DonationCreate, DonationBase,
     FundraisingCampaign, FundraisingCampaignCreate, FundraisingCampaignUpdate, FundraisingCampaignBase
 )
-from app.schemas.event import Event, EventCreate, EventUpdate
-from app.schemas.email_list import EmailList, EmailListCreate, EmailListUpdate, EmailListStatus
+from app.schemas.event import Event, EventCreate, EventUpdate, EventSummary, EventInDBBase
+from app.schemas.email_list import EmailList, EmailListCreate, EmailListUpdate, EmailListStatus, EmailJob, EmailSegment, SegmentSource
 from app.schemas.event_strategy import EventGoal, EventGoalCreate, EventBudget, EventBudgetCreate, EventESG, EventESGCreate
 from app.schemas.fee import MembershipFee, MembershipFeeCreate, Payment, PaymentCreate
 from .agenda import EventSession, EventSessionCreate, EventSessionUpdate
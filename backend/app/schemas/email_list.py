@@ -1,10 +1,12 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, model_validator
 from typing import List, Optional, Any
 from datetime import datetime
 from enum import Enum
+from app.models.user import MembershipTier
 
 class EmailListStatus(str, Enum):
     DRAFT = "DRAFT"
+    SENDING = "SENDING"
     SENT = "SENT"
     FAILED = "FAILED"
 
@@ -12,11 +14,41 @@ class EmailRecipient(BaseModel):
     email: EmailStr
     name: Optional[str] = None
 
+class SegmentSource(str, Enum):
+    EVENT_REGISTRANTS = "event_registrants"
+    MEMBERS = "members"
+    CAMPAIGN_DONORS = "campaign_donors"
+
+class EmailSegment(BaseModel):
+    """Recipients resolved by query at send time instead of stored on the list."""
+    source: SegmentSource
+    # event_registrants: defaults to the list's own event
+    event_id: Optional[int] = None
+    ticket_type_ids: Optional[List[int]] = None
+    checked_in: Optional[bool] = None
+    # members: None means every active member
+    membership_tiers: Optional[List[MembershipTier]] = None
+    # campaign_donors
+    campaign_id: Optional[int] = None
+
+    @model_validator(mode="after")
+    def check_source_fields(self):
+        if self.source == SegmentSource.CAMPAIGN_DONORS and self.campaign_id is None:
+            raise ValueError("campaign_donors segments need a campaign_id")
+        return self
+
 class EmailListBase(BaseModel):
     name: str
     subject: str
     body: str
     recipients: List[EmailRecipient] = []
+    segment: Optional[EmailSegment] = None
+
+    @model_validator(mode="after")
+    def check_one_source(self):
+        if self.segment is not None and self.recipients:
+            raise ValueError("Set either recipients or segment, not both")
+        return self
 
 class EmailListCreate(EmailListBase):
     pass
@@ -33,3 +65,16 @@ class EmailList(EmailListBase):
 
     class Config:
         from_attributes = True
+
+class EmailJob(BaseModel):
+    id: int
+    email_list_id: Optional[int] = None
+    status: str
+    total: int
+    sent: int
+    failed: int
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
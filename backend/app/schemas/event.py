@@ -22,6 +22,7 @@ class EventBase(BaseModel):
     parent_event_id: Optional[int] = None
     scenario_type: Optional[str] = "IN_PERSON"
     is_public: bool = True
+    waiting_room_rate: Optional[float] = None # Admissions per second during on-sale spikes
 
 # Properties to receive on creation
 class EventCreate(EventBase):
@@ -43,6 +44,13 @@ class EventInDBBase(EventBase):
     class Config:
         from_attributes = True
 
+# Lean listing shape; strategy collections are only present when requested
+# via ?expand= (see events.read_events)
+class EventSummary(EventInDBBase):
+    goals: Optional[List[EventGoal]] = None
+    budget_items: Optional[List[EventBudget]] = None
+    esg_metrics: Optional[List[EventESG]] = None
+
 # Properties to return to client
 class Event(EventInDBBase):
     goals: List[EventGoal] = []
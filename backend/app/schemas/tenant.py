@@ -1,5 +1,5 @@
 from typing import Optional
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator
 from app.models.tenant import PlanTier
 from datetime import datetime
 
@@ -8,6 +8,7 @@ class TenantBase(BaseModel):
     slug: Optional[str] = None
     plan_tier: Optional[PlanTier] = PlanTier.STARTER
     is_active: Optional[bool] = True
+    email_rate_limit: Optional[float] = Field(None, gt=0) # Outbox messages/sec; None uses the default
 
     @field_validator('plan_tier', mode='before')
     @classmethod
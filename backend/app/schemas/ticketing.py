@@ -1,6 +1,6 @@
 from typing import Optional, List
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, EmailStr, Field
 from app.schemas.user import User
 from app.schemas.event import Event
 
@@ -30,6 +30,7 @@ class TicketTypeInDBBase(TicketTypeBase):
     id: int
     event_id: int
     quantity_sold: int
+    quantity_held: int = 0
 
     class Config:
         from_attributes = True
@@ -38,6 +39,76 @@ class TicketTypeInDBBase(TicketTypeBase):
 class TicketType(TicketTypeInDBBase):
     pass
 
+# --- Hold Schemas ---
+
+class TicketHoldCreate(BaseModel):
+    ticket_type_id: int
+
+class TicketHold(BaseModel):
+    id: int
+    ticket_type_id: int
+    event_id: int
+    user_id: int
+    quantity: int
+    expires_at: datetime
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+# --- Waitlist Schemas ---
+
+class WaitlistJoin(BaseModel):
+    ticket_type_id: int
+
+class WaitlistEntry(BaseModel):
+    id: int
+    ticket_type_id: int
+    event_id: int
+    user_id: int
+    created_at: Optional[datetime] = None
+    position: Optional[int] = None # 1 = next to be promoted
+
+    class Config:
+        from_attributes = True
+
+# --- Waiting Room Schemas ---
+
+class QueueStatus(BaseModel):
+    admitted: bool
+    admit_at: datetime
+    position: int # Buyers ahead, estimated from the admission rate
+    estimated_wait_seconds: float
+
+class QueueTicket(QueueStatus):
+    queue_token: str # Send back as X-Queue-Token
+
+# --- Check-in Schemas ---
+
+class CheckInScan(BaseModel):
+    qr_code: str
+
+class BulkCheckIn(BaseModel):
+    scans: List[CheckInScan] = Field(..., max_length=1000)
+
+class OfflineCheckIn(BaseModel):
+    registration_id: int
+    scanned_at: datetime
+
+class OfflineCheckInBatch(BaseModel):
+    scans: List[OfflineCheckIn] = Field(..., max_length=1000)
+
+class CheckInResult(BaseModel):
+    qr_code: Optional[str] = None
+    status: str # checked_in, already_checked_in, cancelled, wrong_event, invalid, unknown
+    registration_id: Optional[int] = None
+    check_in_time: Optional[datetime] = None
+
+class BulkCheckInResult(BaseModel):
+    checked_in: int
+    rejected: int
+    results: List[CheckInResult]
+
 # --- Registration Schemas ---
 
 class EventRegistrationBase(BaseModel):
@@ -46,6 +117,13 @@ class EventRegistrationBase(BaseModel):
 class EventRegistrationCreate(EventRegistrationBase):
     event_id: int
 
+class GroupRegistrationItem(BaseModel):
+    ticket_type_id: int
+    attendee_email: Optional[EmailStr] = None # Defaults to the buyer
+
+class GroupRegistrationCreate(BaseModel):
+    tickets: List[GroupRegistrationItem] = Field(..., min_length=1, max_length=100)
+
 class EventRegistrationUpdate(BaseModel):
     status: Optional[str] = None
     payment_status: Optional[str] = None
@@ -0,0 +1,250 @@
+import datetime
+import hashlib
+import zlib
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.core.ticket_signing import ticket_signer
+from app.db.async_session import AsyncSessionLocal
+from app.models.ticketing import RegistrationStatus
+from app.services.exports import ndjson_line
+
+# Registration statuses that can no longer be admitted at the door
+INVALID_STATUSES = (RegistrationStatus.CANCELLED.value, RegistrationStatus.REFUNDED.value)
+
+class CheckInService:
+    """
+    Door check-in by QR code.
+
+    Signed tickets (app/core/ticket_signing.py) are validated in memory, so
+    forged or wrong-event codes never reach the database and valid ones are
+    checked in by primary key. Older unsigned codes are matched on
+    qr_code_data. A batch costs at most two statements regardless of size:
+    one UPDATE ... RETURNING for every admissible scan, then one SELECT to
+    explain the rest. Callers own the transaction.
+    """
+
+    def __init__(self):
+        self.scans = 0
+        self.checked_in = 0
+
+    async def scan(self, db: AsyncSession, event_id: int, qr_codes: Sequence[str]) -> List[Dict[str, Any]]:
+        """One result per scan, in input order."""
+        codes = list(dict.fromkeys(qr_codes))
+        decided: Dict[str, Dict[str, Any]] = {}
+        signed: Dict[int, str] = {} # registration id -> code, verified in memory
+        legacy: List[str] = []
+        for code in codes:
+            if not ticket_signer.is_signed(code):
+                legacy.append(code)
+                continue
+            claims = ticket_signer.verify(code)
+            if claims is None:
+                decided[code] = {"qr_code": code, "status": "invalid"}
+            elif claims.event_id != event_id:
+                decided[code] = {"qr_code": code, "status": "wrong_event",
+                                 "registration_id": claims.registration_id}
+            else:
+                signed[claims.registration_id] = code
+
+        def matching(registration_ids, legacy_codes):
+            criteria = []
+            if registration_ids:
+                criteria.append(models.EventRegistration.id.in_(registration_ids))
+            if legacy_codes:
+                criteria.append(models.EventRegistration.qr_code_data.in_(legacy_codes))
+            return or_(*criteria)
+
+        def code_for(row) -> str:
+            return signed.get(row.id, row.qr_code_data)
+
+        admitted: Dict[str, Any] = {}
+        if signed or legacy:
+            now = datetime.datetime.utcnow()
+            admitted = {
+                code_for(row): row
+                for row in (await db.execute(
+                    update(models.EventRegistration)
+                    .where(
+                        matching(list(signed), legacy),
+                        models.EventRegistration.event_id == event_id,
+                        models.EventRegistration.check_in_status.isnot(True),
+                        models.EventRegistration.status.notin_(INVALID_STATUSES),
+                    )
+                    .values(check_in_status=True, check_in_time=now)
+                    .returning(
+                        models.EventRegistration.id,
+                        models.EventRegistration.qr_code_data,
+                        models.EventRegistration.check_in_time,
+                    )
+                    .execution_options(synchronize_session=False)
+                )).all()
+            }
+
+        rejected_ids = [registration_id for registration_id, code in signed.items() if code not in admitted]
+        rejected_codes = [code for code in legacy if code not in admitted]
+        known = {}
+        if rejected_ids or rejected_codes:
+            known = {
+                code_for(row): row
+                for row in (await db.execute(
+                    select(
+                        models.EventRegistration.id,
+                        models.EventRegistration.qr_code_data,
+                        models.EventRegistration.event_id,
+                        models.EventRegistration.status,
+                        models.EventRegistration.check_in_time,
+                    ).where(matching(rejected_ids, rejected_codes))
+                )).all()
+            }
+
+        results = []
+        seen = set()
+        for code in qr_codes:
+            row = admitted.get(code)
+            if code in decided:
+                results.append(decided[code])
+            elif row is not None and code not in seen:
+                results.append({"qr_code": code, "status": "checked_in",
+                                "registration_id": row.id, "check_in_time": row.check_in_time})
+            elif row is not None:
+                # Same code scanned twice in one batch
+                results.append({"qr_code": code, "status": "already_checked_in",
+                                "registration_id": row.id, "check_in_time": row.check_in_time})
+            else:
+                results.append(self._rejection(code, known.get(code), event_id))
+            seen.add(code)
+
+        self.scans += len(qr_codes)
+        self.checked_in += len(admitted)
+        return results
+
+    async def sync(
+        self, db: AsyncSession, event_id: int, scans: Sequence[Tuple[int, datetime.datetime]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Apply check-ins recorded offline as (registration_id, scanned_at).
+
+        Conflicts resolve to the earliest scan: a registration already checked
+        in later (e.g. by another device) has its check_in_time moved back.
+        Scans of cancelled or refunded registrations are reported, not applied.
+        """
+        now = datetime.datetime.utcnow()
+        scans = [(registration_id, min(_naive_utc(scanned_at), now)) for registration_id, scanned_at in scans]
+        registrations = models.EventRegistration.__table__
+        if scans:
+            await db.execute(
+                update(registrations)
+                .where(
+                    registrations.c.id == bindparam("b_id"),
+                    registrations.c.event_id == event_id,
+                    # Literal comparisons: IN lists cannot be used with executemany
+                    *(registrations.c.status != invalid for invalid in INVALID_STATUSES),
+                    or_(
+                        registrations.c.check_in_status.isnot(True),
+                        registrations.c.check_in_time.is_(None),
+                        registrations.c.check_in_time > bindparam("b_time"),
+                    ),
+                )
+                .values(check_in_status=True, check_in_time=bindparam("b_time")),
+                [{"b_id": registration_id, "b_time": scanned_at} for registration_id, scanned_at in scans],
+            )
+
+        current = {
+            row.id: row
+            for row in (await db.execute(
+                select(
+                    models.EventRegistration.id,
+                    models.EventRegistration.event_id,
+                    models.EventRegistration.status,
+                    models.EventRegistration.check_in_time,
+                ).where(models.EventRegistration.id.in_({registration_id for registration_id, _ in scans}))
+            )).all()
+        } if scans else {}
+
+        results = []
+        applied = set()
+        for registration_id, scanned_at in scans:
+            row = current.get(registration_id)
+            if row is None:
+                results.append({"registration_id": registration_id, "status": "unknown"})
+            elif row.event_id != event_id:
+                results.append({"registration_id": registration_id, "status": "wrong_event"})
+            elif row.status in INVALID_STATUSES:
+                results.append({"registration_id": registration_id, "status": "cancelled",
+                                "check_in_time": row.check_in_time})
+            elif row.check_in_time == scanned_at and registration_id not in applied:
+                applied.add(registration_id)
+                results.append({"registration_id": registration_id, "status": "checked_in",
+                                "check_in_time": row.check_in_time})
+            else:
+                results.append({"registration_id": registration_id, "status": "already_checked_in",
+                                "check_in_time": row.check_in_time})
+
+        self.scans += len(scans)
+        self.checked_in += len(applied)
+        return results
+
+    async def manifest(self, event_id: int, since: Optional[datetime.datetime]) -> AsyncIterator[bytes]:
+        """
+        Gzipped NDJSON for offline scanners: one header line, then one line per
+        registration with the SHA-256 prefix of its QR code instead of the code.
+        Uses its own session so rows stream for the whole response.
+        """
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        yield compressor.compress(ndjson_line({"event_id": event_id, "since": since}))
+        stmt = select(
+            models.EventRegistration.id,
+            models.EventRegistration.qr_code_data,
+            models.EventRegistration.ticket_type_id,
+            models.EventRegistration.status,
+            models.EventRegistration.check_in_time,
+            models.EventRegistration.updated_at,
+        ).where(models.EventRegistration.event_id == event_id)
+        if since is not None:
+            stmt = stmt.where(models.EventRegistration.updated_at > since)
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(stmt.order_by(models.EventRegistration.updated_at).execution_options(yield_per=1000))
+            async for rows in result.partitions():
+                chunk = b"".join(
+                    ndjson_line({
+                        "id": row.id,
+                        "h": manifest_hash(row.qr_code_data) if row.qr_code_data else None,
+                        "t": row.ticket_type_id,
+                        "s": row.status,
+                        "c": row.check_in_time,
+                        "u": row.updated_at,
+                    })
+                    for row in rows
+                )
+                yield compressor.compress(chunk)
+        yield compressor.flush()
+
+    def _rejection(self, code: str, row: Any, event_id: int) -> Dict[str, Any]:
+        if row is None:
+            return {"qr_code": code, "status": "unknown"}
+        result = {"qr_code": code, "registration_id": row.id, "check_in_time": row.check_in_time}
+        if row.event_id != event_id:
+            result.update(status="wrong_event", check_in_time=None)
+        elif row.status in INVALID_STATUSES:
+            result["status"] = "cancelled"
+        else:
+            result["status"] = "already_checked_in"
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {"scans": self.scans, "checked_in": self.checked_in}
+
+def manifest_hash(qr_code: str) -> str:
+    """What scanners compare a scanned QR code against (first 64 bits of SHA-256)."""
+    return hashlib.sha256(qr_code.encode("utf-8")).hexdigest()[:16]
+
+def _naive_utc(value: datetime.datetime) -> datetime.datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return value
+
+check_in_service = CheckInService()
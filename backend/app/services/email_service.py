@@ -1,82 +1,43 @@
-from typing import List
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
-from app.core.config import settings
-from app.models.email_list import EmailList
-from pydantic import EmailStr
-import logging
-
-logger = logging.getLogger(__name__)
-
-conf = ConnectionConfig(
-    MAIL_USERNAME=settings.MAIL_USERNAME,
-    MAIL_PASSWORD=settings.MAIL_PASSWORD,
-    MAIL_FROM=settings.MAIL_FROM,
-    MAIL_PORT=settings.MAIL_PORT,
-    MAIL_SERVER=settings.MAIL_SERVER,
-    MAIL_STARTTLS=settings.MAIL_TLS,
-    MAIL_SSL_TLS=settings.MAIL_SSL,
-    USE_CREDENTIALS=settings.USE_CREDENTIALS,
-    VALIDATE_CERTS=settings.VALIDATE_CERTS
-)
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.services.email_outbox import email_outbox
+from app.services.email_templates import email_templates
 
 class EmailService:
-    def __init__(self):
-        self.fastmail = FastMail(conf)
-
-    async def send_email_list(self, email_list: EmailList):
-        if not email_list.recipients:
-            logger.warning(f"No recipients for email list {email_list.id}")
-            return
-
-        recipients = [r['email'] for r in email_list.recipients if 'email' in r]
-        
-        message = MessageSchema(
-            subject=email_list.subject,
-            recipients=recipients,
-            body=email_list.body,
-            subtype=MessageType.html
-        )
-
-        try:
-            await self.fastmail.send_message(message)
-            logger.info(f"Email list {email_list.id} sent successfully")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to send email list {email_list.id}: {str(e)}")
-            raise e
-
-    async def send_registration_confirmation(self, user_email: str, event_title: str, ticket_type: str, qr_code: str):
-        body = f"""
-        <html>
-        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-            <div style="max-width: 600px; margin: 0 auto; padding: 20px; border: 1px solid #eee; border-radius: 10px;">
-                <h2 style="color: #2563eb;">Registration Confirmed!</h2>
-                <p>Hello,</p>
-                <p>You have successfully registered for <strong>{event_title}</strong>.</p>
-                <div style="background-color: #f9fafb; padding: 15px; border-radius: 8px; margin: 20px 0;">
-                    <p style="margin: 0;"><strong>Ticket Type:</strong> {ticket_type}</p>
-                    <p style="margin: 0;"><strong>Confirmation Code:</strong> {qr_code}</p>
-                </div>
-                <p>Please have this confirmation ready (digital or printed) when you arrive at the event.</p>
-                <p>Thank you,<br>UMEB Management Team</p>
-            </div>
-        </body>
-        </html>
-        """
-        
-        message = MessageSchema(
-            subject=f"Confirmation: {event_title}",
-            recipients=[user_email],
-            body=body,
-            subtype=MessageType.html
-        )
-
-        try:
-            await self.fastmail.send_message(message)
-            logger.info(f"Registration confirmation sent to {user_email}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to send confirmation to {user_email}: {str(e)}")
-            return False
+    """
+    Transactional emails. Each call adds an outbox row for a built-in
+    template to the caller's transaction; nothing is sent from the request.
+    Callers commit, then call email_outbox.notify() with the number queued.
+    """
+
+    def queue_registration_confirmation(
+        self, db: AsyncSession, *, tenant_id: Optional[int], user_email: str, event_title: str, ticket_type: str, qr_code: str
+    ) -> None:
+        email_outbox.queue(db, tenant_id=tenant_id, recipient=user_email, template="registration_confirmation", context={
+            "event_title": event_title,
+            "ticket_type": ticket_type,
+            "qr_code": qr_code,
+        })
+
+    def queue_group_registration_confirmation(
+        self, db: AsyncSession, *, tenant_id: Optional[int], user_email: str, event_title: str, tickets: List[dict]
+    ) -> None:
+        # Rows are escaped here so the stored context stays one flat dict
+        rows = email_templates.render_batch(email_templates.builtin("group_registration_row"), tickets)
+        email_outbox.queue(db, tenant_id=tenant_id, recipient=user_email, template="group_registration_confirmation", context={
+            "event_title": event_title,
+            "ticket_count": len(tickets),
+            "ticket_rows": "".join(body for _, body in rows),
+        })
+
+    def queue_waitlist_promotion(
+        self, db: AsyncSession, *, tenant_id: Optional[int], user_email: str, event_title: str, ticket_type: str, hold_id: int, expires_at: str
+    ) -> None:
+        email_outbox.queue(db, tenant_id=tenant_id, recipient=user_email, template="waitlist_promotion", context={
+            "event_title": event_title,
+            "ticket_type": ticket_type,
+            "hold_id": hold_id,
+            "expires_at": expires_at,
+        })
 
 email_service = EmailService()
@@ -0,0 +1,168 @@
+import html
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+
+# {{field}} is HTML-escaped in bodies; {{{field}}} is inserted as-is
+FIELD_PATTERN = re.compile(r"\{\{\{\s*(\w+)\s*\}\}\}|\{\{\s*(\w+)\s*\}\}")
+BUILTIN_VERSION = 1
+
+def _one_line(value: str) -> str:
+    """Subjects are headers: no markup escaping, but no line breaks either."""
+    return " ".join(value.splitlines())
+
+class CompiledTemplate:
+    """Template text split once into literal chunks and field slots."""
+    __slots__ = ("_parts", "_slots")
+
+    def __init__(self, source: str, escape: Callable[[str], str]):
+        parts: List[str] = []
+        slots: List[Tuple[int, str, Optional[Callable[[str], str]]]] = []
+        position = 0
+        for match in FIELD_PATTERN.finditer(source):
+            parts.append(source[position:match.start()])
+            raw = match.group(1) is not None
+            slots.append((len(parts), match.group(1) or match.group(2), None if raw else escape))
+            parts.append("")
+            position = match.end()
+        parts.append(source[position:])
+        self._parts = parts
+        self._slots = tuple(slots)
+
+    @property
+    def fields(self) -> List[str]:
+        return [name for _, name, _ in self._slots]
+
+    def render(self, context: Dict[str, Any]) -> str:
+        out = self._parts.copy()
+        for index, name, escape in self._slots:
+            value = context.get(name)
+            value = "" if value is None else str(value)
+            out[index] = escape(value) if escape else value
+        return "".join(out)
+
+class EmailTemplate(NamedTuple):
+    subject: CompiledTemplate
+    body: CompiledTemplate
+
+    def render(self, context: Dict[str, Any]) -> Tuple[str, str]:
+        return self.subject.render(context), self.body.render(context)
+
+class TemplateCache:
+    """
+    Compiled email templates, LRU-cached per process by
+    (tenant_id, template name, version). Built-in templates use tenant None;
+    bulk sends use "email_job:<id>" since a job's content never changes.
+    Rendering only fills slots, so a list of any size is parsed once.
+    """
+
+    def __init__(self):
+        self._entries: "OrderedDict[Tuple[Optional[int], str, int], EmailTemplate]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, tenant_id: Optional[int], name: str, version: int) -> Optional[EmailTemplate]:
+        key = (tenant_id, name, version)
+        with self._lock:
+            template = self._entries.get(key)
+            if template is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return template
+
+    def compile(self, tenant_id: Optional[int], name: str, version: int, subject: str, body: str) -> EmailTemplate:
+        template = EmailTemplate(CompiledTemplate(subject, _one_line), CompiledTemplate(body, html.escape))
+        with self._lock:
+            self._entries[(tenant_id, name, version)] = template
+            while len(self._entries) > settings.EMAIL_TEMPLATE_CACHE_SIZE:
+                self._entries.popitem(last=False)
+        return template
+
+    def builtin(self, name: str) -> EmailTemplate:
+        template = self.lookup(None, name, BUILTIN_VERSION)
+        if template is None:
+            subject, body = BUILTIN_TEMPLATES[name]
+            template = self.compile(None, name, BUILTIN_VERSION, subject, body)
+        return template
+
+    def render_batch(self, template: EmailTemplate, contexts: Iterable[Dict[str, Any]]) -> List[Tuple[str, str]]:
+        """CPU-only; callers with large batches run it via asyncio.to_thread."""
+        return [template.render(context) for context in contexts]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "max_size": settings.EMAIL_TEMPLATE_CACHE_SIZE,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+_LAYOUT = """
+        <html>
+        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+            <div style="max-width: 600px; margin: 0 auto; padding: 20px; border: 1px solid #eee; border-radius: 10px;">
+{content}
+                <p>Thank you,<br>UMEB Management Team</p>
+            </div>
+        </body>
+        </html>
+        """
+
+BUILTIN_TEMPLATES: Dict[str, Tuple[str, str]] = {
+    "registration_confirmation": (
+        "Confirmation: {{event_title}}",
+        _LAYOUT.format(content="""                <h2 style="color: #2563eb;">Registration Confirmed!</h2>
+                <p>Hello,</p>
+                <p>You have successfully registered for <strong>{{event_title}}</strong>.</p>
+                <div style="background-color: #f9fafb; padding: 15px; border-radius: 8px; margin: 20px 0;">
+                    <p style="margin: 0;"><strong>Ticket Type:</strong> {{ticket_type}}</p>
+                    <p style="margin: 0;"><strong>Confirmation Code:</strong> {{qr_code}}</p>
+                </div>
+                <p>Please have this confirmation ready (digital or printed) when you arrive at the event.</p>"""),
+    ),
+    "group_registration_confirmation": (
+        "Confirmation: {{event_title}} ({{ticket_count}} tickets)",
+        _LAYOUT.format(content="""                <h2 style="color: #2563eb;">Group Registration Confirmed!</h2>
+                <p>Hello,</p>
+                <p>You have registered <strong>{{ticket_count}}</strong> attendees for <strong>{{event_title}}</strong>.</p>
+                <div style="background-color: #f9fafb; padding: 15px; border-radius: 8px; margin: 20px 0;">
+                    <table style="width: 100%; border-collapse: collapse;">
+                        <tr>
+                            <th style="text-align: left;">Attendee</th>
+                            <th style="text-align: left;">Ticket Type</th>
+                            <th style="text-align: left;">Confirmation Code</th>
+                        </tr>{{{ticket_rows}}}
+                    </table>
+                </div>
+                <p>Each attendee should have their confirmation code ready (digital or printed) when they arrive.</p>"""),
+    ),
+    "group_registration_row": (
+        "",
+        """
+                        <tr>
+                            <td style="padding: 6px 0;">{{attendee}}</td>
+                            <td style="padding: 6px 0;">{{ticket_type}}</td>
+                            <td style="padding: 6px 0; font-family: monospace;">{{qr_code}}</td>
+                        </tr>""",
+    ),
+    "waitlist_promotion": (
+        "Waitlist: {{event_title}}",
+        _LAYOUT.format(content="""                <h2 style="color: #2563eb;">A Ticket Is Waiting for You</h2>
+                <p>Hello,</p>
+                <p>A spot has opened up for <strong>{{event_title}}</strong> and we are holding it for you.</p>
+                <div style="background-color: #f9fafb; padding: 15px; border-radius: 8px; margin: 20px 0;">
+                    <p style="margin: 0;"><strong>Ticket Type:</strong> {{ticket_type}}</p>
+                    <p style="margin: 0;"><strong>Hold Reference:</strong> {{hold_id}}</p>
+                    <p style="margin: 0;"><strong>Held Until:</strong> {{expires_at}} UTC</p>
+                </div>
+                <p>Complete your registration before the hold expires, or the ticket will be offered to the next person on the waitlist.</p>"""),
+    ),
+}
+
+email_templates = TemplateCache()
@@ -0,0 +1,230 @@
+import asyncio
+import datetime
+import json
+import logging
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app import models
+from app.core.config import settings
+from app.db.async_session import ASYNC_DATABASE_URL, AsyncSessionLocal, async_engine
+from app.models.ticketing import RegistrationStatus
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "event_counters"
+RELEASED_STATUSES = (RegistrationStatus.CANCELLED.value, RegistrationStatus.REFUNDED.value)
+
+class LiveCounterHub:
+    """
+    In-process pub/sub for per-event dashboard counters.
+
+    Writers call publish(event_id) after committing. The hub coalesces bursts
+    for LIVE_COUNTERS_DEBOUNCE_SECONDS, computes the counters once with two
+    aggregate queries, and hands the same encoded SSE frame to every
+    subscriber of that event. Each subscriber is a one-slot queue, so slow
+    dashboards only ever see the latest frame. Events nobody is watching in
+    this worker cost nothing.
+
+    With the PostgreSQL bridge running, publish() goes through NOTIFY and
+    every worker (this one included) refreshes from its LISTEN callback.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = {}
+        self._pending: Set[int] = set()
+        self._latest: Dict[int, bytes] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._bridge = None
+        self._bridge_lock: Optional[asyncio.Lock] = None
+        self.refreshes = 0
+        self.published = 0
+
+    # --- Publishing ---
+
+    def publish(self, event_id: int) -> None:
+        """Safe to call from sync endpoints running in the threadpool."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        self.published += 1
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._dispatch(event_id)
+        else:
+            loop.call_soon_threadsafe(self._dispatch, event_id)
+
+    def _dispatch(self, event_id: int) -> None:
+        if self._bridge is not None:
+            asyncio.ensure_future(self._notify_workers(event_id))
+        else:
+            self.invalidate(event_id)
+
+    def invalidate(self, event_id: int) -> None:
+        if event_id not in self._subscribers or event_id in self._pending:
+            return
+        self._pending.add(event_id)
+        asyncio.ensure_future(self._refresh(event_id))
+
+    async def _refresh(self, event_id: int) -> None:
+        try:
+            await asyncio.sleep(settings.LIVE_COUNTERS_DEBOUNCE_SECONDS)
+            self._pending.discard(event_id)
+            if event_id not in self._subscribers:
+                return
+            frame = await self._frame(event_id)
+            for queue in list(self._subscribers.get(event_id, ())):
+                _offer(queue, frame)
+        except Exception as e:
+            self._pending.discard(event_id)
+            logger.error(f"Live counter refresh for event {event_id} failed: {e}")
+
+    # --- Counters ---
+
+    async def counters(self, event_id: int) -> Dict[str, Any]:
+        async with AsyncSessionLocal() as db:
+            totals = (await db.execute(
+                select(
+                    func.count(models.EventRegistration.id),
+                    func.sum(case((models.EventRegistration.check_in_status == True, 1), else_=0)),
+                ).where(
+                    models.EventRegistration.event_id == event_id,
+                    models.EventRegistration.status.notin_(RELEASED_STATUSES),
+                )
+            )).one()
+            ticket_types = (await db.execute(
+                select(
+                    models.TicketType.id,
+                    models.TicketType.name,
+                    models.TicketType.quantity_available,
+                    models.TicketType.quantity_sold,
+                    models.TicketType.quantity_held,
+                ).where(models.TicketType.event_id == event_id).order_by(models.TicketType.id)
+            )).all()
+        self.refreshes += 1
+        return {
+            "event_id": event_id,
+            "registered": totals[0],
+            "checked_in": totals[1] or 0,
+            "ticket_types": [
+                {
+                    "id": row.id,
+                    "name": row.name,
+                    "capacity": row.quantity_available,
+                    "sold": row.quantity_sold,
+                    "held": row.quantity_held,
+                    "remaining": max(0, row.quantity_available - row.quantity_sold - row.quantity_held),
+                }
+                for row in ticket_types
+            ],
+            "at": datetime.datetime.utcnow().isoformat(),
+        }
+
+    async def _frame(self, event_id: int) -> bytes:
+        payload = json.dumps(await self.counters(event_id), separators=(",", ":"))
+        frame = f"event: counters\ndata: {payload}\n\n".encode("utf-8")
+        self._latest[event_id] = frame
+        return frame
+
+    # --- Subscribers ---
+
+    async def subscribe(self, event_id: int) -> asyncio.Queue:
+        """Register a dashboard; the current counters are queued immediately."""
+        self._loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        first = event_id not in self._subscribers
+        self._subscribers.setdefault(event_id, set()).add(queue)
+        frame = self._latest.get(event_id)
+        if first or frame is None:
+            frame = await self._frame(event_id)
+        _offer(queue, frame)
+        return queue
+
+    def unsubscribe(self, event_id: int, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(event_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[event_id]
+            self._latest.pop(event_id, None)
+
+    # --- PostgreSQL LISTEN/NOTIFY bridge ---
+
+    async def run_bridge(self) -> None:
+        """
+        Background task started from main.py; one LISTEN connection per worker,
+        reconnecting on failure. The connection is opened outside the request
+        pool (NullPool engine) so it never takes a pooled slot.
+        """
+        self._loop = asyncio.get_running_loop()
+        if async_engine.dialect.name != "postgresql":
+            return
+        listener_engine = create_async_engine(ASYNC_DATABASE_URL, poolclass=NullPool)
+        try:
+            await self._listen(listener_engine)
+        finally:
+            await listener_engine.dispose()
+
+    async def _listen(self, listener_engine) -> None:
+        while True:
+            try:
+                async with listener_engine.connect() as conn:
+                    raw = await conn.get_raw_connection()
+                    driver = raw.driver_connection
+                    await driver.add_listener(NOTIFY_CHANNEL, self._on_notify)
+                    self._bridge, self._bridge_lock = driver, asyncio.Lock()
+                    logger.info("Live counter bridge listening")
+                    while not driver.is_closed():
+                        await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Live counter bridge failed: {e}")
+            finally:
+                self._bridge = None
+            await asyncio.sleep(5)
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        try:
+            self.invalidate(int(payload))
+        except ValueError:
+            pass
+
+    async def _notify_workers(self, event_id: int) -> None:
+        bridge = self._bridge
+        if bridge is None:
+            self.invalidate(event_id)
+            return
+        try:
+            async with self._bridge_lock:
+                await bridge.execute(f"NOTIFY {NOTIFY_CHANNEL}, '{int(event_id)}'")
+        except Exception as e:
+            logger.error(f"Live counter NOTIFY failed: {e}")
+            self.invalidate(event_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "watched_events": len(self._subscribers),
+            "subscribers": sum(len(queues) for queues in self._subscribers.values()),
+            "published": self.published,
+            "refreshes": self.refreshes,
+            "bridge": self._bridge is not None,
+        }
+
+def _offer(queue: asyncio.Queue, frame: bytes) -> None:
+    """Replace whatever the subscriber has not read yet with the newest frame."""
+    if queue.full():
+        try:
+            queue.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+    queue.put_nowait(frame)
+
+live_counters = LiveCounterHub()
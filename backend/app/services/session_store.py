@@ -0,0 +1,120 @@
+from typing import Optional, Tuple
+import datetime
+import logging
+import uuid
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+
+from app import models
+from app.core import security
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class SessionStore:
+    """
+    Refresh-token sessions backed by the authsession table.
+    Tokens are opaque random strings; only their HMAC is persisted.
+    """
+
+    def create(
+        self, db: Session, user_id: int, family_id: Optional[str] = None,
+        user_agent: Optional[str] = None
+    ) -> Tuple[models.AuthSession, str]:
+        refresh_token = security.create_refresh_token()
+        auth_session = models.AuthSession(
+            user_id=user_id,
+            family_id=family_id or uuid.uuid4().hex,
+            refresh_token_hash=security.hash_refresh_token(refresh_token),
+            user_agent=user_agent,
+            expires_at=datetime.datetime.utcnow() + datetime.timedelta(
+                days=settings.REFRESH_TOKEN_EXPIRE_DAYS
+            ),
+        )
+        db.add(auth_session)
+        return auth_session, refresh_token
+
+    def lookup(self, db: Session, refresh_token: str) -> Optional[models.AuthSession]:
+        """Single indexed lookup that also loads the user and tenant."""
+        return db.query(models.AuthSession).options(
+            joinedload(models.AuthSession.user).joinedload(models.User.tenant)
+        ).filter(
+            models.AuthSession.refresh_token_hash == security.hash_refresh_token(refresh_token)
+        ).first()
+
+    def rotate(
+        self, db: Session, auth_session: models.AuthSession,
+        user_agent: Optional[str] = None
+    ) -> Optional[Tuple[models.AuthSession, str]]:
+        """
+        Exchange a session for a fresh one in the same family. Returns None if
+        the session is expired or revoked; presenting an already-rotated token
+        is treated as theft and revokes the whole family.
+
+        The old session is claimed with a conditional UPDATE, so of two
+        concurrent refreshes with the same token exactly one succeeds; the
+        other sees it as rotated and revokes the family.
+        """
+        now = datetime.datetime.utcnow()
+        claimed = db.execute(
+            update(models.AuthSession)
+            .where(
+                models.AuthSession.id == auth_session.id,
+                models.AuthSession.revoked_at.is_(None),
+                models.AuthSession.expires_at > now,
+            )
+            .values(revoked_at=now, last_used_at=now)
+            .returning(models.AuthSession.id)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if claimed is None:
+            db.refresh(auth_session)
+            if auth_session.revoked_at is not None and auth_session.replaced_by_id is not None:
+                logger.warning(
+                    f"Refresh token reuse detected for user {auth_session.user_id}; revoking family"
+                )
+                self.revoke_family(db, auth_session.family_id)
+                db.commit()
+            return None
+
+        new_session, refresh_token = self.create(
+            db, auth_session.user_id, family_id=auth_session.family_id,
+            user_agent=user_agent or auth_session.user_agent
+        )
+        db.flush()
+        auth_session.revoked_at = now
+        auth_session.last_used_at = now
+        auth_session.replaced_by_id = new_session.id
+        return new_session, refresh_token
+
+    def revoke(self, db: Session, auth_session: models.AuthSession) -> None:
+        if auth_session.revoked_at is None:
+            auth_session.revoked_at = datetime.datetime.utcnow()
+
+    def revoke_family(self, db: Session, family_id: str) -> None:
+        db.query(models.AuthSession).filter(
+            models.AuthSession.family_id == family_id,
+            models.AuthSession.revoked_at.is_(None)
+        ).update({"revoked_at": datetime.datetime.utcnow()}, synchronize_session=False)
+
+    def revoke_user_sessions(self, db: Session, user_id: int) -> None:
+        db.query(models.AuthSession).filter(
+            models.AuthSession.user_id == user_id,
+            models.AuthSession.revoked_at.is_(None)
+        ).update({"revoked_at": datetime.datetime.utcnow()}, synchronize_session=False)
+
+    async def revoke_user_sessions_async(self, db: AsyncSession, user_id: int) -> None:
+        """Async counterpart of revoke_user_sessions."""
+        await db.execute(
+            update(models.AuthSession)
+            .where(
+                models.AuthSession.user_id == user_id,
+                models.AuthSession.revoked_at.is_(None)
+            )
+            .values(revoked_at=datetime.datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+
+session_store = SessionStore()
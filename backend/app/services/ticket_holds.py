@@ -0,0 +1,197 @@
+import asyncio
+import datetime
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.core.config import settings
+from app.db.async_session import AsyncSessionLocal
+from app.services.email_outbox import email_outbox
+from app.services.live_counters import live_counters
+from app.services.waitlist import waitlist
+
+logger = logging.getLogger(__name__)
+
+class TicketHoldService:
+    """
+    Cart reservations on top of TicketType inventory.
+
+    A hold moves seats into TicketType.quantity_held until it is confirmed
+    (held -> sold), released, or expires and is swept. Each transition
+    deletes the hold row with DELETE ... RETURNING, so whichever caller
+    deletes it is the only one that adjusts the counters. Availability is
+    always quantity_available - quantity_sold - quantity_held on one row.
+    Callers own the transaction.
+    """
+
+    def __init__(self):
+        self.created = 0
+        self.confirmed = 0
+        self.released = 0
+        self.expired = 0
+        self.last_sweep_at: Optional[datetime.datetime] = None
+
+    async def _reserve(self, db: AsyncSession, event_id: int, ticket_type_id: int, quantity: int):
+        return (await db.execute(
+            update(models.TicketType)
+            .where(
+                models.TicketType.id == ticket_type_id,
+                models.TicketType.event_id == event_id,
+                models.TicketType.quantity_sold + models.TicketType.quantity_held + quantity
+                <= models.TicketType.quantity_available,
+            )
+            .values(quantity_held=models.TicketType.quantity_held + quantity)
+            .returning(models.TicketType.id)
+            .execution_options(synchronize_session=False)
+        )).first()
+
+    async def create(
+        self, db: AsyncSession, user_id: int, event_id: int, ticket_type_id: int, quantity: int = 1
+    ) -> Optional[models.TicketHold]:
+        """Hold `quantity` seats, or return None if they are not available."""
+        reserved = await self._reserve(db, event_id, ticket_type_id, quantity)
+        if (
+            reserved is None
+            and not await waitlist.has_waiting(db, ticket_type_id)
+            and await self.sweep(db, ticket_type_id=ticket_type_id)
+        ):
+            # Expired holds were still counted; retry once they are released.
+            # With a waitlist, freed seats go to it through the sweeper instead.
+            reserved = await self._reserve(db, event_id, ticket_type_id, quantity)
+        if reserved is None:
+            return None
+        hold = models.TicketHold(
+            ticket_type_id=ticket_type_id,
+            event_id=event_id,
+            user_id=user_id,
+            quantity=quantity,
+            expires_at=datetime.datetime.utcnow() + datetime.timedelta(seconds=settings.TICKET_HOLD_SECONDS),
+        )
+        db.add(hold)
+        self.created += 1
+        return hold
+
+    async def confirm(self, db: AsyncSession, hold_id: int, user_id: int):
+        """
+        Convert an unexpired hold into sold inventory.
+        Returns (ticket_type_id, event_id, quantity, price) or None.
+        """
+        hold = (await db.execute(
+            delete(models.TicketHold)
+            .where(
+                models.TicketHold.id == hold_id,
+                models.TicketHold.user_id == user_id,
+                models.TicketHold.expires_at > datetime.datetime.utcnow(),
+            )
+            .returning(models.TicketHold.ticket_type_id, models.TicketHold.event_id, models.TicketHold.quantity)
+            .execution_options(synchronize_session=False)
+        )).first()
+        if hold is None:
+            return None
+        price = (await db.execute(
+            update(models.TicketType)
+            .where(models.TicketType.id == hold.ticket_type_id)
+            .values(
+                quantity_held=models.TicketType.quantity_held - hold.quantity,
+                quantity_sold=models.TicketType.quantity_sold + hold.quantity,
+            )
+            .returning(models.TicketType.price)
+            .execution_options(synchronize_session=False)
+        )).scalar_one()
+        self.confirmed += 1
+        return hold.ticket_type_id, hold.event_id, hold.quantity, price
+
+    async def release(self, db: AsyncSession, hold_id: int, user_id: int) -> Optional[Tuple[int, int]]:
+        """Return a hold's seats to inventory; returns (ticket_type_id, event_id), or None if not found."""
+        hold = (await db.execute(
+            delete(models.TicketHold)
+            .where(models.TicketHold.id == hold_id, models.TicketHold.user_id == user_id)
+            .returning(models.TicketHold.ticket_type_id, models.TicketHold.event_id, models.TicketHold.quantity)
+            .execution_options(synchronize_session=False)
+        )).first()
+        if hold is None:
+            return None
+        await self._return_seats(db, {hold.ticket_type_id: hold.quantity})
+        self.released += 1
+        return hold.ticket_type_id, hold.event_id
+
+    async def _return_seats(self, db: AsyncSession, seats: Dict[int, int]) -> None:
+        for ticket_type_id, quantity in seats.items():
+            await db.execute(
+                update(models.TicketType)
+                .where(models.TicketType.id == ticket_type_id)
+                .values(quantity_held=models.TicketType.quantity_held - quantity)
+                .execution_options(synchronize_session=False)
+            )
+
+    async def sweep(
+        self, db: AsyncSession, ticket_type_id: Optional[int] = None, batch_size: Optional[int] = None
+    ) -> Dict[int, int]:
+        """Release one batch of expired holds (oldest first); returns holds released per ticket type."""
+        expired = (
+            select(models.TicketHold.id)
+            .where(models.TicketHold.expires_at <= datetime.datetime.utcnow())
+            .order_by(models.TicketHold.expires_at)
+            .limit(batch_size or settings.TICKET_HOLD_SWEEP_BATCH)
+            .with_for_update(skip_locked=True)
+        )
+        if ticket_type_id is not None:
+            expired = expired.where(models.TicketHold.ticket_type_id == ticket_type_id)
+        rows = (await db.execute(
+            delete(models.TicketHold)
+            .where(models.TicketHold.id.in_(expired.scalar_subquery()))
+            .returning(models.TicketHold.ticket_type_id, models.TicketHold.quantity)
+            .execution_options(synchronize_session=False)
+        )).all()
+        seats: Dict[int, int] = defaultdict(int)
+        released: Dict[int, int] = defaultdict(int)
+        for row in rows:
+            seats[row.ticket_type_id] += row.quantity
+            released[row.ticket_type_id] += 1
+        await self._return_seats(db, seats)
+        self.expired += len(rows)
+        return dict(released)
+
+    async def run_sweeper(self) -> None:
+        """
+        Background loop started from main.py; drains expired holds batch by
+        batch and offers the freed seats to each ticket type's waitlist.
+        """
+        while True:
+            try:
+                while True:
+                    async with AsyncSessionLocal() as db:
+                        released = await self.sweep(db)
+                        promoted = await waitlist.promote_many(db, released)
+                        event_ids = (await db.execute(
+                            select(models.TicketType.event_id)
+                            .where(models.TicketType.id.in_(released))
+                            .distinct()
+                        )).scalars().all() if released else []
+                        await db.commit()
+                    for event_id in event_ids:
+                        live_counters.publish(event_id)
+                    email_outbox.notify(promoted)
+                    if sum(released.values()) < settings.TICKET_HOLD_SWEEP_BATCH:
+                        break
+                self.last_sweep_at = datetime.datetime.utcnow()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Ticket hold sweep failed: {e}")
+            await asyncio.sleep(settings.TICKET_HOLD_SWEEP_INTERVAL)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "created": self.created,
+            "confirmed": self.confirmed,
+            "released": self.released,
+            "expired": self.expired,
+            "last_sweep_at": self.last_sweep_at.isoformat() if self.last_sweep_at else None,
+        }
+
+ticket_holds = TicketHoldService()
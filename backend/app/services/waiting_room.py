@@ -0,0 +1,218 @@
+import datetime
+import math
+import secrets
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+from jose import jwt
+from sqlalchemy import case, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.core.config import settings
+from app.core.security import ALGORITHM
+
+QUEUE_TOKEN_HEADER = "X-Queue-Token"
+
+class WaitingRoom:
+    """
+    Opt-in admission queue for on-sale spikes (Event.waiting_room_rate).
+
+    Joining reserves the next admission slot with one UPDATE on the event
+    row: slots are 1/rate seconds apart and never earlier than now (a leaky
+    bucket), so a burst is spread out no matter when it arrives. The slot is
+    recorded as the user's WaitingRoomPass for the event and returned in a
+    signed queue token. Joining again while the pass is live returns the same
+    token instead of a new slot. Admission marks the pass used in the
+    caller's transaction, so a token buys once and is only spent if the
+    purchase commits. Per-event rates are cached per process for
+    WAITING_ROOM_CONFIG_TTL seconds.
+    """
+
+    def __init__(self):
+        self._rates: Dict[int, Tuple[Optional[float], float]] = {}
+        self._lock = threading.Lock()
+        self.issued = 0
+        self.rejoined = 0
+        self.admitted = 0
+        self.turned_away = 0
+        self.reused = 0
+
+    @property
+    def _signing_key(self) -> str:
+        # Distinct from the access-token key so queue tokens never authenticate
+        return f"{settings.SECRET_KEY}:waiting-room"
+
+    async def rate(self, db: AsyncSession, event_id: int) -> Optional[float]:
+        """Admissions per second for the event, or None when the queue is off."""
+        now = time.monotonic()
+        cached = self._rates.get(event_id)
+        if cached is not None and now - cached[1] < settings.WAITING_ROOM_CONFIG_TTL:
+            return cached[0]
+        rate = (await db.execute(
+            select(models.Event.waiting_room_rate).where(models.Event.id == event_id)
+        )).scalar_one_or_none()
+        with self._lock:
+            self._rates[event_id] = (rate or None, now)
+        return rate or None
+
+    def forget(self, event_id: int) -> None:
+        with self._lock:
+            self._rates.pop(event_id, None)
+
+    async def _pass(self, db: AsyncSession, event_id: int, user_id: int) -> Optional[models.WaitingRoomPass]:
+        return (await db.execute(
+            select(models.WaitingRoomPass).where(
+                models.WaitingRoomPass.event_id == event_id,
+                models.WaitingRoomPass.user_id == user_id,
+            )
+        )).scalar_one_or_none()
+
+    def _token(self, admission: models.WaitingRoomPass) -> str:
+        return jwt.encode(
+            {
+                "sub": str(admission.user_id),
+                "evt": admission.event_id,
+                "jti": admission.jti,
+                "adm": float(admission.admit_at),
+                "rate": float(admission.rate),
+                "exp": int(admission.expires_at),
+            },
+            self._signing_key,
+            algorithm=ALGORITHM,
+        )
+
+    async def join(self, db: AsyncSession, event_id: int, user_id: int) -> Optional[str]:
+        """
+        Queue token for the user's admission slot, taking the next slot unless
+        they already hold an unused, unexpired one. None if the event has no queue.
+        """
+        now = time.time()
+        current = await self._pass(db, event_id, user_id)
+        if current is not None and current.used_at is None and current.expires_at > now:
+            self.rejoined += 1
+            return self._token(current)
+        slot = (await db.execute(
+            update(models.Event)
+            .where(models.Event.id == event_id, models.Event.waiting_room_rate > 0)
+            .values(waiting_room_next_admit=case(
+                (models.Event.waiting_room_next_admit > now, models.Event.waiting_room_next_admit),
+                else_=now,
+            ) + 1.0 / models.Event.waiting_room_rate)
+            .returning(models.Event.waiting_room_next_admit, models.Event.waiting_room_rate)
+            .execution_options(synchronize_session=False)
+        )).first()
+        if slot is None:
+            return None
+        admit_at = slot.waiting_room_next_admit - 1.0 / slot.waiting_room_rate
+        values = {
+            "jti": secrets.token_urlsafe(16),
+            "admit_at": admit_at,
+            "rate": slot.waiting_room_rate,
+            "expires_at": admit_at + settings.WAITING_ROOM_ADMISSION_SECONDS,
+            "used_at": None,
+        }
+        if current is None:
+            admission = models.WaitingRoomPass(event_id=event_id, user_id=user_id, **values)
+            db.add(admission)
+            try:
+                await db.flush()
+            except IntegrityError:
+                admission = None
+        else:
+            # Replace the spent or expired pass unless a concurrent join already did
+            replaced = (await db.execute(
+                update(models.WaitingRoomPass)
+                .where(models.WaitingRoomPass.id == current.id, models.WaitingRoomPass.jti == current.jti)
+                .values(**values)
+                .returning(models.WaitingRoomPass.id)
+                .execution_options(synchronize_session=False)
+            )).first()
+            admission = None
+            if replaced is not None:
+                await db.refresh(current)
+                admission = current
+        if admission is None:
+            # Lost to a concurrent join by the same user: give the slot back and share theirs
+            await db.rollback()
+            self.rejoined += 1
+            return self._token(await self._pass(db, event_id, user_id))
+        self.issued += 1
+        return self._token(admission)
+
+    def decode(self, token: Optional[str], event_id: int, user_id: int) -> Dict[str, Any]:
+        if not token:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="This event uses a waiting room; join the queue first",
+            )
+        try:
+            claims = jwt.decode(token, self._signing_key, algorithms=[ALGORITHM])
+        except jwt.ExpiredSignatureError:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Queue admission has expired; join the queue again",
+            )
+        except jwt.JWTError:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid queue token")
+        if claims.get("evt") != event_id or claims.get("sub") != str(user_id):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid queue token")
+        return claims
+
+    def describe(self, claims: Dict[str, Any]) -> Dict[str, Any]:
+        wait = max(0.0, claims["adm"] - time.time())
+        return {
+            "admitted": wait == 0,
+            "admit_at": datetime.datetime.utcfromtimestamp(claims["adm"]),
+            "position": math.ceil(wait * claims["rate"]),
+            "estimated_wait_seconds": round(wait, 1),
+        }
+
+    async def admit(self, db: AsyncSession, token: Optional[str], event_id: int, user_id: int) -> None:
+        """
+        Raise unless the token admits this user to this event now, and spend
+        it. The caller's commit makes that final; a rollback leaves it usable.
+        """
+        claims = self.decode(token, event_id, user_id)
+        wait = claims["adm"] - time.time()
+        if wait > 0:
+            self.turned_away += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Not admitted yet",
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+        spent = (await db.execute(
+            update(models.WaitingRoomPass)
+            .where(
+                models.WaitingRoomPass.jti == claims.get("jti"),
+                models.WaitingRoomPass.event_id == event_id,
+                models.WaitingRoomPass.user_id == user_id,
+                models.WaitingRoomPass.used_at.is_(None),
+            )
+            .values(used_at=datetime.datetime.utcnow())
+            .returning(models.WaitingRoomPass.id)
+            .execution_options(synchronize_session=False)
+        )).first()
+        if spent is None:
+            self.reused += 1
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Queue token has already been used; join the queue again",
+            )
+        self.admitted += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "issued": self.issued,
+            "rejoined": self.rejoined,
+            "admitted": self.admitted,
+            "turned_away": self.turned_away,
+            "reused": self.reused,
+            "cached_events": len(self._rates),
+        }
+
+waiting_room = WaitingRoom()
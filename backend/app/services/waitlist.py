@@ -0,0 +1,141 @@
+import datetime
+import logging
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+from app.core.config import settings
+from app.services.email_service import email_service
+
+logger = logging.getLogger(__name__)
+
+class WaitlistService:
+    """
+    FIFO waitlist per ticket type.
+
+    Promotion turns the oldest entries into TicketHolds for whatever seats are
+    free, WAITLIST_PROMOTION_BATCH at a time. The ticket type row is locked
+    while a batch is taken so concurrent promotions cannot over-allocate.
+    Offer emails are queued in the same transaction; callers commit and then
+    call email_outbox.notify() with the returned count.
+    """
+
+    def __init__(self):
+        self.promoted = 0
+
+    async def position(self, db: AsyncSession, entry: models.WaitlistEntry) -> int:
+        """1-based place in line; an index range count on (ticket_type_id, id)."""
+        return (await db.execute(
+            select(func.count(models.WaitlistEntry.id)).where(
+                models.WaitlistEntry.ticket_type_id == entry.ticket_type_id,
+                models.WaitlistEntry.id <= entry.id,
+            )
+        )).scalar_one()
+
+    async def has_waiting(self, db: AsyncSession, ticket_type_id: int) -> bool:
+        return (await db.execute(
+            select(models.WaitlistEntry.id)
+            .where(models.WaitlistEntry.ticket_type_id == ticket_type_id)
+            .limit(1)
+        )).first() is not None
+
+    async def promote(self, db: AsyncSession, ticket_type_id: int) -> int:
+        """Hold free seats for the head of the queue; returns the number of offers queued."""
+        promoted = 0
+        while True:
+            ticket = (await db.execute(
+                select(
+                    models.TicketType.event_id,
+                    models.TicketType.quantity_available,
+                    models.TicketType.quantity_sold,
+                    models.TicketType.quantity_held,
+                )
+                .where(models.TicketType.id == ticket_type_id)
+                .with_for_update()
+            )).first()
+            if ticket is None:
+                break
+            free = ticket.quantity_available - ticket.quantity_sold - ticket.quantity_held
+            if free <= 0:
+                break
+            batch = min(free, settings.WAITLIST_PROMOTION_BATCH)
+
+            head = (
+                select(models.WaitlistEntry.id)
+                .where(models.WaitlistEntry.ticket_type_id == ticket_type_id)
+                .order_by(models.WaitlistEntry.id)
+                .limit(batch)
+            )
+            user_ids = (await db.execute(
+                delete(models.WaitlistEntry)
+                .where(models.WaitlistEntry.id.in_(head.scalar_subquery()))
+                .returning(models.WaitlistEntry.user_id)
+                .execution_options(synchronize_session=False)
+            )).scalars().all()
+            if not user_ids:
+                break
+
+            expires_at = datetime.datetime.utcnow() + datetime.timedelta(seconds=settings.TICKET_HOLD_SECONDS)
+            holds = [
+                models.TicketHold(
+                    ticket_type_id=ticket_type_id,
+                    event_id=ticket.event_id,
+                    user_id=user_id,
+                    quantity=1,
+                    expires_at=expires_at,
+                )
+                for user_id in user_ids
+            ]
+            db.add_all(holds)
+            await db.execute(
+                update(models.TicketType)
+                .where(models.TicketType.id == ticket_type_id)
+                .values(quantity_held=models.TicketType.quantity_held + len(holds))
+                .execution_options(synchronize_session=False)
+            )
+            await db.flush()
+            await self._queue_offers(db, [hold.id for hold in holds])
+            promoted += len(holds)
+            self.promoted += len(holds)
+            if len(user_ids) < batch:
+                break
+        return promoted
+
+    async def _queue_offers(self, db: AsyncSession, hold_ids: List[int]) -> None:
+        rows = (await db.execute(
+            select(
+                models.User.email,
+                models.Event.tenant_id,
+                models.Event.title,
+                models.TicketType.name,
+                models.TicketHold.id,
+                models.TicketHold.expires_at,
+            )
+            .join(models.User, models.User.id == models.TicketHold.user_id)
+            .join(models.TicketType, models.TicketType.id == models.TicketHold.ticket_type_id)
+            .join(models.Event, models.Event.id == models.TicketHold.event_id)
+            .where(models.TicketHold.id.in_(hold_ids))
+        )).all()
+        for row in rows:
+            email_service.queue_waitlist_promotion(
+                db,
+                tenant_id=row.tenant_id,
+                user_email=row.email,
+                event_title=row.title,
+                ticket_type=row.name,
+                hold_id=row.id,
+                expires_at=row.expires_at.strftime("%Y-%m-%d %H:%M"),
+            )
+
+    async def promote_many(self, db: AsyncSession, ticket_type_ids: Iterable[int]) -> int:
+        promoted = 0
+        for ticket_type_id in sorted(set(ticket_type_ids)):
+            promoted += await self.promote(db, ticket_type_id)
+        return promoted
+
+    def stats(self) -> Dict[str, Any]:
+        return {"promoted": self.promoted}
+
+waitlist = WaitlistService()
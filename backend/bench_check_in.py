@@ -0,0 +1,114 @@
+"""
+Measure door check-in throughput in scans per second.
+
+Usage: python bench_check_in.py [attendees] [batch_size]
+Run against a live API sharing this DATABASE_URL. Seeds an event with
+`attendees` confirmed registrations, then checks everyone in three ways:
+a sample through the legacy per-id PUT, a sample through the single-QR
+endpoint, and the rest through /check-in/bulk in batches of `batch_size`.
+"""
+import datetime
+import sys
+import time
+import uuid
+
+import requests
+
+from app import models
+from app.db.session import SessionLocal
+
+API_URL = "http://127.0.0.1:8000/api/v1"
+EMAIL = "admin@example.com"
+PASSWORD = "admin123"
+SAMPLE = 200
+
+def seed(attendees: int) -> tuple:
+    db = SessionLocal()
+    try:
+        admin = db.query(models.User).filter(models.User.email == EMAIL).first()
+        start = datetime.datetime.utcnow() + datetime.timedelta(days=1)
+        event = models.Event(
+            title="Door Bench",
+            start_time=start,
+            end_time=start + datetime.timedelta(hours=3),
+            location="Bench Hall",
+            created_by_id=admin.id,
+            tenant_id=admin.tenant_id,
+        )
+        db.add(event)
+        db.flush()
+        ticket = models.TicketType(
+            event_id=event.id, name="General Admission", quantity_available=attendees, quantity_sold=attendees
+        )
+        db.add(ticket)
+        run = uuid.uuid4().hex[:8]
+        users = [
+            models.User(
+                email=f"door-{run}-{i}@example.com",
+                hashed_password="!",
+                full_name=f"Attendee {i}",
+                tenant_id=admin.tenant_id,
+            )
+            for i in range(attendees)
+        ]
+        db.add_all(users)
+        db.flush()
+        registrations = [
+            models.EventRegistration(
+                event_id=event.id,
+                user_id=user.id,
+                ticket_type_id=ticket.id,
+                status=models.RegistrationStatus.CONFIRMED,
+                qr_code_data=f"{run}-{i:06d}",
+            )
+            for i, user in enumerate(users)
+        ]
+        db.add_all(registrations)
+        db.commit()
+        return event.id, [(r.id, r.qr_code_data) for r in registrations]
+    finally:
+        db.close()
+
+def timed(label: str, scans: int, fn) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {scans:>6} scans in {elapsed:6.2f}s = {scans / elapsed:8.0f} scans/s")
+
+if __name__ == "__main__":
+    attendees = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    event_id, tickets = seed(attendees)
+    print(f"Seeded event {event_id} with {attendees} registrations")
+
+    login_resp = requests.post(
+        f"{API_URL}/login/access-token",
+        data={"username": EMAIL, "password": PASSWORD}
+    )
+    login_resp.raise_for_status()
+    session = requests.Session()
+    session.headers["Authorization"] = f"Bearer {login_resp.json()['access_token']}"
+
+    legacy, single, bulk = tickets[:SAMPLE], tickets[SAMPLE:2 * SAMPLE], tickets[2 * SAMPLE:]
+
+    def run_legacy():
+        for reg_id, _ in legacy:
+            session.put(f"{API_URL}/registrations/{reg_id}/check-in").raise_for_status()
+
+    def run_single():
+        for _, qr_code in single:
+            session.post(f"{API_URL}/events/{event_id}/check-in", json={"qr_code": qr_code}).raise_for_status()
+
+    def run_bulk():
+        for i in range(0, len(bulk), batch_size):
+            batch = [{"qr_code": qr_code} for _, qr_code in bulk[i:i + batch_size]]
+            resp = session.post(f"{API_URL}/events/{event_id}/check-in/bulk", json={"scans": batch})
+            resp.raise_for_status()
+            if resp.json()["checked_in"] != len(batch):
+                print(f"Unexpected rejections: {resp.json()['rejected']}")
+                sys.exit(1)
+
+    timed("PUT /check-in (by id)", len(legacy), run_legacy)
+    timed("POST /check-in (QR)", len(single), run_single)
+    timed(f"POST /check-in/bulk x{batch_size}", len(bulk), run_bulk)
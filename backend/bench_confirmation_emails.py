@@ -0,0 +1,54 @@
+"""
+Measure registration confirmation delivery during an on-sale.
+
+Usage: python bench_confirmation_emails.py [buyers] [concurrency]
+Run against a live API sharing this DATABASE_URL and SECRET_KEY, with its
+MAIL_* settings pointed at an SMTP stand-in (e.g. `python -m aiosmtpd -n -l
+127.0.0.1:8025` with MAIL_PORT=8025, MAIL_TLS=false, USE_CREDENTIALS=false).
+Registers `buyers` throwaway users at once, then polls /super-admin/metrics
+until the transactional queue is empty and reports queue depth over time,
+SMTP sessions opened and the delivery latency histogram.
+"""
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from bench_ticket_reservation import API_URL, EMAIL, register, seed
+
+PASSWORD = "admin123"
+
+def metrics(headers: dict) -> dict:
+    return requests.get(f"{API_URL}/super-admin/metrics", headers=headers).json()
+
+if __name__ == "__main__":
+    buyers = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    resp = requests.post(f"{API_URL}/login/access-token", data={"username": EMAIL, "password": PASSWORD})
+    admin = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+    event_id, ticket_id, tokens = seed(buyers, buyers)
+    before = metrics(admin)["email_outbox"]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda t: register(event_id, ticket_id, t), tokens))
+    elapsed = time.perf_counter() - start
+    print(f"{buyers} registrations in {elapsed:.2f}s ({buyers / elapsed:.0f}/s)")
+
+    while True:
+        current = metrics(admin)
+        queue = current["email_queue"]["transactional"]
+        print(f"  +{time.perf_counter() - start:6.1f}s pending={queue['pending']:>6} oldest={queue['oldest_seconds']:.1f}s")
+        if not queue["pending"]:
+            break
+        time.sleep(1)
+    drained = time.perf_counter() - start
+
+    outbox = current["email_outbox"]
+    latency = outbox["latency_transactional"]
+    print(f"Queue drained {drained:.1f}s after the on-sale started")
+    print(f"SMTP sessions opened: {outbox['smtp_connections_opened'] - before['smtp_connections_opened']} "
+          f"(workers in the polled process: {outbox['workers']})")
+    print(f"Delivery latency p50={latency['p50']}s p95={latency['p95']}s max={latency['max']}s over {latency['count']} emails")
@@ -0,0 +1,101 @@
+"""
+Measure email outbox throughput against a local SMTP stand-in.
+
+Usage: python bench_email_outbox.py [messages] [workers]
+Needs `pip install aiosmtpd`. Starts an aiosmtpd server on 127.0.0.1:8025,
+queues `messages` recipients as one job (no tenant, so no rate limit) and
+runs `workers` outbox workers in this process until the job is done. For
+comparison, a sample is first sent the old way: fastapi-mail, one SMTP
+session per message.
+"""
+import asyncio
+import sys
+import time
+
+from aiosmtpd.controller import Controller
+from fastapi_mail import ConnectionConfig, FastMail, MessageSchema, MessageType
+
+from app import models
+from app.core.config import settings
+from app.db.async_session import AsyncSessionLocal
+from app.services.email_outbox import email_outbox
+
+SMTP_HOST = "127.0.0.1"
+SMTP_PORT = 8025
+SAMPLE = 200
+
+class CountingHandler:
+    def __init__(self):
+        self.messages = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages += 1
+        return "250 OK"
+
+def point_at_stand_in() -> None:
+    settings.MAIL_SERVER = SMTP_HOST
+    settings.MAIL_PORT = SMTP_PORT
+    settings.MAIL_TLS = False
+    settings.MAIL_SSL = False
+    settings.USE_CREDENTIALS = False
+    settings.OUTBOX_POLL_INTERVAL = 0.05
+
+async def bench_fastapi_mail() -> None:
+    mail = FastMail(ConnectionConfig(
+        MAIL_USERNAME="", MAIL_PASSWORD="", MAIL_FROM=settings.MAIL_FROM,
+        MAIL_PORT=SMTP_PORT, MAIL_SERVER=SMTP_HOST, MAIL_STARTTLS=False, MAIL_SSL_TLS=False,
+        USE_CREDENTIALS=False, VALIDATE_CERTS=False,
+    ))
+    start = time.perf_counter()
+    for i in range(SAMPLE):
+        await mail.send_message(MessageSchema(
+            subject="Bench", recipients=[f"sample-{i}@example.com"], body="<p>Hello</p>", subtype=MessageType.html
+        ))
+    elapsed = time.perf_counter() - start
+    print(f"fastapi-mail, new session each {SAMPLE:>7} msgs in {elapsed:6.2f}s = {SAMPLE / elapsed:7.0f} msgs/s")
+
+async def bench_outbox(messages: int) -> None:
+    async with AsyncSessionLocal() as db:
+        job = await email_outbox.enqueue(
+            db,
+            tenant_id=None,
+            subject="Bench",
+            body="<p>Hello</p>",
+            recipients=({"email": f"bench-{i}@example.com"} for i in range(messages)),
+        )
+        await db.commit()
+        job_id = job.id
+
+    start = time.perf_counter()
+    workers = asyncio.create_task(email_outbox.run_workers())
+    while True:
+        await asyncio.sleep(0.1)
+        async with AsyncSessionLocal() as db:
+            job = await db.get(models.EmailJob, job_id)
+            if job.status == models.EmailJobStatus.DONE:
+                break
+    elapsed = time.perf_counter() - start
+    opened = email_outbox.stats()["smtp_connections_opened"]
+    workers.cancel()
+    await asyncio.gather(workers, return_exceptions=True)
+    print(f"outbox x{settings.OUTBOX_WORKERS} workers          {messages:>7} msgs in {elapsed:6.2f}s = {messages / elapsed:7.0f} msgs/s")
+    print(f"SMTP sessions opened: {opened}, failed: {job.failed}")
+
+async def main(messages: int) -> None:
+    await bench_fastapi_mail()
+    await bench_outbox(messages)
+
+if __name__ == "__main__":
+    messages = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    if len(sys.argv) > 2:
+        settings.OUTBOX_WORKERS = int(sys.argv[2])
+
+    handler = CountingHandler()
+    controller = Controller(handler, hostname=SMTP_HOST, port=SMTP_PORT)
+    controller.start()
+    point_at_stand_in()
+    try:
+        asyncio.run(main(messages))
+    finally:
+        controller.stop()
+    print(f"Stand-in received {handler.messages} messages")
@@ -0,0 +1,62 @@
+"""
+Compare sending to a JSON recipient list with sending to a segment.
+
+Usage: python bench_email_segments.py [attendees]
+Needs the admin user from the API seed; no API or SMTP needed. Seeds an
+event with `attendees` registrations, then queues one email to all of them
+twice: from a recipients blob built the old way (loaded whole, then
+enqueued) and from an event_registrants segment streamed from a server-side
+cursor. Reports time and peak Python memory for each; both transactions are
+rolled back so nothing is sent.
+"""
+import asyncio
+import sys
+import time
+import tracemalloc
+
+from sqlalchemy import select
+
+from app import models, schemas
+from app.db.async_session import AsyncSessionLocal
+from app.services.email_outbox import email_outbox
+from app.services.email_segments import segment_resolver
+from bench_check_in import seed
+
+async def blob_recipients(db, event_id: int):
+    # What a client-filled EmailList.recipients held, and what send used to load
+    rows = (await db.execute(
+        select(models.User.email, models.User.full_name)
+        .join(models.EventRegistration, models.EventRegistration.user_id == models.User.id)
+        .where(models.EventRegistration.event_id == event_id)
+    )).all()
+    return [{"email": email, "name": name} for email, name in rows]
+
+async def enqueue(label: str, event_id: int, tenant_id: int, use_segment: bool) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        if use_segment:
+            segment = schemas.EmailSegment(source="event_registrants")
+            recipients = segment_resolver.stream(db, segment, tenant_id=tenant_id, event_id=event_id)
+        else:
+            recipients = await blob_recipients(db, event_id)
+        job = await email_outbox.enqueue(
+            db, tenant_id=tenant_id, subject="Bench {{name}}", body="<p>Hello</p>", recipients=recipients
+        )
+        total = job.total
+        await db.rollback()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<22} {total:>7} recipients in {elapsed:6.2f}s, peak {peak / 1024 / 1024:7.1f} MiB")
+
+async def main(attendees: int) -> None:
+    event_id, _ = seed(attendees)
+    async with AsyncSessionLocal() as db:
+        tenant_id = (await db.execute(select(models.Event.tenant_id).where(models.Event.id == event_id))).scalar_one()
+    await enqueue("JSON recipients", event_id, tenant_id, use_segment=False)
+    await enqueue("streamed segment", event_id, tenant_id, use_segment=True)
+
+if __name__ == "__main__":
+    attendees = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    asyncio.run(main(attendees))
@@ -0,0 +1,67 @@
+"""
+Measure per-recipient email rendering throughput.
+
+Usage: python bench_email_templates.py [recipients]
+No API or SMTP needed. Renders one personalized email per recipient three
+ways: re-parsing the template for every recipient with re.sub, filling the
+cached compiled template, and the outbox path (compiled template plus MIME
+encoding, in batches on a worker thread).
+"""
+import asyncio
+import html
+import re
+import sys
+import time
+from types import SimpleNamespace
+
+from app.core.config import settings
+from app.services.email_outbox import _build_messages
+from app.services.email_templates import FIELD_PATTERN, email_templates
+
+SUBJECT = "{{name}}, your invitation to the Annual Gala"
+BODY = """
+<html><body>
+<p>Dear {{name}},</p>
+<p>We would love to see you at the Annual Gala. Your invitation is linked to {{email}}.</p>
+""" + "<p>Programme, venue and travel details follow.</p>\n" * 40 + """
+<p>Kind regards,<br>UMEB Management Team</p>
+</body></html>
+"""
+
+def timed(label: str, count: int, fn) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {count:>7} emails in {elapsed:6.2f}s = {count / elapsed:9.0f} emails/s")
+
+def render_reparsing(contexts) -> None:
+    for context in contexts:
+        fill = lambda match: html.escape(str(context.get(match.group(1) or match.group(2), "")))
+        FIELD_PATTERN.sub(fill, SUBJECT)
+        FIELD_PATTERN.sub(fill, BODY)
+
+def render_compiled(contexts) -> None:
+    template = email_templates.lookup(None, "bench", 1) or email_templates.compile(None, "bench", 1, SUBJECT, BODY)
+    email_templates.render_batch(template, contexts)
+
+def render_outbox(recipients: int) -> None:
+    template = email_templates.compile(None, "bench", 1, SUBJECT, BODY)
+    rows = [
+        SimpleNamespace(job_id=1, template=None, subject=None, body=None, recipient=f"guest-{i}@example.com", context={"name": f"Guest {i}"})
+        for i in range(recipients)
+    ]
+    batch = settings.OUTBOX_BATCH_SIZE
+
+    async def run():
+        for i in range(0, len(rows), batch):
+            await asyncio.to_thread(_build_messages, rows[i:i + batch], {1: template})
+
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    recipients = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    contexts = [{"name": f"Guest {i}", "email": f"guest-{i}@example.com"} for i in range(recipients)]
+
+    timed("re.sub per recipient", recipients, lambda: render_reparsing(contexts))
+    timed("compiled, cached", recipients, lambda: render_compiled(contexts))
+    timed(f"outbox batches x{settings.OUTBOX_BATCH_SIZE} (+MIME)", recipients, lambda: render_outbox(recipients))
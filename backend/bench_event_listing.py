@@ -0,0 +1,77 @@
+"""
+Benchmark GET /events/ page sizes with and without strategy expansions.
+
+Usage: python bench_event_listing.py [--seed N]
+Run against a live API sharing this DATABASE_URL. --seed inserts N events
+(each with a goal, budget line and ESG metric) for the admin's tenant so
+pages of 100 and 1000 are full. Query counts come from the Server-Timing
+header added by the query-stats middleware.
+"""
+import datetime
+import statistics
+import sys
+import time
+
+import requests
+
+from app import models
+from app.db.session import SessionLocal
+
+API_URL = "http://127.0.0.1:8000/api/v1"
+EMAIL = "admin@example.com"
+PASSWORD = "admin123"
+
+def seed(n: int) -> None:
+    db = SessionLocal()
+    try:
+        admin = db.query(models.User).filter(models.User.email == EMAIL).first()
+        start = datetime.datetime.utcnow()
+        for i in range(n):
+            event = models.Event(
+                title=f"Bench Event {i}",
+                start_time=start,
+                end_time=start + datetime.timedelta(hours=2),
+                location="Bench Hall",
+                created_by_id=admin.id,
+                tenant_id=admin.tenant_id,
+            )
+            event.goals.append(models.EventGoal(metric_name="Attendance", target_value=100))
+            event.budget_items.append(models.EventBudget(category="Venue", planned_amount=1000))
+            event.esg_metrics.append(models.EventESG(metric="Carbon", value=1.5, unit="t"))
+            db.add(event)
+        db.commit()
+        print(f"Seeded {n} events")
+    finally:
+        db.close()
+
+def measure(session: requests.Session, limit: int, expand: str, runs: int = 10) -> None:
+    params = {"limit": limit}
+    if expand:
+        params["expand"] = expand
+    latencies = []
+    server_timing = ""
+    for _ in range(runs):
+        start = time.perf_counter()
+        resp = session.get(f"{API_URL}/events/", params=params)
+        latencies.append(time.perf_counter() - start)
+        resp.raise_for_status()
+        server_timing = resp.headers.get("Server-Timing", "")
+    print(f"limit={limit:<5} expand={expand or '-':<4} "
+          f"p50={statistics.median(latencies) * 1000:7.1f}ms "
+          f"bytes={len(resp.content):>9}  {server_timing}")
+
+if __name__ == "__main__":
+    if "--seed" in sys.argv:
+        seed(int(sys.argv[sys.argv.index("--seed") + 1]))
+
+    login_resp = requests.post(
+        f"{API_URL}/login/access-token",
+        data={"username": EMAIL, "password": PASSWORD}
+    )
+    login_resp.raise_for_status()
+    session = requests.Session()
+    session.headers["Authorization"] = f"Bearer {login_resp.json()['access_token']}"
+
+    for limit in (100, 1000):
+        measure(session, limit, "")
+        measure(session, limit, "all")
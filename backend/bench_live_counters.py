@@ -0,0 +1,79 @@
+"""
+Measure live counter fan-out to many open dashboards.
+
+Usage: python bench_live_counters.py [dashboards] [scans]
+Run against a live API sharing this DATABASE_URL. Seeds an event with
+`scans` confirmed registrations, opens `dashboards` SSE streams on
+/events/{id}/live, then checks attendees in one at a time and reports how
+long dashboards took to see the final count and how many frames each got
+(bursts are coalesced, so frames should be far fewer than scans).
+"""
+import json
+import sys
+import threading
+import time
+
+import requests
+
+from bench_check_in import API_URL, EMAIL, PASSWORD, seed
+
+def watch(url: str, headers: dict, target: int, seen: list, ready: threading.Event) -> None:
+    frames = 0
+    with requests.get(url, headers=headers, stream=True, timeout=120) as resp:
+        resp.raise_for_status()
+        for line in resp.iter_lines(decode_unicode=True):
+            if not line or not line.startswith("data:"):
+                continue
+            frames += 1
+            ready.set()
+            if json.loads(line[5:])["checked_in"] >= target:
+                seen.append((time.perf_counter(), frames))
+                return
+
+if __name__ == "__main__":
+    dashboards = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    scans = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    event_id, tickets = seed(scans)
+    print(f"Seeded event {event_id} with {scans} registrations")
+
+    login_resp = requests.post(
+        f"{API_URL}/login/access-token",
+        data={"username": EMAIL, "password": PASSWORD}
+    )
+    login_resp.raise_for_status()
+    headers = {"Authorization": f"Bearer {login_resp.json()['access_token']}"}
+
+    seen: list = []
+    readiness = [threading.Event() for _ in range(dashboards)]
+    threads = [
+        threading.Thread(
+            target=watch,
+            args=(f"{API_URL}/events/{event_id}/live", headers, scans, seen, ready),
+            daemon=True,
+        )
+        for ready in readiness
+    ]
+    for thread in threads:
+        thread.start()
+    for ready in readiness:
+        ready.wait(30)
+    print(f"{dashboards} dashboards connected")
+
+    session = requests.Session()
+    session.headers.update(headers)
+    start = time.perf_counter()
+    for _, qr_code in tickets:
+        session.post(f"{API_URL}/events/{event_id}/check-in", json={"qr_code": qr_code}).raise_for_status()
+    done = time.perf_counter()
+    for thread in threads:
+        thread.join(60)
+
+    print(f"{scans} check-ins in {done - start:.2f}s")
+    if len(seen) < dashboards:
+        print(f"Only {len(seen)}/{dashboards} dashboards saw the final count")
+        sys.exit(1)
+    lag = max(at for at, _ in seen) - done
+    frames = sum(count for _, count in seen) / len(seen)
+    print(f"Last dashboard caught up {lag * 1000:.0f}ms after the final scan")
+    print(f"Frames per dashboard: {frames:.1f} for {scans} scans")
@@ -0,0 +1,48 @@
+"""
+Benchmark bcrypt cost factors and the bounded password-hashing executor.
+
+Usage: python bench_password_hashing.py [rounds ...]
+Prints per-hash latency for each cost factor, then fires a burst of
+concurrent verifications through `password_hasher` to show queue wait,
+hash time and how many requests were rejected with 503.
+"""
+import asyncio
+import sys
+import time
+
+import bcrypt
+from app.core.security import PasswordHashingBusy, password_hasher, verify_password
+
+PASSWORD = "admin123"
+
+def time_rounds(rounds: int, samples: int = 5) -> float:
+    hashed = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(rounds=rounds))
+    start = time.perf_counter()
+    for _ in range(samples):
+        bcrypt.checkpw(PASSWORD.encode(), hashed)
+    return (time.perf_counter() - start) / samples
+
+async def burst(concurrency: int = 64) -> None:
+    hashed = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt()).decode()
+
+    async def _login():
+        try:
+            return await verify_password(PASSWORD, hashed)
+        except PasswordHashingBusy:
+            return None
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(_login() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    stats = password_hasher.stats()
+    print(f"\nBurst of {concurrency} logins in {elapsed:.2f}s")
+    print(f"  accepted: {sum(1 for r in results if r)}  rejected (503): {results.count(None)}")
+    print(f"  queue wait p50/p95: {stats['queue_wait']['p50']}s / {stats['queue_wait']['p95']}s")
+    print(f"  hash time  p50/p95: {stats['hash_time']['p50']}s / {stats['hash_time']['p95']}s")
+
+if __name__ == "__main__":
+    rounds_to_test = [int(r) for r in sys.argv[1:]] or [10, 11, 12, 13]
+    print("bcrypt cost factor vs. verify latency")
+    for rounds in rounds_to_test:
+        print(f"  rounds={rounds}: {time_rounds(rounds) * 1000:.1f} ms")
+    asyncio.run(burst())
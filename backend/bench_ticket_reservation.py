@@ -0,0 +1,111 @@
+"""
+Fire concurrent registrations at a single ticket type and check for overselling.
+
+Usage: python bench_ticket_reservation.py [buyers] [capacity] [concurrency]
+Run against a live API sharing this DATABASE_URL and SECRET_KEY. Seeds an
+event with one ticket type of `capacity` seats plus `buyers` throwaway users,
+mints their access tokens locally (so bcrypt is not part of the measurement),
+then registers everyone at once. Each buyer also retries once to exercise
+the duplicate-registration path.
+"""
+import asyncio
+import datetime
+import sys
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from app import models
+from app.core import security
+from app.db.session import SessionLocal
+
+API_URL = "http://127.0.0.1:8000/api/v1"
+EMAIL = "admin@example.com"
+
+def seed(buyers: int, capacity: int) -> tuple:
+    db = SessionLocal()
+    try:
+        admin = db.query(models.User).filter(models.User.email == EMAIL).first()
+        start = datetime.datetime.utcnow() + datetime.timedelta(days=30)
+        event = models.Event(
+            title="Flash Sale Bench",
+            start_time=start,
+            end_time=start + datetime.timedelta(hours=2),
+            location="Bench Hall",
+            created_by_id=admin.id,
+            tenant_id=admin.tenant_id,
+        )
+        db.add(event)
+        db.flush()
+        ticket = models.TicketType(
+            event_id=event.id, name="General Admission", price=0.0, quantity_available=capacity
+        )
+        db.add(ticket)
+
+        run = uuid.uuid4().hex[:8]
+        hashed = asyncio.run(security.get_password_hash(uuid.uuid4().hex))
+        users = [
+            models.User(
+                email=f"bench-{run}-{i}@example.com",
+                hashed_password=hashed,
+                full_name=f"Bench Buyer {i}",
+                tenant_id=admin.tenant_id,
+            )
+            for i in range(buyers)
+        ]
+        db.add_all(users)
+        db.commit()
+        tokens = [security.create_access_token(u.id) for u in users]
+        return event.id, ticket.id, tokens
+    finally:
+        db.close()
+
+def register(event_id: int, ticket_id: int, token: str) -> list:
+    headers = {"Authorization": f"Bearer {token}"}
+    outcomes = []
+    for _ in range(2):
+        resp = requests.post(
+            f"{API_URL}/events/{event_id}/register",
+            json={"event_id": event_id, "ticket_type_id": ticket_id},
+            headers=headers,
+        )
+        outcomes.append(resp.status_code if resp.status_code == 200 else resp.json().get("detail"))
+    return outcomes
+
+def verify(event_id: int, ticket_id: int, capacity: int) -> None:
+    db = SessionLocal()
+    try:
+        ticket = db.get(models.TicketType, ticket_id)
+        registered = db.query(models.EventRegistration).filter(
+            models.EventRegistration.event_id == event_id
+        ).count()
+        print(f"quantity_sold={ticket.quantity_sold} registrations={registered} capacity={capacity}")
+        if ticket.quantity_sold != registered or registered > capacity:
+            print("FAIL: inventory does not match registrations")
+            sys.exit(1)
+        print("OK: no overselling")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    buyers = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    capacity = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+
+    event_id, ticket_id, tokens = seed(buyers, capacity)
+    print(f"Seeded event {event_id} with {capacity} seats and {buyers} buyers")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda t: register(event_id, ticket_id, t), tokens))
+    elapsed = time.perf_counter() - start
+
+    outcomes = Counter(o for pair in results for o in pair)
+    total = sum(outcomes.values())
+    print(f"{total} requests in {elapsed:.2f}s ({total / elapsed:.0f} req/s)")
+    for outcome, count in outcomes.most_common():
+        print(f"  {outcome}: {count}")
+    verify(event_id, ticket_id, capacity)
@@ -0,0 +1,109 @@
+"""
+Load-test the waiting room: registration latency with and without admission control.
+
+Usage: python bench_waiting_room.py [buyers] [rate] [concurrency]
+Run against a live API sharing this DATABASE_URL and SECRET_KEY. Seeds two
+identical events, one with waiting_room_rate=`rate` admissions/second and
+one without, then sends `buyers` simultaneous buyers at each. Queued buyers
+join, sleep until their slot and then register. Only the register call is
+timed, so the queue's effect on the registration path is what gets compared.
+"""
+import asyncio
+import datetime
+import statistics
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from app import models
+from app.core import security
+from app.db.session import SessionLocal
+
+API_URL = "http://127.0.0.1:8000/api/v1"
+EMAIL = "admin@example.com"
+
+def seed(buyers: int, rate: float) -> tuple:
+    db = SessionLocal()
+    try:
+        admin = db.query(models.User).filter(models.User.email == EMAIL).first()
+        start = datetime.datetime.utcnow() + datetime.timedelta(days=30)
+        events = []
+        for label, waiting_room_rate in (("open", None), ("queued", rate)):
+            event = models.Event(
+                title=f"Gala Bench ({label})",
+                start_time=start,
+                end_time=start + datetime.timedelta(hours=4),
+                location="Bench Hall",
+                created_by_id=admin.id,
+                tenant_id=admin.tenant_id,
+                waiting_room_rate=waiting_room_rate,
+            )
+            db.add(event)
+            db.flush()
+            ticket = models.TicketType(
+                event_id=event.id, name="Gala Seat", price=0.0, quantity_available=buyers
+            )
+            db.add(ticket)
+            db.flush()
+            events.append((label, event.id, ticket.id))
+
+        run = uuid.uuid4().hex[:8]
+        hashed = asyncio.run(security.get_password_hash(uuid.uuid4().hex))
+        users = [
+            models.User(
+                email=f"gala-{run}-{i}@example.com",
+                hashed_password=hashed,
+                full_name=f"Gala Buyer {i}",
+                tenant_id=admin.tenant_id,
+            )
+            for i in range(buyers)
+        ]
+        db.add_all(users)
+        db.commit()
+        tokens = [security.create_access_token(u.id) for u in users]
+        return events, tokens
+    finally:
+        db.close()
+
+def buy(event_id: int, ticket_id: int, token: str, queued: bool) -> tuple:
+    session = requests.Session()
+    session.headers["Authorization"] = f"Bearer {token}"
+    if queued:
+        ticket = session.post(f"{API_URL}/events/{event_id}/queue").json()
+        session.headers["X-Queue-Token"] = ticket["queue_token"]
+        time.sleep(ticket["estimated_wait_seconds"])
+    while True:
+        start = time.perf_counter()
+        resp = session.post(
+            f"{API_URL}/events/{event_id}/register",
+            json={"event_id": event_id, "ticket_type_id": ticket_id},
+        )
+        elapsed = time.perf_counter() - start
+        if resp.status_code != 429:
+            return resp.status_code, elapsed
+        time.sleep(float(resp.headers.get("Retry-After", "1")))
+
+def report(label: str, results: list, wall: float) -> None:
+    latencies = sorted(elapsed for _, elapsed in results)
+    ok = sum(1 for code, _ in results if code == 200)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:<7} ok={ok}/{len(results)} wall={wall:.1f}s "
+          f"register p50={statistics.median(latencies) * 1000:.1f}ms "
+          f"p95={p95 * 1000:.1f}ms max={latencies[-1] * 1000:.1f}ms")
+
+if __name__ == "__main__":
+    buyers = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    rate = float(sys.argv[2]) if len(sys.argv) > 2 else 50.0
+    concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+
+    events, tokens = seed(buyers, rate)
+    for label, event_id, ticket_id in events:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(
+                lambda t: buy(event_id, ticket_id, t, queued=label == "queued"), tokens
+            ))
+        report(label, results, time.perf_counter() - start)
@@ -1,3 +1,4 @@
+import asyncio
 import sys
 import os
 
@@ -25,7 +26,7 @@ def create_admin():
         print(f"Creating user {email}")
         user = User(
             email=email,
-            hashed_password=get_password_hash(password),
+            hashed_password=asyncio.run(get_password_hash(password)),
             full_name="Admin User",
             is_superuser=True,
             role="admin",
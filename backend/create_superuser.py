@@ -1,3 +1,5 @@
+import asyncio
+
 from sqlalchemy.orm import Session
 from app.db.session import SessionLocal
 from app.models.user import User, UserRole, MembershipTier
@@ -13,7 +15,7 @@ def create_superuser() -> None:
 
         user = User(
             email="admin@example.com",
-            hashed_password=get_password_hash("admin123"),
+            hashed_password=asyncio.run(get_password_hash("admin123")),
             full_name="Admin User",
             is_active=True,
             role=UserRole.ADMIN,
@@ -1,18 +1,115 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+import math
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.v1.api import api_router
 from app.core.config import settings
+from app.core.idempotency import IDEMPOTENCY_KEY_HEADER, REPLAYED_HEADER, idempotency_store
+from app.core.security import token_subject
+from app.db import query_stats
+from app.db.async_session import async_engine
+from app.db.replica import STICKY_COOKIE, async_replica_engine, replica_engine, replica_router
+from app.db.session import engine
+from app.services.email_outbox import email_outbox
+from app.services.live_counters import live_counters
+from app.services.ticket_holds import ticket_holds
+
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Long-lived workers only; serverless invocations sweep holds on demand
+    background = []
+    if settings.TICKET_HOLD_SWEEPER_ENABLED and settings.DB_ENGINE_MODE != "serverless":
+        background.append(asyncio.create_task(ticket_holds.run_sweeper()))
+    if settings.DB_ENGINE_MODE != "serverless":
+        background.append(asyncio.create_task(idempotency_store.run_purger()))
+        background.append(asyncio.create_task(email_outbox.run_workers()))
+    if settings.LIVE_COUNTERS_PG_BRIDGE and settings.DB_ENGINE_MODE != "serverless":
+        background.append(asyncio.create_task(live_counters.run_bridge()))
+    yield
+    for task in background:
+        task.cancel()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     description="API for UMEB Nonprofit Management Platform",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
-# Set all CORS enabled origins
-print(f"DEBUG: ALLOWED ORIGINS: {settings.BACKEND_CORS_ORIGINS}")
+def _endpoint_label(request: Request) -> str:
+    """Method plus the matched route template, e.g. 'GET /api/v1/events/{event_id}'."""
+    route = request.scope.get("route")
+    if route is None:
+        return "unmatched"
+    template = route.path_format
+    # Newer FastAPI keeps included routes relative to their router ('/{id}');
+    # the concrete path ends in the same number of segments, the rest is the prefix
+    prefix = request.url.path.rsplit("/", template.count("/"))[0]
+    return f"{request.method} {prefix}{template}"
+
+if settings.QUERY_STATS_ENABLED:
+    for _engine in (engine, async_engine, replica_engine, async_replica_engine):
+        if _engine is not None:
+            query_stats.instrument_engine(getattr(_engine, "sync_engine", _engine))
+
+    @app.middleware("http")
+    async def record_query_stats(request: Request, call_next):
+        """Count statements and DB time per request; report via Server-Timing."""
+        stats = query_stats.begin_request()
+        response = await call_next(request)
+        query_stats.query_stats_registry.observe(_endpoint_label(request), stats)
+        response.headers.append(
+            "Server-Timing", f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries"'
+        )
+        return response
+
+def _token_user_id(request: Request):
+    authorization = request.headers.get("authorization", "")
+    return token_subject(authorization[7:] if authorization.lower().startswith("bearer ") else None)
+
+@app.middleware("http")
+async def idempotent_writes(request: Request, call_next):
+    """Replay the stored response when a write is retried with the same Idempotency-Key."""
+    key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+    if key is None or not idempotency_store.applies_to(request):
+        return await call_next(request)
+    user_id = _token_user_id(request)
+    if user_id is None:
+        return await call_next(request)
+    return await idempotency_store.handle(request, user_id, key, call_next)
+
+@app.middleware("http")
+async def track_primary_writes(request: Request, call_next):
+    """Pin a user's reads to the primary briefly after a successful write."""
+    response = await call_next(request)
+    if (
+        replica_router.enabled
+        and request.method not in ("GET", "HEAD", "OPTIONS")
+        and response.status_code < 400
+    ):
+        user_id = _token_user_id(request)
+        if user_id is not None:
+            # Carried by the client so whichever worker serves the next read sees it
+            response.set_cookie(
+                STICKY_COOKIE,
+                replica_router.sticky_token(user_id),
+                max_age=math.ceil(settings.REPLICA_STICKY_SECONDS),
+                httponly=True,
+                samesite="lax",
+                secure=request.url.scheme == "https",
+            )
+    return response
+
+# Set all CORS enabled origins. Added last so it is the outermost middleware and
+# also covers responses produced by the middleware above (replays, 409s).
+logger.debug(f"Allowed CORS origins: {settings.BACKEND_CORS_ORIGINS}")
 if settings.BACKEND_CORS_ORIGINS:
     app.add_middleware(
         CORSMiddleware,
@@ -20,6 +117,7 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "X-Manifest-Cursor", "Server-Timing", REPLAYED_HEADER],
     )
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
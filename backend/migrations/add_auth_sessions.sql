@@ -0,0 +1,20 @@
+-- Migration: Add refresh-token session store
+-- Created: 2026-10-18
+
+CREATE TABLE IF NOT EXISTS authsession (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES "user"(id) ON DELETE CASCADE,
+    family_id VARCHAR NOT NULL,
+    refresh_token_hash VARCHAR NOT NULL,
+    user_agent VARCHAR,
+    created_at TIMESTAMP DEFAULT timezone('utc', now()),
+    last_used_at TIMESTAMP,
+    expires_at TIMESTAMP NOT NULL,
+    revoked_at TIMESTAMP,
+    replaced_by_id INTEGER REFERENCES authsession(id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_authsession_id ON authsession (id);
+CREATE INDEX IF NOT EXISTS ix_authsession_user_id ON authsession (user_id);
+CREATE INDEX IF NOT EXISTS ix_authsession_family_id ON authsession (family_id);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_authsession_refresh_token_hash ON authsession (refresh_token_hash);
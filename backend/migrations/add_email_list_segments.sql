@@ -0,0 +1,10 @@
+-- Migration: Query-driven email list segments
+-- Created: 2026-10-18
+-- A list may store a small filter (event registrants, members by tier,
+-- campaign donors) instead of a recipient array; it is resolved with a
+-- streaming query when the list is sent.
+
+ALTER TABLE emaillist ADD COLUMN IF NOT EXISTS segment JSON;
+
+-- Donor lookups by campaign for campaign_donors segments
+CREATE INDEX IF NOT EXISTS ix_donation_campaign_id ON donation (campaign_id);
@@ -0,0 +1,46 @@
+-- Migration: Durable email outbox
+-- Created: 2026-10-18
+-- One outboxmessage row per recipient; workers claim due rows with
+-- FOR UPDATE SKIP LOCKED. Tenants get an optional send rate.
+
+ALTER TYPE emailliststatus ADD VALUE IF NOT EXISTS 'SENDING';
+
+ALTER TABLE tenant ADD COLUMN IF NOT EXISTS email_rate_limit DOUBLE PRECISION;
+ALTER TABLE tenant ADD COLUMN IF NOT EXISTS email_next_send_at DOUBLE PRECISION;
+
+CREATE TABLE IF NOT EXISTS emailjob (
+    id SERIAL PRIMARY KEY,
+    tenant_id INTEGER REFERENCES tenant(id),
+    email_list_id INTEGER REFERENCES emaillist(id) ON DELETE SET NULL,
+    subject VARCHAR NOT NULL,
+    body TEXT NOT NULL,
+    status VARCHAR DEFAULT 'QUEUED' NOT NULL,
+    total INTEGER DEFAULT 0 NOT NULL,
+    sent INTEGER DEFAULT 0 NOT NULL,
+    failed INTEGER DEFAULT 0 NOT NULL,
+    created_at TIMESTAMP DEFAULT timezone('utc', now()),
+    finished_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_emailjob_id ON emailjob (id);
+CREATE INDEX IF NOT EXISTS ix_emailjob_email_list_id ON emailjob (email_list_id);
+
+CREATE TABLE IF NOT EXISTS outboxmessage (
+    id SERIAL PRIMARY KEY,
+    job_id INTEGER REFERENCES emailjob(id) ON DELETE CASCADE,
+    tenant_id INTEGER REFERENCES tenant(id),
+    recipient VARCHAR NOT NULL,
+    context JSON,
+    subject VARCHAR,
+    body TEXT,
+    status VARCHAR DEFAULT 'PENDING' NOT NULL,
+    attempts INTEGER DEFAULT 0 NOT NULL,
+    next_attempt_at TIMESTAMP DEFAULT timezone('utc', now()) NOT NULL,
+    last_error VARCHAR,
+    created_at TIMESTAMP DEFAULT timezone('utc', now()),
+    sent_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_outboxmessage_id ON outboxmessage (id);
+CREATE INDEX IF NOT EXISTS ix_outboxmessage_job_id ON outboxmessage (job_id);
+CREATE INDEX IF NOT EXISTS ix_outboxmessage_due ON outboxmessage (status, next_attempt_at);
@@ -0,0 +1,7 @@
+-- Migration: Per-event waiting room for on-sale spikes
+-- Created: 2026-10-18
+-- waiting_room_rate is admissions per second (NULL = no queue);
+-- waiting_room_next_admit is the epoch second of the next free slot.
+
+ALTER TABLE event ADD COLUMN IF NOT EXISTS waiting_room_rate DOUBLE PRECISION;
+ALTER TABLE event ADD COLUMN IF NOT EXISTS waiting_room_next_admit DOUBLE PRECISION;
@@ -0,0 +1,16 @@
+-- Migration: Idempotency-Key response store
+-- Created: 2026-10-18
+-- status_code stays NULL while the first request is in flight.
+
+CREATE TABLE IF NOT EXISTS idempotencykey (
+    key_hash VARCHAR(64) PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES "user"(id) ON DELETE CASCADE,
+    request_hash VARCHAR(64) NOT NULL,
+    status_code INTEGER,
+    content_type VARCHAR,
+    response_body BYTEA,
+    created_at TIMESTAMP DEFAULT timezone('utc', now()),
+    expires_at TIMESTAMP NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_idempotencykey_expires_at ON idempotencykey (expires_at);
@@ -0,0 +1,6 @@
+-- Migration: Replay response headers for Idempotency-Key retries
+-- Created: 2026-10-18
+-- Headers such as Location are stored with the body so a replay matches
+-- the original response.
+
+ALTER TABLE idempotencykey ADD COLUMN IF NOT EXISTS response_headers JSON;
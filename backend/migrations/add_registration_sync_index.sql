@@ -0,0 +1,6 @@
+-- Migration: Index for offline scanner delta sync
+-- Created: 2026-10-18
+-- GET /events/{id}/check-in/manifest?since= reads registrations by (event_id, updated_at).
+
+CREATE INDEX IF NOT EXISTS ix_eventregistration_event_updated
+    ON eventregistration (event_id, updated_at);
@@ -0,0 +1,9 @@
+-- Migration: One registration per user per event
+-- Created: 2026-10-18
+-- register_for_event relies on this constraint instead of a read-then-insert
+-- duplicate check. Remove any existing duplicates before applying:
+--   SELECT event_id, user_id, count(*) FROM eventregistration
+--   GROUP BY event_id, user_id HAVING count(*) > 1;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_eventregistration_event_user
+    ON eventregistration (event_id, user_id);
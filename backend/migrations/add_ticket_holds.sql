@@ -0,0 +1,21 @@
+-- Migration: Timed ticket holds (cart reservations)
+-- Created: 2026-10-18
+-- tickettype.quantity_held mirrors the sum of outstanding tickethold.quantity
+-- so availability stays a single-row check.
+
+ALTER TABLE tickettype ADD COLUMN IF NOT EXISTS quantity_held INTEGER DEFAULT 0 NOT NULL;
+
+CREATE TABLE IF NOT EXISTS tickethold (
+    id SERIAL PRIMARY KEY,
+    ticket_type_id INTEGER NOT NULL REFERENCES tickettype(id) ON DELETE CASCADE,
+    event_id INTEGER NOT NULL REFERENCES event(id),
+    user_id INTEGER NOT NULL REFERENCES "user"(id) ON DELETE CASCADE,
+    quantity INTEGER DEFAULT 1 NOT NULL,
+    expires_at TIMESTAMP NOT NULL,
+    created_at TIMESTAMP DEFAULT timezone('utc', now())
+);
+
+CREATE INDEX IF NOT EXISTS ix_tickethold_id ON tickethold (id);
+CREATE INDEX IF NOT EXISTS ix_tickethold_ticket_type_id ON tickethold (ticket_type_id);
+CREATE INDEX IF NOT EXISTS ix_tickethold_user_id ON tickethold (user_id);
+CREATE INDEX IF NOT EXISTS ix_tickethold_expires_at ON tickethold (expires_at);
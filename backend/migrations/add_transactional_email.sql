@@ -0,0 +1,11 @@
+-- Migration: Transactional email through the outbox
+-- Created: 2026-10-18
+-- Registration confirmations and waitlist offers become outbox rows that
+-- name a built-in template, written in the registration's transaction.
+-- They are claimed ahead of bulk sends (priority 0 before 1).
+
+ALTER TABLE outboxmessage ADD COLUMN IF NOT EXISTS template VARCHAR;
+ALTER TABLE outboxmessage ADD COLUMN IF NOT EXISTS priority SMALLINT NOT NULL DEFAULT 1;
+
+DROP INDEX IF EXISTS ix_outboxmessage_due;
+CREATE INDEX ix_outboxmessage_due ON outboxmessage (status, priority, next_attempt_at);
@@ -0,0 +1,18 @@
+-- Migration: Single-use waiting room admissions
+-- Created: 2026-10-18
+-- One pass per (event, user); a queue token is honoured once, by its jti.
+
+CREATE TABLE IF NOT EXISTS waitingroompass (
+    id SERIAL PRIMARY KEY,
+    event_id INTEGER NOT NULL REFERENCES event(id) ON DELETE CASCADE,
+    user_id INTEGER NOT NULL REFERENCES "user"(id) ON DELETE CASCADE,
+    jti VARCHAR NOT NULL UNIQUE,
+    admit_at DOUBLE PRECISION NOT NULL,
+    rate DOUBLE PRECISION NOT NULL,
+    expires_at DOUBLE PRECISION NOT NULL,
+    used_at TIMESTAMP,
+    CONSTRAINT uq_waitingroompass_event_user UNIQUE (event_id, user_id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_waitingroompass_id ON waitingroompass (id);
+CREATE INDEX IF NOT EXISTS ix_waitingroompass_user_id ON waitingroompass (user_id);
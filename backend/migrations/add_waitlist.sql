@@ -0,0 +1,16 @@
+-- Migration: FIFO waitlist per ticket type
+-- Created: 2026-10-18
+-- Promotion takes the oldest entries via (ticket_type_id, id).
+
+CREATE TABLE IF NOT EXISTS waitlistentry (
+    id SERIAL PRIMARY KEY,
+    ticket_type_id INTEGER NOT NULL REFERENCES tickettype(id) ON DELETE CASCADE,
+    event_id INTEGER NOT NULL REFERENCES event(id),
+    user_id INTEGER NOT NULL REFERENCES "user"(id) ON DELETE CASCADE,
+    created_at TIMESTAMP DEFAULT timezone('utc', now()),
+    CONSTRAINT uq_waitlistentry_ticket_type_user UNIQUE (ticket_type_id, user_id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_waitlistentry_id ON waitlistentry (id);
+CREATE INDEX IF NOT EXISTS ix_waitlistentry_user_id ON waitlistentry (user_id);
+CREATE INDEX IF NOT EXISTS ix_waitlistentry_ticket_type_fifo ON waitlistentry (ticket_type_id, id);
@@ -0,0 +1,108 @@
+"""
+Shared fixtures. Tests run the real app against a throwaway SQLite file;
+tables are recreated for every test and per-process caches are cleared.
+"""
+import asyncio
+import datetime
+import os
+import sys
+import tempfile
+
+_DB_DIR = tempfile.mkdtemp(prefix="umeb-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/test.db"
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("OUTBOX_WORKERS", "0") # Tests drive the outbox directly
+os.environ.setdefault("TICKET_HOLD_SWEEPER_ENABLED", "false")
+os.environ.setdefault("LIVE_COUNTERS_PG_BRIDGE", "false")
+os.environ.setdefault("BACKEND_CORS_ORIGINS", "http://app.example.org")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from app import models
+from app.core.principal_cache import principal_cache
+from app.core.security import get_password_hash
+from app.db.base_class import Base
+from app.db.session import SessionLocal, engine
+
+PASSWORD = "secret-pw"
+_HASHED = asyncio.run(get_password_hash(PASSWORD))
+
+@pytest.fixture(autouse=True)
+def database():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    principal_cache.clear()
+    yield
+
+@pytest.fixture
+def client():
+    with TestClient(main.app) as client:
+        yield client
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    yield session
+    session.close()
+
+@pytest.fixture
+def tenant(db):
+    tenant = models.Tenant(name="Test Org", slug="test-org", plan_tier="business")
+    db.add(tenant)
+    db.commit()
+    return tenant
+
+@pytest.fixture
+def make_user(db, tenant):
+    def make_user(email: str, role=models.UserRole.MEMBER, tenant_id=None, **fields) -> models.User:
+        user = models.User(
+            email=email,
+            hashed_password=_HASHED,
+            full_name=email.split("@")[0].title(),
+            role=role,
+            tenant_id=tenant_id or tenant.id,
+            **fields,
+        )
+        db.add(user)
+        db.commit()
+        return user
+    return make_user
+
+@pytest.fixture
+def admin(make_user):
+    return make_user("admin@example.org", role=models.UserRole.ADMIN)
+
+@pytest.fixture
+def login(client):
+    def login(email: str) -> dict:
+        resp = client.post("/api/v1/login/access-token", data={"username": email, "password": PASSWORD})
+        assert resp.status_code == 200, resp.text
+        return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+    return login
+
+@pytest.fixture
+def event(db, tenant, admin):
+    start = datetime.datetime.utcnow() + datetime.timedelta(days=30)
+    event = models.Event(
+        title="Annual Gala",
+        start_time=start,
+        end_time=start + datetime.timedelta(hours=3),
+        location="Main Hall",
+        created_by_id=admin.id,
+        tenant_id=tenant.id,
+    )
+    db.add(event)
+    db.commit()
+    return event
+
+@pytest.fixture
+def make_ticket_type(db, event):
+    def make_ticket_type(name: str = "General", quantity: int = 10, price: float = 0.0) -> models.TicketType:
+        ticket_type = models.TicketType(event_id=event.id, name=name, price=price, quantity_available=quantity)
+        db.add(ticket_type)
+        db.commit()
+        return ticket_type
+    return make_ticket_type
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+
+import pytest
+
+from app import models
+from app.core.principal_cache import principal_cache
+from app.core.security import PasswordHasher, PasswordHashingBusy
+from app.services.session_store import session_store
+
+from conftest import PASSWORD
+
+def test_plan_gate_rejects_deactivated_user(client, login, admin, make_user):
+    member = make_user("member@example.org")
+    headers = login(member.email)
+    assert client.get("/api/v1/elections/", headers=headers).status_code == 200
+
+    resp = client.put(f"/api/v1/users/{member.id}", json={"is_active": False}, headers=login(admin.email))
+    assert resp.status_code == 200, resp.text
+    assert client.get("/api/v1/elections/", headers=headers).status_code == 400
+
+def test_plan_gate_rechecks_plan_on_a_cold_worker(client, db, tenant, login, make_user):
+    member = make_user("member@example.org")
+    headers = login(member.email)
+    assert client.get("/api/v1/elections/", headers=headers).status_code == 200
+
+    # Downgraded by another worker: this process never saw the change
+    tenant.plan_tier = models.PlanTier.STARTER
+    db.commit()
+    principal_cache.clear()
+
+    resp = client.get("/api/v1/elections/", headers=headers)
+    assert resp.status_code == 403
+    assert "Professional" in resp.json()["detail"]
+
+def _login_tokens(client, email):
+    resp = client.post("/api/v1/login/access-token", data={"username": email, "password": PASSWORD})
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+def _refresh(client, refresh_token):
+    return client.post("/api/v1/login/refresh-token", json={"refresh_token": refresh_token})
+
+def test_refresh_rotates_and_reuse_revokes_family(client, make_user):
+    member = make_user("member@example.org")
+    first = _login_tokens(client, member.email)["refresh_token"]
+
+    resp = _refresh(client, first)
+    assert resp.status_code == 200, resp.text
+    second = resp.json()["refresh_token"]
+    assert second != first
+
+    # Replaying the rotated token looks like theft: the live token dies with it
+    assert _refresh(client, first).status_code == 401
+    assert _refresh(client, second).status_code == 401
+
+def test_logged_out_token_is_rejected_without_reuse_alarm(client, make_user):
+    member = make_user("member@example.org")
+    kept = _login_tokens(client, member.email)["refresh_token"]
+    dropped = _login_tokens(client, member.email)["refresh_token"]
+
+    assert client.post("/api/v1/logout", json={"refresh_token": dropped}).status_code == 204
+    assert _refresh(client, dropped).status_code == 401
+    assert _refresh(client, kept).status_code == 200
+
+def test_concurrent_rotation_has_one_winner(client, db, make_user):
+    member = make_user("member@example.org")
+    token = _login_tokens(client, member.email)["refresh_token"]
+
+    # Read before the other request rotates, as a concurrent refresh would
+    stale = session_store.lookup(db, token)
+    winner = _refresh(client, token)
+    assert winner.status_code == 200, winner.text
+
+    assert session_store.rotate(db, stale) is None
+    db.expire_all()
+    assert all(s.revoked_at is not None for s in db.query(models.AuthSession).all())
+    assert _refresh(client, winner.json()["refresh_token"]).status_code == 401
+
+def test_signup_and_password_change_hash_off_the_request_thread(client, login, admin, make_user):
+    resp = client.post("/api/v1/users/", json={"email": "new@example.org", "password": "first-pw"})
+    assert resp.status_code == 200, resp.text
+    refresh_token = client.post(
+        "/api/v1/login/access-token", data={"username": "new@example.org", "password": "first-pw"}
+    ).json()["refresh_token"]
+
+    resp = client.put(f"/api/v1/users/{resp.json()['id']}", json={"password": "second-pw"}, headers=login(admin.email))
+    assert resp.status_code == 200, resp.text
+    assert _refresh(client, refresh_token).status_code == 401
+    assert client.post("/api/v1/login/access-token", data={"username": "new@example.org", "password": "first-pw"}).status_code == 400
+    assert client.post("/api/v1/login/access-token", data={"username": "new@example.org", "password": "second-pw"}).status_code == 200
+
+def test_password_hasher_sheds_load_beyond_its_queue():
+    hasher = PasswordHasher(workers=1, queue_size=1)
+    release = threading.Event()
+
+    async def burst():
+        jobs = [asyncio.ensure_future(hasher.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0) # Let both take a slot
+        with pytest.raises(PasswordHashingBusy):
+            await hasher.run(release.wait)
+        release.set()
+        return await asyncio.gather(*jobs)
+
+    assert asyncio.run(burst()) == [True, True]
+    assert hasher.rejected == 1
+    assert asyncio.run(hasher.run(lambda: "free again")) == "free again"
@@ -0,0 +1,138 @@
+import datetime
+import json
+
+import pytest
+
+from app import models
+from app.core.config import settings
+from app.core.ticket_signing import ticket_signer
+from app.models.ticketing import RegistrationStatus
+from app.services.check_in import manifest_hash
+
+@pytest.fixture
+def register(db, make_user):
+    def register(event, ticket_type, email, status=RegistrationStatus.CONFIRMED, qr_code=None):
+        registration = models.EventRegistration(
+            event_id=event.id,
+            user_id=make_user(email).id,
+            ticket_type_id=ticket_type.id,
+            status=status,
+            payment_status="UNPAID",
+            check_in_status=False,
+        )
+        db.add(registration)
+        db.flush()
+        registration.qr_code_data = qr_code or ticket_signer.sign(registration.id, event.id, ticket_type.id)
+        db.commit()
+        return registration
+    return register
+
+def _bulk(client, event, headers, codes):
+    resp = client.post(
+        f"/api/v1/events/{event.id}/check-in/bulk",
+        json={"scans": [{"qr_code": code} for code in codes]},
+        headers=headers,
+    )
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+def test_bulk_check_in_reports_each_scan(client, db, login, admin, tenant, event, make_ticket_type, register):
+    ticket_type = make_ticket_type(quantity=10)
+    other_event = models.Event(
+        title="Other", start_time=event.start_time, end_time=event.end_time,
+        location="Elsewhere", created_by_id=admin.id, tenant_id=tenant.id,
+    )
+    db.add(other_event)
+    db.commit()
+    other_type = models.TicketType(event_id=other_event.id, name="General", price=0.0, quantity_available=5)
+    db.add(other_type)
+    db.commit()
+
+    first = register(event, ticket_type, "first@example.org")
+    legacy = register(event, ticket_type, "legacy@example.org", qr_code="LEGACY-0001")
+    cancelled = register(event, ticket_type, "gone@example.org", status=RegistrationStatus.CANCELLED)
+    elsewhere = register(other_event, other_type, "elsewhere@example.org")
+    forged = first.qr_code_data[:-4] + "AAAA"
+
+    headers = login(admin.email)
+    codes = [
+        first.qr_code_data, legacy.qr_code_data, first.qr_code_data,
+        cancelled.qr_code_data, elsewhere.qr_code_data, forged, "NO-SUCH-CODE",
+    ]
+    body = _bulk(client, event, headers, codes)
+    assert [result["status"] for result in body["results"]] == [
+        "checked_in", "checked_in", "already_checked_in",
+        "cancelled", "wrong_event", "invalid", "unknown",
+    ]
+    assert [result["qr_code"] for result in body["results"]] == codes
+    assert (body["checked_in"], body["rejected"]) == (2, 5)
+
+    db.refresh(first)
+    assert first.check_in_status and first.check_in_time is not None
+    db.refresh(cancelled)
+    assert not cancelled.check_in_status
+
+    again = _bulk(client, event, headers, [legacy.qr_code_data])
+    assert again["results"][0]["status"] == "already_checked_in"
+    assert again["results"][0]["registration_id"] == legacy.id
+
+def _sync(client, event, headers, scans):
+    resp = client.post(
+        f"/api/v1/events/{event.id}/check-in/sync",
+        json={"scans": [
+            {"registration_id": registration_id, "scanned_at": scanned_at.isoformat()}
+            for registration_id, scanned_at in scans
+        ]},
+        headers=headers,
+    )
+    assert resp.status_code == 200, resp.text
+    return [(result["status"], result["check_in_time"]) for result in resp.json()["results"]]
+
+def test_offline_sync_keeps_the_earliest_scan(client, db, login, admin, event, make_ticket_type, register):
+    ticket_type = make_ticket_type(quantity=10)
+    attendee = register(event, ticket_type, "attendee@example.org")
+    cancelled = register(event, ticket_type, "gone@example.org", status=RegistrationStatus.CANCELLED)
+    headers = login(admin.email)
+    doors_open = datetime.datetime.utcnow().replace(microsecond=0) - datetime.timedelta(hours=1)
+    early, late = doors_open + datetime.timedelta(minutes=5), doors_open + datetime.timedelta(minutes=20)
+
+    assert _sync(client, event, headers, [(attendee.id, late)]) == [("checked_in", late.isoformat())]
+    # A second device scanned the same ticket earlier while offline
+    assert _sync(client, event, headers, [(attendee.id, early), (attendee.id, early)]) == [
+        ("checked_in", early.isoformat()), ("already_checked_in", early.isoformat()),
+    ]
+    assert _sync(client, event, headers, [(attendee.id, late)]) == [("already_checked_in", early.isoformat())]
+
+    results = _sync(client, event, headers, [(cancelled.id, early), (999999, early)])
+    assert [status for status, _ in results] == ["cancelled", "unknown"]
+    db.refresh(cancelled)
+    assert not cancelled.check_in_status
+
+    # Scanner clocks running ahead are clamped to the server's time
+    other = register(event, ticket_type, "skewed@example.org")
+    _sync(client, event, headers, [(other.id, datetime.datetime.utcnow() + datetime.timedelta(days=1))])
+    db.refresh(other)
+    assert other.check_in_time <= datetime.datetime.utcnow()
+
+def test_manifest_lists_hashes_and_deltas(client, login, admin, event, make_ticket_type, register, monkeypatch):
+    monkeypatch.setattr(settings, "CHECK_IN_MANIFEST_OVERLAP_SECONDS", 0)
+    ticket_type = make_ticket_type(quantity=10)
+    first = register(event, ticket_type, "first@example.org")
+    second = register(event, ticket_type, "second@example.org")
+    headers = login(admin.email)
+    url = f"/api/v1/events/{event.id}/check-in/manifest"
+
+    resp = client.get(url, headers=headers)
+    assert resp.headers["content-encoding"] == "gzip"
+    header, *rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert header["event_id"] == event.id
+    assert {row["id"]: row["h"] for row in rows} == {
+        first.id: manifest_hash(first.qr_code_data),
+        second.id: manifest_hash(second.qr_code_data),
+    }
+    assert first.qr_code_data not in resp.text
+
+    _sync(client, event, headers, [(second.id, datetime.datetime.utcnow())])
+    delta = client.get(url, params={"since": resp.headers["X-Manifest-Cursor"]}, headers=headers)
+    _, *rows = [json.loads(line) for line in delta.text.splitlines()]
+    assert [(row["id"], row["c"] is not None) for row in rows] == [(second.id, True)]
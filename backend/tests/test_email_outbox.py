@@ -0,0 +1,126 @@
+import asyncio
+
+import aiosmtplib
+import pytest
+from fastapi import BackgroundTasks, HTTPException
+
+from app import models
+from app.api.v1.endpoints import events
+from app.core.config import settings
+from app.db.async_session import AsyncSessionLocal
+from app.models.email_list import EmailListStatus
+from app.services.email_outbox import email_outbox
+
+RECIPIENTS = ["ann@example.org", "bob@example.org", "cy@example.org"]
+
+class FakeSmtp:
+    def __init__(self, failures=None):
+        self.failures = failures or {}
+        self.sent = []
+
+    async def send(self, message):
+        error = self.failures.get(message["To"])
+        if error is not None:
+            raise error
+        self.sent.append((message["To"], message["Subject"]))
+
+@pytest.fixture
+def email_list(client, login, admin, event):
+    resp = client.post(
+        f"/api/v1/events/{event.id}/email-lists",
+        json={
+            "name": "Guests",
+            "subject": "Hello {{name}}",
+            "body": "<p>See you at the gala</p>",
+            "recipients": [{"email": email, "name": email.split("@")[0]} for email in RECIPIENTS],
+        },
+        headers=login(admin.email),
+    )
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+def _send(client, login, admin, event, email_list):
+    return client.post(f"/api/v1/events/{event.id}/email-lists/{email_list['id']}/send", headers=login(admin.email))
+
+def _messages(db):
+    db.expire_all()
+    return {m.recipient: m for m in db.query(models.OutboxMessage).all()}
+
+def test_send_queues_each_recipient_once(client, db, login, admin, event, email_list):
+    resp = _send(client, login, admin, event, email_list)
+    assert resp.status_code == 202, resp.text
+    assert resp.json()["total"] == 3
+
+    again = _send(client, login, admin, event, email_list)
+    assert again.status_code == 400
+    assert "being sent" in again.json()["detail"]
+    assert sorted(_messages(db)) == RECIPIENTS
+
+def test_concurrent_send_is_claimed_once(client, db, login, admin, event, email_list):
+    async def send_with_stale_read():
+        async with AsyncSessionLocal() as session:
+            # Held from before the other request claims the list, like a concurrent send
+            _stale = await session.get(models.EmailList, email_list["id"])
+            assert _send(client, login, admin, event, email_list).status_code == 202
+            with pytest.raises(HTTPException) as exc:
+                await events.send_email_list(
+                    db=session, id=event.id, list_id=email_list["id"], background_tasks=BackgroundTasks(), current_user=admin
+                )
+            assert exc.value.status_code == 400
+
+    asyncio.run(send_with_stale_read())
+    assert len(_messages(db)) == 3
+
+def test_batch_sends_renders_and_finishes_the_job(client, db, login, admin, event, email_list):
+    job_id = _send(client, login, admin, event, email_list).json()["id"]
+    smtp = FakeSmtp()
+
+    assert asyncio.run(email_outbox.process_batch(smtp)) is True
+    assert sorted(smtp.sent) == [(email, f"Hello {email.split('@')[0]}") for email in RECIPIENTS]
+    assert {m.status for m in _messages(db).values()} == {models.OutboxStatus.SENT.value}
+
+    job = db.get(models.EmailJob, job_id)
+    assert (job.status, job.sent, job.failed) == (models.EmailJobStatus.DONE.value, 3, 0)
+    assert db.get(models.EmailList, email_list["id"]).status == EmailListStatus.SENT
+    assert asyncio.run(email_outbox.process_batch(smtp)) is False
+
+def test_failures_are_retried_with_backoff_or_failed_for_good(client, db, login, admin, event, email_list):
+    job_id = _send(client, login, admin, event, email_list).json()["id"]
+    smtp = FakeSmtp({
+        "bob@example.org": aiosmtplib.SMTPServerDisconnected("connection lost"),
+        "cy@example.org": aiosmtplib.SMTPResponseException(550, "no such mailbox"),
+    })
+    asyncio.run(email_outbox.process_batch(smtp))
+
+    messages = _messages(db)
+    assert messages["ann@example.org"].status == models.OutboxStatus.SENT.value
+    retry = messages["bob@example.org"]
+    assert (retry.status, retry.attempts) == (models.OutboxStatus.PENDING.value, 1)
+    assert "connection lost" in retry.last_error
+    delay = (retry.next_attempt_at - retry.created_at).total_seconds()
+    assert settings.OUTBOX_RETRY_BASE_SECONDS <= delay < settings.OUTBOX_RETRY_BASE_SECONDS + 5
+    assert messages["cy@example.org"].status == models.OutboxStatus.FAILED.value
+
+    job = db.get(models.EmailJob, job_id)
+    assert (job.status, job.sent, job.failed) == (models.EmailJobStatus.QUEUED.value, 1, 1)
+    # Not due again until the backoff elapses
+    assert asyncio.run(email_outbox.process_batch(smtp)) is False
+
+def test_concurrent_claims_never_share_a_row(client, db, login, admin, tenant, event, email_list, monkeypatch):
+    monkeypatch.setattr(settings, "OUTBOX_BATCH_SIZE", 2)
+    tenant.email_rate_limit = 1000.0
+    db.commit()
+    _send(client, login, admin, event, email_list)
+
+    async def claim_in_pairs():
+        claimed = []
+        for _ in range(10):
+            batches = await asyncio.gather(email_outbox._claim(), email_outbox._claim())
+            claimed += [row.id for batch in batches if batch for row in batch]
+            await asyncio.sleep(0.01) # Let the tenant's bucket refill
+        return claimed
+
+    claimed = asyncio.run(claim_in_pairs())
+    assert len(claimed) == len(set(claimed)) == 3
+    # Claimed rows are leased: nothing is due until OUTBOX_LEASE_SECONDS pass
+    assert asyncio.run(email_outbox._claim()) is None
@@ -0,0 +1,51 @@
+import pytest
+
+from app import models
+
+def _send_segment(client, headers, event, segment):
+    email_list = client.post(
+        f"/api/v1/events/{event.id}/email-lists",
+        json={"name": "Segment", "subject": "Hi {{name}}", "body": "<p>Thanks</p>", "segment": segment},
+        headers=headers,
+    )
+    assert email_list.status_code == 200, email_list.text
+    resp = client.post(f"/api/v1/events/{event.id}/email-lists/{email_list.json()['id']}/send", headers=headers)
+    assert resp.status_code == 202, resp.text
+    return resp.json()
+
+def _recipients(db):
+    db.expire_all()
+    return sorted(m.recipient for m in db.query(models.OutboxMessage).all())
+
+@pytest.fixture
+def donate(client):
+    def donate(headers, campaign_id, email, amount=25.0, **fields):
+        donor = client.post("/api/v1/donors/", json={"first_name": "Dee", "last_name": "Donor", "email": email}).json()
+        resp = client.post(
+            "/api/v1/donors/donations",
+            json={"donor_id": donor["id"], "campaign_id": campaign_id, "amount": amount, **fields},
+            headers=headers,
+        )
+        assert resp.status_code == 200, resp.text
+    return donate
+
+def test_campaign_donors_segment_finds_recorded_donations(client, db, login, admin, event, donate):
+    headers = login(admin.email)
+    campaign = client.post("/api/v1/donors/campaigns", json={"title": "Roof", "target_amount": 1000}, headers=headers).json()
+    other = client.post("/api/v1/donors/campaigns", json={"title": "Other", "target_amount": 10}, headers=headers).json()
+    donate(headers, campaign["id"], "giver@example.org")
+    donate(headers, campaign["id"], "Giver@example.org", amount=10)
+    donate(headers, campaign["id"], "bounced@example.org", payment_status="failed")
+    donate(headers, other["id"], "elsewhere@example.org")
+
+    job = _send_segment(client, headers, event, {"source": "campaign_donors", "campaign_id": campaign["id"]})
+    assert job["total"] == 1
+    assert [r.lower() for r in _recipients(db)] == ["giver@example.org"]
+
+def test_members_segment_filters_by_tier(client, db, login, admin, make_user, event):
+    make_user("gold@example.org", membership_tier=models.MembershipTier.GOLD)
+    make_user("plain@example.org")
+    make_user("gone@example.org", membership_tier=models.MembershipTier.GOLD, is_active=False)
+
+    _send_segment(client, login(admin.email), event, {"source": "members", "membership_tiers": ["gold"]})
+    assert _recipients(db) == ["gold@example.org"]
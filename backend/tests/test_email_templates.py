@@ -0,0 +1,42 @@
+from app.core.config import settings
+from app.services.email_templates import CompiledTemplate, TemplateCache, _one_line
+
+def test_fields_are_escaped_unless_triple_braced():
+    cache = TemplateCache()
+    template = cache.compile(1, "welcome", 1, "Hi {{ name }}", "<p>{{name}}</p>{{{footer}}}{{missing}}")
+    subject, body = template.render({"name": "<Ann & Bo>", "footer": "<hr>"})
+    assert subject == "Hi <Ann & Bo>"
+    assert body == "<p>&lt;Ann &amp; Bo&gt;</p><hr>"
+
+def test_subject_cannot_inject_headers():
+    template = CompiledTemplate("Re: {{title}}", _one_line)
+    assert template.render({"title": "Gala\r\nBcc: everyone@example.org"}) == "Re: Gala Bcc: everyone@example.org"
+
+def test_compiled_once_per_version_and_bounded(monkeypatch):
+    monkeypatch.setattr(settings, "EMAIL_TEMPLATE_CACHE_SIZE", 2)
+    cache = TemplateCache()
+    assert cache.lookup(1, "welcome", 1) is None
+    first = cache.compile(1, "welcome", 1, "Hi", "{{name}}")
+    assert cache.lookup(1, "welcome", 1) is first
+    # Another tenant or an edited template (new version) is a different entry
+    assert cache.lookup(2, "welcome", 1) is None
+    assert cache.lookup(1, "welcome", 2) is None
+
+    cache.compile(1, "welcome", 2, "Hi", "{{name}}!")
+    cache.lookup(1, "welcome", 1) # most recently used survives
+    cache.compile(1, "reminder", 1, "Soon", "{{name}}")
+    assert cache.lookup(1, "welcome", 2) is None
+    assert cache.lookup(1, "welcome", 1) is first
+    assert cache.stats()["size"] == 2
+
+    rendered = cache.render_batch(first, [{"name": "Ann"}, {"name": "Bo"}])
+    assert rendered == [("Hi", "Ann"), ("Hi", "Bo")]
+
+def test_builtin_templates_are_cached():
+    cache = TemplateCache()
+    template = cache.builtin("registration_confirmation")
+    assert cache.builtin("registration_confirmation") is template
+    subject, body = template.render({"event_title": "Gala", "ticket_type": "VIP", "qr_code": "T1.k0.1.1.1.abc"})
+    assert subject == "Confirmation: Gala"
+    assert "T1.k0.1.1.1.abc" in body and "{{" not in body
+    assert cache.stats()["hits"] == 1
@@ -0,0 +1,50 @@
+import datetime
+import re
+
+from app import models
+
+def _add_events(db, tenant, admin, count):
+    start = datetime.datetime.utcnow() + datetime.timedelta(days=10)
+    for i in range(count):
+        event = models.Event(
+            title=f"Event {i}", start_time=start, end_time=start + datetime.timedelta(hours=1),
+            location="Hall", created_by_id=admin.id, tenant_id=tenant.id,
+        )
+        event.goals = [models.EventGoal(metric_name="Attendance", target_value=100)]
+        db.add(event)
+    db.commit()
+
+def _list(client, headers, **params):
+    resp = client.get("/api/v1/events/", params=params, headers=headers)
+    assert resp.status_code == 200, resp.text
+    queries = int(re.search(r'desc="(\d+) queries"', resp.headers["Server-Timing"]).group(1))
+    return resp.json(), queries
+
+def test_listing_is_lean_unless_expanded(client, db, tenant, admin, login):
+    _add_events(db, tenant, admin, 2)
+    headers = login(admin.email)
+
+    events, _ = _list(client, headers)
+    assert len(events) == 2
+    assert not {"goals", "budget_items", "esg_metrics"} & set(events[0])
+
+    events, _ = _list(client, headers, expand="goals")
+    assert events[0]["goals"][0]["metric_name"] == "Attendance"
+    assert "budget_items" not in events[0]
+
+    events, _ = _list(client, headers, expand="all")
+    assert {"goals", "budget_items", "esg_metrics"} <= set(events[0])
+
+    resp = client.get("/api/v1/events/", params={"expand": "sponsors"}, headers=headers)
+    assert resp.status_code == 400
+
+def test_expanded_listing_does_not_query_per_event(client, db, tenant, admin, login):
+    headers = login(admin.email)
+    _add_events(db, tenant, admin, 2)
+    _list(client, headers, expand="all") # warm the principal cache
+    _, few = _list(client, headers, expand="all")
+    _add_events(db, tenant, admin, 6)
+    events, many = _list(client, headers, expand="all")
+    assert len(events) == 8
+    assert few >= 4 # events plus one batched load per collection
+    assert many == few
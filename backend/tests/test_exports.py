@@ -0,0 +1,52 @@
+import csv
+import io
+import json
+
+from app.services.exports import ATTENDEE_COLUMNS, attendee_exporter
+
+def _registered(client, db, login, make_user, event, ticket_type, names):
+    ids = []
+    for i, name in enumerate(names):
+        user = make_user(f"attendee{i}@example.org")
+        user.full_name = name
+        db.commit()
+        resp = client.post(
+            f"/api/v1/events/{event.id}/register",
+            json={"event_id": event.id, "ticket_type_id": ticket_type.id},
+            headers=login(user.email),
+        )
+        assert resp.status_code == 200, resp.text
+        ids.append(resp.json()["id"])
+    return ids
+
+def test_export_csv_and_ndjson(client, db, login, admin, make_user, event, make_ticket_type, monkeypatch):
+    # Several partitions, so rows must keep flowing across batches
+    monkeypatch.setattr(attendee_exporter, "YIELD_PER", 2)
+    ticket_type = make_ticket_type("Early Bird", quantity=10)
+    names = ["Ada Lovelace", 'Smith, "Jo"', "Grace Hopper"]
+    ids = _registered(client, db, login, make_user, event, ticket_type, names)
+    headers = login(admin.email)
+    url = f"/api/v1/events/{event.id}/registrations/export"
+
+    resp = client.get(url, headers=headers)
+    assert resp.headers["content-type"].startswith("text/csv")
+    assert resp.headers["content-disposition"] == f'attachment; filename="event-{event.id}-attendees.csv"'
+    header, *rows = list(csv.reader(io.StringIO(resp.text)))
+    assert tuple(header) == ATTENDEE_COLUMNS
+    assert [(int(row[0]), row[2], row[4], row[5]) for row in rows] == [
+        (registration_id, name, "Early Bird", "CONFIRMED") for registration_id, name in zip(ids, names)
+    ]
+
+    resp = client.get(url, params={"format": "ndjson"}, headers=headers)
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in resp.text.splitlines()]
+    assert [record["registration_id"] for record in records] == ids
+    assert set(records[1]) == set(ATTENDEE_COLUMNS)
+    assert records[1]["full_name"] == names[1]
+    assert records[1]["check_in_status"] is False
+
+def test_export_rejects_unknown_event_and_format(client, login, admin, event):
+    headers = login(admin.email)
+    assert client.get("/api/v1/events/999/registrations/export", headers=headers).status_code == 404
+    resp = client.get(f"/api/v1/events/{event.id}/registrations/export", params={"format": "xlsx"}, headers=headers)
+    assert resp.status_code == 422
@@ -0,0 +1,88 @@
+import asyncio
+import json
+
+from fastapi.responses import StreamingResponse
+from starlette.requests import Request
+
+from app import models
+from app.core.idempotency import IDEMPOTENCY_KEY_HEADER, REPLAYED_HEADER, idempotency_store
+
+ORIGIN = "http://app.example.org"
+
+def _register(client, headers, event, ticket_type, key):
+    return client.post(
+        f"/api/v1/events/{event.id}/register",
+        json={"event_id": event.id, "ticket_type_id": ticket_type.id},
+        headers={**headers, IDEMPOTENCY_KEY_HEADER: key, "Origin": ORIGIN},
+    )
+
+def test_retried_registration_is_replayed(client, db, login, make_user, event, make_ticket_type):
+    ticket_type = make_ticket_type(quantity=5)
+    headers = login(make_user("buyer@example.org").email)
+
+    first = _register(client, headers, event, ticket_type, "retry-1")
+    replay = _register(client, headers, event, ticket_type, "retry-1")
+    assert first.status_code == replay.status_code == 200
+    assert replay.json() == first.json()
+    assert REPLAYED_HEADER not in first.headers
+    assert replay.headers[REPLAYED_HEADER] == "true"
+    # CORS wraps the idempotency middleware, so browsers can read the replay
+    assert replay.headers["access-control-allow-origin"] == ORIGIN
+    assert REPLAYED_HEADER in replay.headers["access-control-expose-headers"]
+
+    db.refresh(ticket_type)
+    assert ticket_type.quantity_sold == 1
+    assert db.query(models.EventRegistration).count() == 1
+
+def test_key_reused_for_another_request_is_rejected(client, login, make_user, event, make_ticket_type):
+    headers = login(make_user("buyer@example.org").email)
+    assert _register(client, headers, event, make_ticket_type("A"), "reused").status_code == 200
+
+    resp = _register(client, headers, event, make_ticket_type("B"), "reused")
+    assert resp.status_code == 422
+    assert resp.headers["access-control-allow-origin"] == ORIGIN
+
+def test_other_writes_ignore_the_header(client, db, login, admin, event):
+    headers = {**login(admin.email), IDEMPOTENCY_KEY_HEADER: "not-here"}
+    for _ in range(2):
+        resp = client.post(
+            f"/api/v1/events/{event.id}/tickets",
+            json={"name": "Extra", "price": 0, "quantity_available": 5, "event_id": event.id},
+            headers=headers,
+        )
+        assert resp.status_code == 200, resp.text
+        assert REPLAYED_HEADER not in resp.headers
+    assert db.query(models.TicketType).filter_by(name="Extra").count() == 2
+
+def test_replay_keeps_response_headers(admin):
+    def request():
+        scope = {
+            "type": "http", "method": "POST", "path": "/api/v1/donors/donations",
+            "query_string": b"", "headers": [],
+        }
+        async def receive():
+            return {"type": "http.request", "body": b'{"amount": 5}', "more_body": False}
+        return Request(scope, receive)
+
+    calls = []
+    async def call_next(_):
+        calls.append(1)
+        return StreamingResponse(
+            iter([json.dumps({"id": 7}).encode()]),
+            status_code=201,
+            media_type="application/json",
+            headers={"Location": "/api/v1/donors/donations/7", "X-Next-Cursor": "abc"},
+        )
+
+    async def send_twice():
+        first = await idempotency_store.handle(request(), admin.id, "with-headers", call_next)
+        second = await idempotency_store.handle(request(), admin.id, "with-headers", call_next)
+        return first, second
+
+    first, second = asyncio.run(send_twice())
+    assert len(calls) == 1
+    assert (second.status_code, second.body) == (201, b'{"id": 7}')
+    assert second.headers["location"] == first.headers["location"] == "/api/v1/donors/donations/7"
+    assert second.headers["x-next-cursor"] == "abc"
+    assert second.headers["content-type"] == "application/json"
+    assert second.headers[REPLAYED_HEADER] == "true"
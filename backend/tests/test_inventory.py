@@ -0,0 +1,174 @@
+import asyncio
+import datetime
+
+import pytest
+from fastapi import BackgroundTasks, HTTPException
+
+from app import models, schemas
+from app.api.v1.endpoints import tickets
+from app.db.async_session import AsyncSessionLocal
+from app.services.ticket_holds import ticket_holds
+from app.services.waitlist import waitlist
+
+def _counts(db, ticket_type):
+    db.refresh(ticket_type)
+    return ticket_type.quantity_sold, ticket_type.quantity_held
+
+def _register(client, login, event, ticket_type, email):
+    resp = client.post(
+        f"/api/v1/events/{event.id}/register",
+        json={"event_id": event.id, "ticket_type_id": ticket_type.id},
+        headers=login(email),
+    )
+    assert resp.status_code == 200, resp.text
+    return resp.json()["id"]
+
+def test_hold_release_and_confirm(client, db, login, make_user, event, make_ticket_type):
+    ticket_type = make_ticket_type(quantity=2)
+    headers = login(make_user("buyer@example.org").email)
+    hold_url = f"/api/v1/events/{event.id}/holds"
+
+    hold = client.post(hold_url, json={"ticket_type_id": ticket_type.id}, headers=headers).json()
+    assert _counts(db, ticket_type) == (0, 1)
+    assert client.delete(f"/api/v1/holds/{hold['id']}", headers=headers).status_code == 204
+    assert _counts(db, ticket_type) == (0, 0)
+
+    hold = client.post(hold_url, json={"ticket_type_id": ticket_type.id}, headers=headers).json()
+    assert client.post(f"/api/v1/holds/{hold['id']}/confirm", headers=headers).status_code == 200
+    assert _counts(db, ticket_type) == (1, 0)
+    assert client.post(f"/api/v1/holds/{hold['id']}/confirm", headers=headers).status_code == 404
+
+def test_sold_out_hold_is_rejected(client, db, login, make_user, event, make_ticket_type):
+    ticket_type = make_ticket_type(quantity=1)
+    _register(client, login, event, ticket_type, make_user("first@example.org").email)
+
+    resp = client.post(
+        f"/api/v1/events/{event.id}/holds",
+        json={"ticket_type_id": ticket_type.id},
+        headers=login(make_user("second@example.org").email),
+    )
+    assert resp.status_code == 400
+    assert _counts(db, ticket_type) == (1, 0)
+
+def test_last_seat_goes_to_one_of_two_concurrent_buyers(db, make_user, event, make_ticket_type):
+    ticket_type = make_ticket_type(quantity=1)
+    buyers = [make_user(f"buyer{i}@example.org") for i in range(2)]
+
+    async def buy(buyer):
+        async with AsyncSessionLocal() as session:
+            # Each buyer has already seen a free seat, as a read-then-write check would
+            assert (await session.get(models.TicketType, ticket_type.id)).quantity_sold == 0
+            await asyncio.sleep(0)
+            try:
+                await tickets.register_for_event(
+                    event.id,
+                    schemas.EventRegistrationCreate(event_id=event.id, ticket_type_id=ticket_type.id),
+                    BackgroundTasks(),
+                    db=session,
+                    current_user=buyer,
+                )
+                return 200
+            except HTTPException as exc:
+                return exc.status_code
+
+    async def race():
+        return await asyncio.gather(*(buy(buyer) for buyer in buyers))
+
+    assert sorted(asyncio.run(race())) == [200, 400]
+    assert _counts(db, ticket_type) == (1, 0)
+
+def test_holds_count_against_capacity(client, db, login, make_user, event, make_ticket_type):
+    ticket_type = make_ticket_type(quantity=2)
+    assert _hold(client, login, event, ticket_type, make_user("holder@example.org").email).status_code == 200
+    _register(client, login, event, ticket_type, make_user("buyer@example.org").email)
+
+    resp = client.post(
+        f"/api/v1/events/{event.id}/register",
+        json={"event_id": event.id, "ticket_type_id": ticket_type.id},
+        headers=login(make_user("late@example.org").email),
+    )
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "Ticket type sold out"
+    assert _counts(db, ticket_type) == (1, 1)
+
+def test_cancel_promotes_waitlist_once(client, db, login, admin, make_user, event, make_ticket_type):
+    ticket_type = make_ticket_type(quantity=1)
+    reg_id = _register(client, login, event, ticket_type, make_user("first@example.org").email)
+    for email in ("second@example.org", "third@example.org"):
+        resp = client.post(
+            f"/api/v1/events/{event.id}/waitlist",
+            json={"ticket_type_id": ticket_type.id},
+            headers=login(make_user(email).email),
+        )
+        assert resp.status_code == 200, resp.text
+
+    admin_headers = login(admin.email)
+    for _ in range(2):
+        resp = client.put(f"/api/v1/registrations/{reg_id}/status", json={"status": "CANCELLED"}, headers=admin_headers)
+        assert resp.status_code == 200, resp.text
+
+    assert _counts(db, ticket_type) == (0, 1)
+    second, third = (db.query(models.User).filter_by(email=email).one() for email in ("second@example.org", "third@example.org"))
+    assert [hold.user_id for hold in db.query(models.TicketHold).all()] == [second.id]
+    assert [entry.user_id for entry in db.query(models.WaitlistEntry).all()] == [third.id]
+    offers = db.query(models.OutboxMessage).filter(models.OutboxMessage.template == "waitlist_promotion").all()
+    assert [offer.recipient for offer in offers] == ["second@example.org"]
+
+def test_stale_status_change_does_not_release_twice(client, db, login, admin, make_user, event, make_ticket_type):
+    ticket_type = make_ticket_type(quantity=5)
+    reg_id = _register(client, login, event, ticket_type, make_user("buyer@example.org").email)
+
+    async def cancel_with_stale_read():
+        async with AsyncSessionLocal() as session:
+            # Held in the identity map from before the other request commits, like a concurrent cancel
+            _stale = await session.get(models.EventRegistration, reg_id)
+            resp = client.put(
+                f"/api/v1/registrations/{reg_id}/status", json={"status": "CANCELLED"}, headers=login(admin.email)
+            )
+            assert resp.status_code == 200, resp.text
+            with pytest.raises(HTTPException) as exc:
+                await tickets.update_registration_status(
+                    reg_id, schemas.EventRegistrationUpdate(status="REFUNDED"), BackgroundTasks(), db=session, current_user=admin
+                )
+            assert exc.value.status_code == 409
+
+    asyncio.run(cancel_with_stale_read())
+    assert _counts(db, ticket_type) == (0, 0)
+    assert db.get(models.EventRegistration, reg_id).status == models.RegistrationStatus.CANCELLED
+
+def _expire_holds(db):
+    db.query(models.TicketHold).update({"expires_at": datetime.datetime.utcnow() - datetime.timedelta(seconds=1)})
+    db.commit()
+
+def _hold(client, login, event, ticket_type, email):
+    return client.post(f"/api/v1/events/{event.id}/holds", json={"ticket_type_id": ticket_type.id}, headers=login(email))
+
+def test_expired_hold_is_reclaimed_when_nobody_waits(client, db, login, make_user, event, make_ticket_type):
+    ticket_type = make_ticket_type(quantity=1)
+    assert _hold(client, login, event, ticket_type, make_user("first@example.org").email).status_code == 200
+    _expire_holds(db)
+
+    resp = _hold(client, login, event, ticket_type, make_user("second@example.org").email)
+    assert resp.status_code == 200, resp.text
+    assert _counts(db, ticket_type) == (0, 1)
+
+def test_expired_hold_goes_to_the_waitlist_first(client, db, login, make_user, event, make_ticket_type):
+    ticket_type = make_ticket_type(quantity=1)
+    assert _hold(client, login, event, ticket_type, make_user("first@example.org").email).status_code == 200
+    waiting = make_user("waiting@example.org")
+    resp = client.post(f"/api/v1/events/{event.id}/waitlist", json={"ticket_type_id": ticket_type.id}, headers=login(waiting.email))
+    assert resp.status_code == 200, resp.text
+    _expire_holds(db)
+
+    assert _hold(client, login, event, ticket_type, make_user("late@example.org").email).status_code == 400
+
+    async def sweep_once():
+        async with AsyncSessionLocal() as session:
+            released = await ticket_holds.sweep(session)
+            promoted = await waitlist.promote_many(session, released)
+            await session.commit()
+        return promoted
+
+    assert asyncio.run(sweep_once()) == 1
+    assert [hold.user_id for hold in db.query(models.TicketHold).all()] == [waiting.id]
+    assert _counts(db, ticket_type) == (0, 1)
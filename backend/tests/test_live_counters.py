@@ -0,0 +1,45 @@
+import asyncio
+import json
+
+import pytest
+
+from app.api.v1.endpoints import tickets
+from app.core.config import settings
+from app.db.async_session import AsyncSessionLocal
+from app.services.live_counters import live_counters
+
+def _payload(frame: bytes) -> dict:
+    event, data = frame.decode().strip().split("\n")
+    assert event == "event: counters"
+    return json.loads(data[len("data: "):])
+
+def test_live_counters_unknown_event(client, admin, login):
+    resp = client.get("/api/v1/events/999/live", headers=login(admin.email))
+    assert resp.status_code == 404
+
+def test_live_counters_stream_updates(admin, event, make_ticket_type, monkeypatch):
+    monkeypatch.setattr(settings, "LIVE_COUNTERS_DEBOUNCE_SECONDS", 0)
+    ticket_type = make_ticket_type(quantity=5)
+
+    async def scenario():
+        async with AsyncSessionLocal() as session:
+            response = await tickets.stream_event_counters(event.id, db=session, current_user=admin)
+            # The long-lived stream must not pin the request's transaction
+            assert not session.in_transaction()
+        frames = response.body_iterator
+        try:
+            first = _payload(await frames.__anext__())
+            assert first["registered"] == 0
+            assert first["ticket_types"][0]["remaining"] == 5
+
+            async with AsyncSessionLocal() as session:
+                (await session.get(type(ticket_type), ticket_type.id)).quantity_sold = 2
+                await session.commit()
+            live_counters.invalidate(event.id)
+            second = _payload(await asyncio.wait_for(frames.__anext__(), timeout=2))
+            assert second["ticket_types"][0]["remaining"] == 3
+        finally:
+            await frames.aclose()
+        assert live_counters.stats()["subscribers"] == 0
+
+    asyncio.run(scenario())
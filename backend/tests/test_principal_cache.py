@@ -0,0 +1,54 @@
+from app.core import principal_cache as principal_cache_module
+from app.core.principal_cache import Principal, PrincipalCache, principal_cache
+
+def _principal(user_id: int, tenant_id: int = 1) -> Principal:
+    return Principal({"id": user_id, "tenant_id": tenant_id}, None)
+
+def test_repeat_request_is_served_from_the_cache(client, db, login, make_user):
+    member = make_user("member@example.org")
+    headers = login(member.email)
+    assert client.get("/api/v1/users/me", headers=headers).json()["full_name"] == "Member"
+
+    # A write that bypasses the API is invisible until the entry expires
+    member.full_name = "Renamed Directly"
+    db.commit()
+    hits = principal_cache.hits
+    assert client.get("/api/v1/users/me", headers=headers).json()["full_name"] == "Member"
+    assert principal_cache.hits == hits + 1
+
+def test_user_updates_invalidate_the_entry(client, login, admin, make_user):
+    member = make_user("member@example.org")
+    headers = login(member.email)
+    admin_headers = login(admin.email)
+    client.get("/api/v1/users/me", headers=headers)
+
+    client.put(f"/api/v1/users/{member.id}", json={"full_name": "New Name"}, headers=admin_headers)
+    assert client.get("/api/v1/users/me", headers=headers).json()["full_name"] == "New Name"
+
+    client.put(f"/api/v1/users/{member.id}", json={"is_active": False}, headers=admin_headers)
+    assert client.get("/api/v1/users/me", headers=headers).json()["is_active"] is False
+    assert client.get("/api/v1/registrations/me", headers=headers).status_code == 400
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(principal_cache_module.time, "monotonic", lambda: now[0])
+    cache = PrincipalCache(max_size=10, ttl=30)
+    cache.set(_principal(1))
+
+    assert cache.get(1).user_id == 1
+    now[0] += 31
+    assert cache.peek(1) is None
+    assert cache.get(1) is None
+    assert (cache.hits, cache.misses, cache.stats()["size"]) == (1, 1, 0)
+
+def test_lru_eviction_and_tenant_invalidation():
+    cache = PrincipalCache(max_size=2, ttl=30)
+    cache.set(_principal(1, tenant_id=1))
+    cache.set(_principal(2, tenant_id=2))
+    cache.get(1) # 2 is now least recently used
+    cache.set(_principal(3, tenant_id=1))
+    assert cache.peek(2) is None and cache.evictions == 1
+
+    cache.invalidate_tenant(1)
+    assert cache.peek(1) is None and cache.peek(3) is None
+    assert cache.invalidations == 2
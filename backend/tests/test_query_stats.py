@@ -0,0 +1,33 @@
+from app.core.config import settings
+from app.db import query_stats
+from app.db.query_stats import QueryStatsRegistry, RequestQueryStats
+
+def test_server_timing_and_endpoint_template(client, admin, login, event, monkeypatch):
+    monkeypatch.setattr(query_stats, "query_stats_registry", QueryStatsRegistry())
+    headers = login(admin.email)
+    for event_id in (event.id, 999):
+        resp = client.get(f"/api/v1/events/{event_id}", headers=headers)
+        timing = resp.headers["Server-Timing"]
+        assert timing.startswith("db;dur=") and "queries" in timing
+
+    endpoints = query_stats.query_stats_registry.stats()
+    event_labels = [label for label in endpoints if label.startswith("GET /api/v1/events")]
+    assert event_labels == ["GET /api/v1/events/{id}"]
+    assert endpoints["GET /api/v1/events/{id}"]["requests"] == 2
+
+def test_repeated_statement_flagged(monkeypatch):
+    monkeypatch.setattr(settings, "QUERY_N_PLUS_ONE_THRESHOLD", 3)
+    registry = QueryStatsRegistry()
+
+    stats = RequestQueryStats()
+    stats.record("SELECT goals WHERE event_id = ?", 0.001)
+    stats.record("SELECT goals WHERE event_id = ?", 0.001)
+    registry.observe("GET /api/v1/events/", stats)
+    assert registry.stats()["GET /api/v1/events/"]["n_plus_one"] == 0
+
+    stats.record("SELECT goals WHERE event_id = ?", 0.001)
+    registry.observe("GET /api/v1/events/", stats)
+    entry = registry.stats()["GET /api/v1/events/"]
+    assert entry["n_plus_one"] == 1
+    assert entry["last_repeated_statement"] == "SELECT goals WHERE event_id = ?"
+    assert entry["max_queries"] == 3
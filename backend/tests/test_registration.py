@@ -0,0 +1,109 @@
+from app import models
+from app.core.ticket_signing import ticket_signer
+
+def _outbox(db):
+    db.expire_all()
+    return db.query(models.OutboxMessage).order_by(models.OutboxMessage.id).all()
+
+def test_registration_persists_signed_qr_and_queues_confirmation(client, db, login, make_user, event, make_ticket_type):
+    ticket_type = make_ticket_type("VIP", quantity=5)
+    buyer = make_user("buyer@example.org")
+
+    resp = client.post(
+        f"/api/v1/events/{event.id}/register",
+        json={"event_id": event.id, "ticket_type_id": ticket_type.id},
+        headers=login(buyer.email),
+    )
+    assert resp.status_code == 200, resp.text
+    qr_code = resp.json()["qr_code_data"]
+    assert qr_code and ticket_signer.verify(qr_code) is not None
+
+    registration = db.get(models.EventRegistration, resp.json()["id"])
+    assert registration.qr_code_data == qr_code
+    db.refresh(ticket_type)
+    assert ticket_type.quantity_sold == 1
+
+    [message] = _outbox(db)
+    assert message.recipient == buyer.email
+    assert message.template == "registration_confirmation"
+    assert message.context["qr_code"] == qr_code
+    assert message.context["ticket_type"] == "VIP"
+
+def test_group_registration_persists_every_qr(client, db, login, admin, make_user, event, make_ticket_type):
+    ticket_type = make_ticket_type(quantity=5)
+    guests = [make_user(f"guest{i}@example.org") for i in range(2)]
+
+    resp = client.post(
+        f"/api/v1/events/{event.id}/register/group",
+        json={"tickets": [{"ticket_type_id": ticket_type.id, "attendee_email": guest.email} for guest in guests]},
+        headers=login(admin.email),
+    )
+    assert resp.status_code == 200, resp.text
+    codes = [registration["qr_code_data"] for registration in resp.json()]
+    assert all(codes)
+
+    stored = [db.get(models.EventRegistration, registration["id"]).qr_code_data for registration in resp.json()]
+    assert stored == codes
+
+    [message] = _outbox(db)
+    assert message.recipient == admin.email
+    assert message.template == "group_registration_confirmation"
+    assert message.context["ticket_count"] == 2
+    assert all(code in message.context["ticket_rows"] for code in codes)
+
+def test_duplicate_registration_rolls_back_inventory_and_email(client, db, login, make_user, event, make_ticket_type):
+    ticket_type = make_ticket_type(quantity=5)
+    buyer = make_user("buyer@example.org")
+    headers = login(buyer.email)
+    body = {"event_id": event.id, "ticket_type_id": ticket_type.id}
+
+    assert client.post(f"/api/v1/events/{event.id}/register", json=body, headers=headers).status_code == 200
+    assert client.post(f"/api/v1/events/{event.id}/register", json=body, headers=headers).status_code == 400
+
+    db.refresh(ticket_type)
+    assert ticket_type.quantity_sold == 1
+    assert len(_outbox(db)) == 1
+
+def test_group_registration_is_all_or_nothing(client, db, login, admin, make_user, event, make_ticket_type):
+    general = make_ticket_type("General", quantity=5)
+    vip = make_ticket_type("VIP", quantity=1)
+    guests = [make_user(f"guest{i}@example.org") for i in range(3)]
+    url = f"/api/v1/events/{event.id}/register/group"
+    headers = login(admin.email)
+
+    # General fits, VIP does not: neither is taken
+    resp = client.post(url, json={"tickets": [
+        {"ticket_type_id": general.id, "attendee_email": guests[0].email},
+        {"ticket_type_id": vip.id, "attendee_email": guests[1].email},
+        {"ticket_type_id": vip.id, "attendee_email": guests[2].email},
+    ]}, headers=headers)
+    assert resp.status_code == 400
+    assert "VIP" in resp.json()["detail"]
+    db.refresh(general)
+    db.refresh(vip)
+    assert (general.quantity_sold, vip.quantity_sold) == (0, 0)
+    assert db.query(models.EventRegistration).count() == 0
+    assert _outbox(db) == []
+
+    resp = client.post(url, json={"tickets": [
+        {"ticket_type_id": general.id, "attendee_email": guests[0].email},
+        {"ticket_type_id": general.id, "attendee_email": guests[0].email},
+    ]}, headers=headers)
+    assert resp.status_code == 400
+
+def test_group_registration_only_admits_members_of_the_buyers_org(client, db, login, admin, make_user, event, make_ticket_type):
+    ticket_type = make_ticket_type(quantity=5)
+    other_org = models.Tenant(name="Other Org", slug="other-org", plan_tier="business")
+    db.add(other_org)
+    db.commit()
+    outsider = make_user("outsider@example.org", tenant_id=other_org.id)
+
+    resp = client.post(
+        f"/api/v1/events/{event.id}/register/group",
+        json={"tickets": [{"ticket_type_id": ticket_type.id, "attendee_email": outsider.email}]},
+        headers=login(admin.email),
+    )
+    assert resp.status_code == 400
+    assert outsider.email in resp.json()["detail"]
+    db.refresh(ticket_type)
+    assert ticket_type.quantity_sold == 0
@@ -0,0 +1,62 @@
+import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api import deps
+from app.db import replica as replica_module
+from app.db.base_class import Base
+from app.db.replica import STICKY_COOKIE, ReplicaRouter, replica_router
+
+@pytest.fixture
+def lagging_replica(tmp_path, monkeypatch):
+    """A second SQLite database that never receives the primary's writes."""
+    url = f"sqlite:///{tmp_path}/replica.db"
+    Base.metadata.create_all(bind=create_engine(url))
+    async_engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://"))
+    monkeypatch.setattr(replica_module, "replica_engine", create_engine(url))
+    monkeypatch.setattr(replica_module, "async_replica_engine", async_engine)
+    monkeypatch.setattr(
+        deps, "AsyncReplicaSessionLocal",
+        async_sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False),
+    )
+    monkeypatch.setattr(deps, "replica_router", ReplicaRouter())
+
+def _event_titles(client, headers):
+    resp = client.get("/api/v1/events/", headers=headers)
+    assert resp.status_code == 200, resp.text
+    return [event["title"] for event in resp.json()]
+
+def test_reads_follow_the_client_after_a_write(client, admin, login, lagging_replica, monkeypatch):
+    headers = login(admin.email)
+    assert _event_titles(client, headers) == []
+
+    start = datetime.datetime.utcnow() + datetime.timedelta(days=7)
+    resp = client.post("/api/v1/events/", headers=headers, json={
+        "title": "Spring Fair",
+        "start_time": start.isoformat(),
+        "end_time": (start + datetime.timedelta(hours=2)).isoformat(),
+        "location": "Park",
+    })
+    assert resp.status_code == 200, resp.text
+    assert STICKY_COOKIE in resp.cookies
+
+    # The cookie, not this process, keeps the user on the primary
+    monkeypatch.setattr(deps, "replica_router", ReplicaRouter())
+    assert _event_titles(client, headers) == ["Spring Fair"]
+
+    client.cookies.clear()
+    assert _event_titles(client, headers) == []
+
+def test_sticky_token_is_bound_to_user_and_deadline(monkeypatch):
+    token = replica_router.sticky_token(7)
+    assert replica_router.is_sticky(7, token)
+    assert not replica_router.is_sticky(8, token)
+    assert not replica_router.is_sticky(7, token.replace("7.", "8.", 1))
+    user, deadline, mac = token.split(".")
+    assert not replica_router.is_sticky(7, f"{user}.{int(deadline) + 3600}.{mac}")
+
+    later = replica_module.time.time() + 3600
+    monkeypatch.setattr(replica_module.time, "time", lambda: later)
+    assert not replica_router.is_sticky(7, token)
@@ -0,0 +1,48 @@
+from app import models
+from app.core.config import settings
+from app.core.ticket_signing import ticket_signer
+
+def test_signed_ticket_round_trip_and_tampering():
+    code = ticket_signer.sign(41, 7, 3)
+    claims = ticket_signer.verify(code)
+    assert (claims.registration_id, claims.event_id, claims.ticket_type_id) == (41, 7, 3)
+
+    prefix, key_id, registration_id, event_id, ticket_type_id, mac = code.split(".")
+    # Moving a ticket to another registration or event breaks the MAC
+    assert ticket_signer.verify(".".join([prefix, key_id, "42", event_id, ticket_type_id, mac])) is None
+    assert ticket_signer.verify(".".join([prefix, key_id, registration_id, "8", ticket_type_id, mac])) is None
+    assert ticket_signer.verify(".".join([prefix, "k9", registration_id, event_id, ticket_type_id, mac])) is None
+    assert ticket_signer.verify(code + "x") is None
+    assert ticket_signer.verify("LEGACY-0001") is None
+
+def test_rotated_keys_keep_verifying_until_retired(monkeypatch):
+    monkeypatch.setattr(settings, "QR_SIGNING_KEYS", {"k1": "old-secret"})
+    old = ticket_signer.sign(1, 7, 3)
+    monkeypatch.setattr(settings, "QR_SIGNING_KEYS", {"k1": "old-secret", "k2": "new-secret"})
+    new = ticket_signer.sign(1, 7, 3)
+    assert old.split(".")[1] == "k1" and new.split(".")[1] == "k2"
+    assert ticket_signer.verify(old) and ticket_signer.verify(new)
+
+    monkeypatch.setattr(settings, "QR_SIGNING_KEYS", {"k2": "new-secret"})
+    assert ticket_signer.verify(old) is None
+    assert ticket_signer.verify(new) is not None
+
+def test_reissue_signs_with_the_current_key(client, db, login, admin, make_user, event, make_ticket_type, monkeypatch):
+    ticket_type = make_ticket_type(quantity=5)
+    monkeypatch.setattr(settings, "QR_SIGNING_KEYS", {"k1": "old-secret"})
+    resp = client.post(
+        f"/api/v1/events/{event.id}/register",
+        json={"event_id": event.id, "ticket_type_id": ticket_type.id},
+        headers=login(make_user("buyer@example.org").email),
+    )
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["qr_code_data"].split(".")[1] == "k1"
+
+    monkeypatch.setattr(settings, "QR_SIGNING_KEYS", {"k1": "old-secret", "k2": "new-secret"})
+    resp = client.post(f"/api/v1/events/{event.id}/tickets/reissue-qr", headers=login(admin.email))
+    assert resp.json() == {"reissued": 1, "key_id": "k2"}
+
+    db.expire_all()
+    [registration] = db.query(models.EventRegistration).all()
+    claims = ticket_signer.verify(registration.qr_code_data)
+    assert claims.key_id == "k2" and claims.registration_id == registration.id
@@ -0,0 +1,73 @@
+import pytest
+
+from app.services.waiting_room import QUEUE_TOKEN_HEADER, waiting_room
+
+@pytest.fixture
+def queued_event(db, event):
+    event.waiting_room_rate = 1000.0
+    db.commit()
+    waiting_room.forget(event.id)
+    return event
+
+def _join(client, event, headers):
+    resp = client.post(f"/api/v1/events/{event.id}/queue", headers=headers)
+    assert resp.status_code == 200, resp.text
+    return resp.json()["queue_token"]
+
+def _hold(client, event, ticket_type, headers, token=None):
+    if token is not None:
+        headers = {**headers, QUEUE_TOKEN_HEADER: token}
+    return client.post(
+        f"/api/v1/events/{event.id}/holds", json={"ticket_type_id": ticket_type.id}, headers=headers
+    )
+
+def test_queue_token_gates_and_is_single_use(client, db, login, make_user, queued_event, make_ticket_type):
+    ticket_type = make_ticket_type(quantity=5)
+    headers = login(make_user("buyer@example.org").email)
+
+    assert _hold(client, queued_event, ticket_type, headers).status_code == 403
+
+    token = _join(client, queued_event, headers)
+    db.refresh(queued_event)
+    next_admit = queued_event.waiting_room_next_admit
+    # Joining again returns the same pass instead of another slot
+    assert _join(client, queued_event, headers) == token
+    db.refresh(queued_event)
+    assert queued_event.waiting_room_next_admit == next_admit
+
+    assert _hold(client, queued_event, ticket_type, headers, token).status_code == 200
+    resp = _hold(client, queued_event, ticket_type, headers, token)
+    assert resp.status_code == 403
+    assert "already been used" in resp.json()["detail"]
+
+    fresh = _join(client, queued_event, headers)
+    assert fresh != token
+    assert _hold(client, queued_event, ticket_type, headers, fresh).status_code == 200
+
+def test_queue_token_is_bound_to_its_user(client, login, make_user, queued_event, make_ticket_type):
+    ticket_type = make_ticket_type(quantity=5)
+    token = _join(client, queued_event, login(make_user("first@example.org").email))
+    other = login(make_user("second@example.org").email)
+    resp = _hold(client, queued_event, ticket_type, other, token)
+    assert resp.status_code == 403
+    assert resp.json()["detail"] == "Invalid queue token"
+
+def test_failed_purchase_does_not_spend_the_token(client, login, make_user, queued_event, make_ticket_type):
+    sold_out = make_ticket_type(name="VIP", quantity=0)
+    general = make_ticket_type(quantity=5)
+    headers = login(make_user("buyer@example.org").email)
+    token = _join(client, queued_event, headers)
+
+    assert _hold(client, queued_event, sold_out, headers, token).status_code == 400
+    assert _hold(client, queued_event, general, headers, token).status_code == 200
+
+def test_later_slots_wait_their_turn(client, db, login, make_user, event, make_ticket_type):
+    event.waiting_room_rate = 0.01
+    db.commit()
+    waiting_room.forget(event.id)
+    ticket_type = make_ticket_type(quantity=5)
+    _join(client, event, login(make_user("first@example.org").email))
+    headers = login(make_user("second@example.org").email)
+    resp = _hold(client, event, ticket_type, headers, _join(client, event, headers))
+    assert resp.status_code == 429
+    assert 0 < int(resp.headers["Retry-After"]) <= 100
@@ -139,7 +139,7 @@ export function EmailListManager({ eventId }: EmailListManagerProps) {
                         <CardContent>
                             <p className="text-sm text-muted-foreground mb-2">Subject: {list.subject}</p>
                             <div className="flex justify-between items-center text-sm">
-                                <span>{list.recipients.length} Recipients</span>
+                                <span>{list.segment ? `Segment: ${list.segment.source.replace(/_/g, " ")}` : `${list.recipients.length} Recipients`}</span>
                                 {list.status === 'DRAFT' && (
                                     <Button size="sm" onClick={() => handleSend(list.id)}>
                                         Send Now
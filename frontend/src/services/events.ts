@@ -20,21 +20,43 @@ export interface EmailRecipient {
     name?: string;
 }
 
+export interface EmailSegment {
+    source: "event_registrants" | "members" | "campaign_donors";
+    event_id?: number;
+    ticket_type_ids?: number[];
+    checked_in?: boolean;
+    membership_tiers?: ("none" | "bronze" | "silver" | "gold")[];
+    campaign_id?: number;
+}
+
 export interface EmailList {
     id: number;
     event_id: number;
     name: string;
     recipients: EmailRecipient[];
+    segment?: EmailSegment | null;
     subject: string;
     body: string;
-    status: "DRAFT" | "SENT" | "FAILED";
+    status: "DRAFT" | "SENDING" | "SENT" | "FAILED";
     sent_at?: string;
     created_at: string;
 }
 
+export interface EmailJob {
+    id: number;
+    email_list_id?: number;
+    status: "QUEUED" | "DONE";
+    total: number;
+    sent: number;
+    failed: number;
+    created_at: string;
+    finished_at?: string;
+}
+
 export interface EmailListCreate {
     name: string;
     recipients: EmailRecipient[];
+    segment?: EmailSegment | null;
     subject: string;
     body: string;
 }
@@ -88,12 +110,16 @@ export const eventService = {
         });
     },
 
-    async sendEmailList(eventId: number, listId: number): Promise<EmailList> {
-        return fetchJson<EmailList>(`/api/v1/events/${eventId}/email-lists/${listId}/send`, {
+    async sendEmailList(eventId: number, listId: number): Promise<EmailJob> {
+        return fetchJson<EmailJob>(`/api/v1/events/${eventId}/email-lists/${listId}/send`, {
             method: "POST",
         });
     },
 
+    async getEmailJob(eventId: number, jobId: number): Promise<EmailJob> {
+        return fetchJson<EmailJob>(`/api/v1/events/${eventId}/email-jobs/${jobId}`);
+    },
+
     async cloneEvent(id: number): Promise<Event> {
         return fetchJson<Event>(`/api/v1/events/${id}/clone`, {
             method: "POST"